@@ -0,0 +1,72 @@
+import os
+import time
+from contextlib import contextmanager
+from tempfile import TemporaryDirectory
+
+
+# ========================================================================= #
+# Timing                                                                    #
+# ========================================================================= #
+
+
+def timeit_ms(func, repeats=5, number=1) -> float:
+    """
+    Returns the minimum time in milliseconds taken
+    to call the function `number` times.
+    """
+    times = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - t) * 1000)
+    return min(times)
+
+
+def print_result(name: str, ms: float, per: int = 1, unit='call'):
+    print(f'{name:<48s} {ms:10.3f}ms total {ms / per:10.4f}ms/{unit}')
+
+
+# ========================================================================= #
+# Synthetic Config Trees                                                    #
+# ========================================================================= #
+
+
+def write_yaml_tree(root: str, num_groups: int, num_options: int, depth: int = 1, num_keys: int = 8, templates: bool = True):
+    """
+    Write a synthetic yaml config tree to the root folder, returning
+    the names of the groups that were created. The tree has the form:
+        default.yaml
+        group{i}/.../option{j}.yaml
+    """
+    groups = []
+    for i in range(num_groups):
+        group = os.path.join(*[f'group{i}'] * depth)
+        os.makedirs(os.path.join(root, group), exist_ok=True)
+        groups.append(group.replace(os.sep, '/'))
+        for j in range(num_options):
+            with open(os.path.join(root, group, f'option{j}.yaml'), 'w') as f:
+                for k in range(num_keys):
+                    if templates:
+                        # templates read the config so that they are not folded into constants when precompiled
+                        f.write(f'key{k}: "option{j}/key{k} ${{=conf.trainer.epochs + {k}}}"\n')
+                    f.write(f'path{k}: /some/long/path/to/the/data/folder/for/option{j}/key{k}\n')
+    # write the entrypoint
+    with open(os.path.join(root, 'default.yaml'), 'w') as f:
+        f.write('__defaults__:\n')
+        for group in groups:
+            f.write(f'  - {group}: option0\n')
+        f.write('trainer:\n  epochs: 100\n')
+    return groups
+
+
+@contextmanager
+def temp_yaml_tree(num_groups: int, num_options: int, depth: int = 1, num_keys: int = 8, templates: bool = True):
+    with TemporaryDirectory() as root:
+        groups = write_yaml_tree(root, num_groups=num_groups, num_options=num_options, depth=depth, num_keys=num_keys, templates=templates)
+        yield root, groups
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
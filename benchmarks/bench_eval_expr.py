@@ -0,0 +1,55 @@
+"""
+Benchmark evaluating the same expression templates many times, comparing
+parsing the expression and building a new symbol table for every call
+with the cached ast and shared default symbol table.
+
+usage: python -m benchmarks.bench_eval_expr
+"""
+
+from asteval.astutils import make_symbol_table
+
+from eunomia.config.nodes._util_interpret import Interpreter, interpret_expr, _parse_expr
+from benchmarks._util import timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+EXPRESSIONS = [
+    "'=' * 100",
+    "conf.trainer.lr * (2 ** 10)",
+    "f'{conf.trainer.epochs:05d}-{conf.trainer.lr}'",
+]
+
+
+def _eval_uncached(string, usersyms):
+    interpreter = Interpreter(
+        default_symtable=make_symbol_table(use_numpy=False),
+        extra_symtable=usersyms,
+        NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail=True,
+    )
+    return interpreter.interpret(_parse_expr(string.strip(' \t')))
+
+
+def _eval_cached(string, usersyms):
+    return interpret_expr(string, usersyms=usersyms, NON_STANDARD_PYTHON=True, compiled=False)
+
+
+def bench_eval_expr(number=1000):
+    usersyms = {'this': {}, 'conf': {'trainer': {'lr': 0.001, 'epochs': 100}}, 'incl': {}}
+    for expr in EXPRESSIONS:
+        print(f'{expr}')
+        for name, func in [('uncached', _eval_uncached), ('cached', _eval_cached)]:
+            ms = timeit_ms(lambda: func(expr, usersyms), number=number)
+            print_result(f'    {name}', ms, per=number)
+
+
+if __name__ == '__main__':
+    bench_eval_expr()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -0,0 +1,41 @@
+"""
+Benchmark evaluating the same cached expressions many times, comparing
+walking the ast with the Interpreter against the closures produced
+by the Compiler.
+
+usage: python -m benchmarks.bench_expr_engines
+"""
+
+from eunomia.config.nodes._util_interpret import interpret_expr
+from benchmarks._util import timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+EXPRESSIONS = [
+    "'=' * 100",
+    "conf.trainer.lr * (2 ** 10)",
+    "f'{conf.trainer.epochs:05d}-{conf.trainer.lr}'",
+    "conf.trainer.epochs > 10 and 0 < conf.trainer.lr < 1",
+]
+
+
+def bench_expr_engines(number=5000):
+    usersyms = {'this': {}, 'conf': {'trainer': {'lr': 0.001, 'epochs': 100}}, 'incl': {}}
+    for expr in EXPRESSIONS:
+        print(f'{expr}')
+        for name, compiled in [('interpreter', False), ('compiler', True)]:
+            ms = timeit_ms(lambda: interpret_expr(expr, usersyms=usersyms, NON_STANDARD_PYTHON=True, compiled=compiled), number=number)
+            print_result(f'    {name}', ms, per=number)
+
+
+if __name__ == '__main__':
+    bench_expr_engines()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
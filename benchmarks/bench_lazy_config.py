@@ -0,0 +1,40 @@
+"""
+Benchmark loading a large config tree and only accessing a single value,
+comparing eagerly resolving all values with the lazy config.
+
+usage: python -m benchmarks.bench_lazy_config
+"""
+
+from eunomia import eunomia_load
+from eunomia.backend import BackendYaml
+from benchmarks._util import temp_yaml_tree, timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def bench_lazy_config(num_groups=10, num_options=2, num_keys=32, number=10):
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options, num_keys=num_keys, templates=True) as (root, groups):
+        group = BackendYaml(precompile=True).load_group(root)
+        print(f'{num_groups} merged options with {num_keys} keys each, accessing a single value')
+        for lazy in [False, True]:
+            def load():
+                config = eunomia_load(group, 'default', lazy=lazy)
+                return config[groups[0]]['key0']
+            ms = timeit_ms(load, number=number)
+            print_result(f'eunomia_load(lazy={lazy})', ms, per=number, unit='load')
+        config = eunomia_load(group, 'default', lazy=True)
+        config[groups[0]]['key0']
+        assert config.num_leaves > 0, 'no values are resolved lazily, the templates were folded when precompiling'
+        print(f'resolved {config.num_resolved} of {config.num_leaves} values')
+
+
+if __name__ == '__main__':
+    bench_lazy_config()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -0,0 +1,41 @@
+"""
+Benchmark repeatedly loading the same entrypoint, comparing a new loader
+that visits all the defaults every time, with a reused loader that
+replays its cached merge plan.
+
+usage: python -m benchmarks.bench_merge_plan
+"""
+
+from eunomia.backend import BackendYaml
+from eunomia.config import ConfigLoader
+from benchmarks._util import temp_yaml_tree, timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def bench_merge_plan(num_groups=50, num_options=5, number=20):
+    # plain options, so that visiting the defaults dominates
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options, num_keys=1, templates=False) as (root, groups):
+        group = BackendYaml(precompile=True).load_group(root)
+        overrides = [f'/{g}/option1' for g in groups[:num_groups//2]]
+        print(f'{num_groups} defaults, {len(overrides)} overrides')
+        # benchmark
+        loader = ConfigLoader(group)
+        for name, load in [
+            ('new loader', lambda: ConfigLoader(group).load_config('default', overrides=overrides)),
+            ('reused loader', lambda: loader.load_config('default', overrides=overrides)),
+        ]:
+            ms = timeit_ms(load, number=number)
+            print_result(name, ms, per=number, unit='load')
+
+
+if __name__ == '__main__':
+    bench_merge_plan()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -0,0 +1,34 @@
+"""
+Benchmark repeatedly loading configs from an already loaded config tree,
+comparing options that replace strings on every load with options that
+were precompiled into shared templates by the backend.
+
+usage: python -m benchmarks.bench_precompile
+"""
+
+from eunomia import eunomia_load
+from eunomia.backend import BackendYaml
+from benchmarks._util import temp_yaml_tree, timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def bench_precompile(num_groups=10, num_options=3, num_keys=32, number=20):
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options, num_keys=num_keys, templates=True) as (root, groups):
+        print(f'{num_groups} merged options with {num_keys} keys each')
+        for precompile in [False, True]:
+            group = BackendYaml(precompile=precompile).load_group(root)
+            ms = timeit_ms(lambda: eunomia_load(group, 'default'), number=number)
+            print_result(f'BackendYaml(precompile={precompile})', ms, per=number, unit='load')
+
+
+if __name__ == '__main__':
+    bench_precompile()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
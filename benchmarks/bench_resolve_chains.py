@@ -0,0 +1,42 @@
+"""
+Benchmark resolving deep chains of references, comparing recursively
+resolving every reference through the unresolved config, with the
+dependency graph resolver that resolves every value exactly once.
+
+usage: python -m benchmarks.bench_resolve_chains
+"""
+
+from eunomia.config._resolver import ConfigResolver
+from eunomia.config.nodes import ConfigNode, RefNode
+from benchmarks._util import timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def _resolve_recursive(config):
+    return ConfigNode.recursive_get_config_value(config, {}, {}, config)
+
+
+def _resolve_graph(config):
+    return ConfigResolver(config, {}).resolve()
+
+
+def bench_resolve_chains(lengths=(50, 100, 200, 400)):
+    for n in lengths:
+        config = {'k0': 0, **{f'k{i}': RefNode(f'k{i-1}') for i in range(1, n)}}
+        print(f'chain of {n} references')
+        for name, func in [('recursive', _resolve_recursive), ('graph', _resolve_graph)]:
+            ms = timeit_ms(lambda: func(config), repeats=3)
+            print_result(f'    {name}', ms)
+
+
+if __name__ == '__main__':
+    bench_resolve_chains()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
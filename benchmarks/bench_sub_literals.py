@@ -0,0 +1,33 @@
+"""
+Microbenchmark resolving plain literal strings with SubNode, comparing
+the lark parser with the literal fast path that skips parsing.
+
+usage: python -m benchmarks.bench_sub_literals
+"""
+
+from eunomia.config.nodes import SubNode
+from eunomia.config.nodes._nodes import _parse_string_to_sub_nodes
+from benchmarks._util import timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def bench_sub_literals(lengths=(10, 100, 1000), number=100):
+    for length in lengths:
+        string = ('/some/long/path/' * length)[:length]
+        ms_parse = timeit_ms(lambda: _parse_string_to_sub_nodes(string), number=number)
+        ms_fast = timeit_ms(lambda: SubNode(string).get_config_value({}, {}, {}), number=number)
+        print_result(f'parse literal (len={length})', ms_parse, per=number)
+        print_result(f'fast path literal (len={length})', ms_fast, per=number)
+
+
+if __name__ == '__main__':
+    bench_sub_literals()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
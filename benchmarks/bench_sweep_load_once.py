@@ -0,0 +1,43 @@
+"""
+Benchmark the per-point cost of running a sweep over a yaml
+config tree, when the config tree is loaded for every sweep
+point compared to when it is only loaded once and shared.
+
+usage: python -m benchmarks.bench_sweep_load_once
+"""
+
+from eunomia import eunomia_runner
+from eunomia.core.runner import RunnerLocal
+from eunomia.core.sweep import choices
+from benchmarks._util import temp_yaml_tree, timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def bench_sweep_load_once(num_groups=25, num_options=20, sweep_options=3):
+    # only a few plain keys per option, so that loading the tree dominates
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options, num_keys=1, templates=False) as (root, groups):
+        # sweep over the options of the first two groups
+        overrides = [
+            choices([{groups[0]: f'option{i}'} for i in range(sweep_options)]),
+            choices([{groups[1]: f'option{i}'} for i in range(sweep_options)]),
+        ]
+        num_points = sweep_options ** 2
+        # benchmark both modes
+        print(f'sweep over {num_points} points, with {num_groups * num_options} option files')
+        for load_once in [False, True]:
+            runner = RunnerLocal(load_once=load_once)
+            ms = timeit_ms(lambda: eunomia_runner(lambda c: None, root, 'default', overrides=overrides, runner=runner), repeats=1)
+            print_result(f'RunnerLocal(load_once={load_once})', ms, per=num_points, unit='point')
+
+
+if __name__ == '__main__':
+    bench_sweep_load_once()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -0,0 +1,54 @@
+"""
+Benchmark the per-point cost of a sweep over a 4-axis grid, when every
+point is merged from scratch compared to when consecutive points share
+the partial merges from before the first override that differs.
+
+The swept groups are the last groups to be merged, and are given in
+reverse order, so that sharing benefits from reordering the axes.
+
+usage: python -m benchmarks.bench_sweep_prefix
+"""
+
+from eunomia.backend import BackendYaml
+from eunomia.config import ConfigLoader
+from eunomia.core.sweep import choices, _yield_list_sweep, _get_list_sweep_axis_order
+from benchmarks._util import temp_yaml_tree, timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def bench_sweep_prefix(num_groups=40, num_options=3, num_axes=4):
+    # no templates, so that merging dominates over resolving values
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options, templates=False) as (root, groups):
+        group = BackendYaml().load_group(root)
+        # sweep over the options of the last groups, in reverse merge order
+        overrides = [choices([{g: f'option{i}'} for i in range(num_options)]) for g in reversed(groups[-num_axes:])]
+        num_points = num_options ** num_axes
+        # get the axis order
+        loader = ConfigLoader(group, max_cached_plans=0)
+        consult_order = loader.get_override_consult_order('default')
+        axis_order = _get_list_sweep_axis_order(overrides, consult_order, loader.get_override_group_keys)
+        # benchmark
+        def load_independent():
+            for new_overrides, _ in _yield_list_sweep(overrides):
+                ConfigLoader(group).load_config('default', overrides=new_overrides)
+        def load_shared(axis_order=None):
+            points = (new_overrides for new_overrides, _ in _yield_list_sweep(overrides, axis_order=axis_order))
+            for _ in ConfigLoader(group).load_configs('default', points):
+                pass
+        print(f'sweep over {num_points} points on a {num_axes}-axis grid, with {num_groups} groups merged per point')
+        print_result('independent', timeit_ms(load_independent, repeats=3), per=num_points, unit='point')
+        print_result('shared prefix', timeit_ms(load_shared, repeats=3), per=num_points, unit='point')
+        print_result('shared prefix, reordered', timeit_ms(lambda: load_shared(axis_order), repeats=3), per=num_points, unit='point')
+
+
+if __name__ == '__main__':
+    bench_sweep_prefix()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
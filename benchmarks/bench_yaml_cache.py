@@ -0,0 +1,46 @@
+"""
+Benchmark loading a tree of yaml config files when every file is parsed,
+compared to when the parsed options are read from a warm on-disk cache,
+and when the files were touched so that their contents must be hashed.
+
+usage: python -m benchmarks.bench_yaml_cache
+"""
+
+import os
+from tempfile import TemporaryDirectory
+
+from eunomia.backend import BackendYaml
+from benchmarks._util import temp_yaml_tree, timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def _touch_all(root: str):
+    for folder, _, files in os.walk(root):
+        for file in files:
+            os.utime(os.path.join(folder, file))
+
+
+def bench_yaml_cache(num_groups=50, num_options=10):
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options, num_keys=16) as (root, groups), TemporaryDirectory() as cache_dir:
+        num_files = num_groups * num_options + 1
+        # fill the cache
+        BackendYaml(cache_dir=cache_dir).load_group(root)
+        print(f'loading {num_files} option files')
+        print_result('uncached', timeit_ms(lambda: BackendYaml().load_group(root), repeats=3), per=num_files, unit='file')
+        print_result('cached', timeit_ms(lambda: BackendYaml(cache_dir=cache_dir).load_group(root), repeats=3), per=num_files, unit='file')
+        # the mtime of every file changes, but not the contents
+        _touch_all(root)
+        print_result('cached, touched', timeit_ms(lambda: BackendYaml(cache_dir=cache_dir).load_group(root), repeats=1), per=num_files, unit='file')
+
+
+if __name__ == '__main__':
+    bench_yaml_cache()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -0,0 +1,34 @@
+"""
+Benchmark loading a config from a tree of 3,000 yaml option files, where
+the entrypoint only uses 30 of them, when every file is parsed up front
+compared to when options are only parsed when they are first used.
+
+usage: python -m benchmarks.bench_yaml_lazy
+"""
+
+from eunomia import eunomia_load
+from eunomia.backend import BackendYaml
+from benchmarks._util import temp_yaml_tree, timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def bench_yaml_lazy(num_groups=30, num_options=100):
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options) as (root, groups):
+        # results must be identical
+        assert eunomia_load(BackendYaml().load_group(root), 'default') == eunomia_load(BackendYaml(lazy=True).load_group(root), 'default')
+        print(f'loading the entrypoint of {num_groups * num_options + 1} option files, using {num_groups + 1}')
+        print_result('eager', timeit_ms(lambda: eunomia_load(BackendYaml().load_group(root), 'default'), repeats=1))
+        print_result('lazy', timeit_ms(lambda: eunomia_load(BackendYaml(lazy=True).load_group(root), 'default'), repeats=3))
+
+
+if __name__ == '__main__':
+    bench_yaml_lazy()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -0,0 +1,49 @@
+"""
+Benchmark the throughput in MB/s of parsing yaml config files with the
+pure-python loader, compared to the loader using the libyaml C parser,
+which is only available if ruamel.yaml.clib is installed.
+
+usage: python -m benchmarks.bench_yaml_loaders
+"""
+
+import os
+
+from eunomia.backend._backend_yaml import yaml_load, EunomiaSafeLoader, EunomiaCSafeLoader
+from benchmarks._util import temp_yaml_tree, timeit_ms
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def _read_yaml_files(root: str):
+    strings = []
+    for folder, _, files in os.walk(root):
+        for file in sorted(files):
+            with open(os.path.join(folder, file), 'r') as f:
+                strings.append(f.read())
+    return strings
+
+
+def bench_yaml_loaders(num_groups=50, num_options=10):
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options, num_keys=32) as (root, groups):
+        strings = _read_yaml_files(root)
+    num_mb = sum(len(s.encode('utf8')) for s in strings) / 1e6
+    print(f'parsing {len(strings)} yaml files, {num_mb:.3f}MB total')
+    loaders = [('pure-python', EunomiaSafeLoader), ('libyaml', EunomiaCSafeLoader)]
+    for name, loader in loaders:
+        if loader is None:
+            print(f'{name:<48s} not available, install ruamel.yaml.clib')
+            continue
+        ms = timeit_ms(lambda: [yaml_load(s, loader=loader) for s in strings], repeats=3)
+        print(f'{name:<48s} {ms:10.3f}ms total {num_mb / (ms / 1000):10.4f}MB/s')
+
+
+if __name__ == '__main__':
+    bench_yaml_loaders()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -0,0 +1,39 @@
+"""
+Benchmark loading a synthetic tree of 5,000 yaml config files, when the
+files are parsed serially compared to when they are parsed in a process
+pool, and the normalised options are sent back to the parent.
+
+Speedups depend on the number of cpus available.
+
+usage: python -m benchmarks.bench_yaml_parallel
+"""
+
+import os
+
+from eunomia.backend import BackendYaml, BackendDict
+from benchmarks._util import temp_yaml_tree, timeit_ms, print_result
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def bench_yaml_parallel(num_groups=500, num_options=10):
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options, depth=2) as (root, groups):
+        num_files = num_groups * num_options + 1
+        # results must be identical
+        assert BackendDict().dump(BackendYaml().load_group(root)) == BackendDict().dump(BackendYaml(max_workers=None).load_group(root))
+        print(f'loading {num_files} option files with {os.cpu_count()} cpus')
+        print_result('serial', timeit_ms(lambda: BackendYaml().load_group(root), repeats=1), per=num_files, unit='file')
+        for max_workers in sorted({2, 4, os.cpu_count() or 1} - {1}):
+            print_result(f'parallel, max_workers={max_workers}', timeit_ms(lambda: BackendYaml(max_workers=max_workers).load_group(root), repeats=1), per=num_files, unit='file')
+
+
+if __name__ == '__main__':
+    bench_yaml_parallel()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -0,0 +1,53 @@
+"""
+Benchmark indexing the option files in a deep tree of yaml config files,
+when all the paths are found with a recursive glob, then split and sorted,
+compared to a single breadth first pass over the folders with os.scandir.
+
+usage: python -m benchmarks.bench_yaml_walk
+"""
+
+import os
+from glob import glob
+
+from eunomia.backend import BackendYaml
+from eunomia.backend._backend_yaml import _walk_option_paths
+from benchmarks._util import temp_yaml_tree, timeit_ms, print_result
+
+
+# ========================================================================= #
+# Previous Implementation                                                   #
+# ========================================================================= #
+
+
+def _glob_option_paths(root_folder: str):
+    paths = []
+    for path in glob(os.path.join(root_folder, '**/*.yaml'), recursive=True):
+        keys = os.path.splitext(os.path.relpath(path, root_folder))[0]
+        keys = os.path.normpath(keys).split(os.sep)
+        paths.append((path, keys))
+    return sorted(paths, key=lambda p: (len(p[1]), *p[1]))
+
+
+# ========================================================================= #
+# Benchmark                                                                 #
+# ========================================================================= #
+
+
+def bench_yaml_walk(num_groups=300, num_options=10, depth=8):
+    with temp_yaml_tree(num_groups=num_groups, num_options=num_options, depth=depth) as (root, groups):
+        # results must be identical
+        assert [tuple(keys) for _, keys in _glob_option_paths(root)] == [(*keys, name) for _, keys, name in _walk_option_paths(root)]
+        num_files = num_groups * num_options + 1
+        print(f'indexing {num_files} option files, nested {depth} folders deep')
+        print_result('glob, split & sort', timeit_ms(lambda: _glob_option_paths(root)))
+        print_result('scandir walk', timeit_ms(lambda: list(_walk_option_paths(root))))
+        print_result('lazy load_group', timeit_ms(lambda: BackendYaml(lazy=True).load_group(root)))
+
+
+if __name__ == '__main__':
+    bench_yaml_walk()
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -25,6 +25,8 @@ from eunomia.core import eunomia
 from eunomia.core import eunomia_runner
 # eunomia simple loader - skips plugins and runners
 from eunomia.core import eunomia_load
+# stable digest of loaded configs
+from eunomia.util._util_fingerprint import fingerprint
 
 
 # ========================================================================= #
@@ -16,8 +16,10 @@ class BackendDict(Backend):
     GROUP_TYPE = dict
     OPTION_TYPE = dict
 
-    def __init__(self, allow_compact_load=False):
+    def __init__(self, allow_compact_load=False, precompile=False):
         self._allow_compact_load = allow_compact_load
+        # parse option templates once when loading, see Option.precompile()
+        self._precompile = precompile
 
     def _load_group(self, value) -> Group:
         # loads below also normalise
@@ -35,11 +37,14 @@ class BackendDict(Backend):
     def _load_option(self, value) -> Option:
         # TODO: this should be recursive
         value = normalise_option_dict(value, allow_compact=self._allow_compact_load)
-        return Option(
+        option = Option(
             pkg=value[K.KEY_PKG],
             defaults=value[K.KEY_DEFAULTS],
             data=value[K.KEY_DATA],
         )
+        if self._precompile:
+            option.precompile()
+        return option
 
     def _dump_group(self, group: Group):
         group = {
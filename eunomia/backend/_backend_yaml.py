@@ -1,10 +1,17 @@
-from glob import glob
+import hashlib
 import os
+import pickle
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatchcase
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 import ruamel.yaml as yaml
 
 from eunomia.backend import Backend
 from eunomia.backend._backend_dict import normalise_option_dict, BackendDict
-from eunomia.config import Group, Option
+from eunomia.config import Group, Option, LazyOption
 from eunomia.config.nodes import IgnoreNode
 
 
@@ -18,44 +25,95 @@ class BackendYaml(Backend):
     GROUP_TYPE = str
     OPTION_TYPE = str
 
-    def _get_sorted_option_paths(self, root_folder: str):
-        ext = '.yaml'
-        # get all yaml files
-        found_paths = glob(os.path.join(root_folder, f'**/*{ext}'), recursive=True)
-        # remove root folder from names
-        paths = []
-        for path in found_paths:
-            # get the relative path, strip the extension, and split
-            p = os.path.relpath(path, root_folder)
-            p = os.path.splitext(p)[0]
-            p = _os_split_path(p)
-            # append the path and split path used to sort
-            paths.append((path, p))
-        # sort paths by length, then alphabetically
-        return sorted(paths, key=lambda p: (len(p[1]), *p[1]))
+    def __init__(self, precompile=False, cache_dir: Optional[str] = None, max_workers: Optional[int] = 1, mp_context=None, lazy=False, ignore: Optional[Sequence[str]] = None):
+        # parse option templates once when loading, see Option.precompile()
+        self._precompile = precompile
+        # cache parsed option files, see _load_option_dict(...)
+        # -- cache entries are unpickled, only use trusted directories!
+        self._cache_dir = cache_dir
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # parse the option files of a group in a process pool if more than
+        # one worker is used, None uses the number of cpus. Options are
+        # still added to the group in the same order as when serial.
+        if (max_workers is not None) and (max_workers < 1):
+            raise ValueError(f'max_workers must be greater than zero, got: {repr(max_workers)}')
+        self._max_workers = max_workers
+        self._mp_context = mp_context
+        # only index the directory structure when loading a group, each option
+        # file is parsed the first time its option is used, see LazyOption.
+        # -- errors in option files are only raised when they are used
+        self._lazy = lazy
+        # glob patterns for files and folders that are skipped when loading a group,
+        # matched against their names and their paths relative to the root folder
+        self._ignore = tuple(ignore) if (ignore is not None) else ()
 
     def _load_group(self, value: GROUP_TYPE) -> Group:
         if not os.path.isdir(value):
             raise FileNotFoundError(f'root_folder={repr(value)} is not a valid directory.\n\tAre you sure the path is correct and not relative?\n\tCurrent working directory is: {repr(os.getcwdb().decode())}')
-        # load group
-        root = Group()
-        for path, (*subgroups, option_name) in self._get_sorted_option_paths(value):
-            # add subgroups
-            group = root.get_group_recursive(subgroups, make_missing=True)
-            # add option by loading file
-            group.add_option(option_name, self.load_option(path))
+        paths = list(_walk_option_paths(value, ignore=self._ignore))
+        # parse all the option files, in parallel if needed
+        # -- lazy options are only parsed when they are first used
+        if self._lazy:
+            options = (LazyOption(partial(self.load_option, path)) for path, _, _ in paths)
+        else:
+            options = map(self._make_option, self._load_option_dicts([path for path, _, _ in paths]))
+        # load group, subgroups are only added once they contain an option
+        groups = {(): Group()}
+        for (path, group_keys, option_name), option in zip(paths, options):
+            group = groups.get(group_keys, None)
+            if group is None:
+                group = _make_missing_groups(groups, group_keys)
+            # add option from the parsed file
+            group.add_option(option_name, option)
         # done!
-        return root
+        return groups[()]
 
     def _load_option(self, value: OPTION_TYPE) -> Option:
+        self._check_option_path(value)
+        # load option
+        data = self._load_option_dict(value)
+        # convert data to option
+        return self._make_option(data)
+
+    def _check_option_path(self, value: OPTION_TYPE):
         if not os.path.isfile(value):
             raise FileNotFoundError(f'root_folder={repr(value)} is not a file.\n\tAre you sure the path is correct and not relative?\n\tCurrent working directory is: {repr(os.getcwdb().decode())}')
         if os.path.splitext(value)[1] != '.yaml':
             raise ValueError(f'option file has incorrect extension: {repr(os.path.splitext(value)[1])}, should be a .yaml file')
-        # load option
-        data = yaml_load_file(value)
-        # convert data to option
-        return BackendDict(allow_compact_load=True).load_option(data)
+
+    def _make_option(self, data: dict) -> Option:
+        return BackendDict(allow_compact_load=True, precompile=self._precompile).load_option(data)
+
+    def _load_option_dict(self, path: str) -> dict:
+        data, hit = _load_option_dict(path, self._cache_dir)
+        self._count_cache(hit)
+        return data
+
+    def _load_option_dicts(self, paths: List[str]) -> List[dict]:
+        max_workers = self._max_workers or os.cpu_count() or 1
+        # starting a pool is not worth it for a single file
+        if (max_workers == 1) or (len(paths) < 2):
+            return [self._load_option_dict(path) for path in paths]
+        # check paths in the parent, so errors match the serial path
+        for path in paths:
+            self._check_option_path(path)
+        # parse in batches, pickling the normalised dictionaries
+        # is much cheaper than parsing the yaml files themselves
+        kwargs = {} if (self._mp_context is None) else dict(mp_context=self._mp_context)
+        with ProcessPoolExecutor(max_workers=max_workers, **kwargs) as pool:
+            chunksize = max(1, len(paths) // (max_workers * 4))
+            results = list(pool.map(_load_option_dict, paths, [self._cache_dir] * len(paths), chunksize=chunksize))
+        # results are in the same order as the paths
+        for _, hit in results:
+            self._count_cache(hit)
+        return [data for data, _ in results]
+
+    def _count_cache(self, hit: Optional[bool]):
+        if hit is True:
+            self.cache_hits += 1
+        elif hit is False:
+            self.cache_misses += 1
 
     def _dump_group(self, group: Group):
         raise RuntimeError('Not implemented!')  # pragma: no cover
@@ -64,33 +122,145 @@ class BackendYaml(Backend):
         raise RuntimeError('Not implemented!')  # pragma: no cover
 
 
+# ========================================================================= #
+# Option Files                                                              #
+# ========================================================================= #
+
+
+def _get_cache_version() -> tuple:
+    # entries from different versions of the cache or yaml parser, or
+    # from a different loader, eg. if ruamel.yaml.clib is installed,
+    # are ignored. The loader is only defined further below.
+    return (1, yaml.__version__, DEFAULT_YAML_LOADER.__name__)
+
+
+def _load_option_dict(path: str, cache_dir: Optional[str] = None) -> Tuple[dict, Optional[bool]]:
+    """
+    Load the normalised dictionary of an option file. If a cache directory
+    is set, the dictionaries are pickled, and the yaml file is only parsed
+    again if its contents have changed. An entry is used if the mtime and
+    size of the file have not changed, otherwise if the hash of the
+    contents of the file has not changed.
+
+    Returns the dictionary and whether the cache was hit,
+    or None if no cache directory is set.
+    """
+    if cache_dir is None:
+        return normalise_option_dict(yaml_load_file(path), allow_compact=True), None
+    # check the cache entry
+    stat = os.stat(path)
+    entry = _read_cache_entry(cache_dir, path)
+    if (entry is not None) and (entry['size'] == stat.st_size) and (entry['mtime_ns'] == stat.st_mtime_ns):
+        return entry['data'], True
+    # check the contents
+    with open(path, 'rb') as f:
+        content = f.read()
+    content_hash = hashlib.blake2b(content).hexdigest()
+    if (entry is not None) and (entry['hash'] == content_hash):
+        data, hit = entry['data'], True
+    else:
+        data, hit = normalise_option_dict(yaml_load(content.decode('utf8')), allow_compact=True), False
+    # update the entry
+    _write_cache_entry(cache_dir, path, dict(
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        hash=content_hash,
+        data=data,
+    ))
+    return data, hit
+
+
+def _get_cache_path(cache_dir: str, path: str) -> str:
+    key = hashlib.blake2b(os.path.abspath(path).encode('utf8'), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f'{key}.pkl')
+
+
+def _read_cache_entry(cache_dir: str, path: str) -> Optional[dict]:
+    try:
+        with open(_get_cache_path(cache_dir, path), 'rb') as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # corrupt entries are overwritten
+        return None
+    # check that the entry is for this file
+    if not isinstance(entry, dict):
+        return None
+    if (entry.get('version', None) != _get_cache_version()) or (entry.get('path', None) != os.path.abspath(path)):
+        return None
+    return entry
+
+
+def _write_cache_entry(cache_dir: str, path: str, entry: dict):
+    os.makedirs(cache_dir, exist_ok=True)
+    entry = dict(entry, version=_get_cache_version(), path=os.path.abspath(path))
+    # write atomically so that concurrent readers never see partial entries
+    fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, _get_cache_path(cache_dir, path))
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
 # ========================================================================= #
 # Path Util                                                                 #
 # ========================================================================= #
 
 
-def _os_split_path(path, force_relative=True):
-    # get the path
-    if force_relative:
-        assert not os.path.isabs(path)
-    # get the normalised path
-    path = os.path.normpath(path)
-    # split the path into its keys
-    parts, head = [], path
-    while True:
-        head, tail = os.path.split(head)
-        if tail:
-            parts.append(tail)
-            continue
-        elif head:
-            parts.append(head)
-        break
-    parts = parts[::-1]
-    # check the path is the original
-    recon_path = os.path.join(*parts) if parts else ''
-    if recon_path != path:
-        raise RuntimeError(f'reconstructed path {repr(recon_path)} is not equal to original {repr(path)}')
-    return parts
+_OPTION_EXT = '.yaml'
+
+
+def _walk_option_paths(root_folder: str, ignore: Sequence[str] = ()) -> Iterator[Tuple[str, Tuple[str, ...], str]]:
+    """
+    Yield the (path, group_keys, option_name) of every option file under the
+    root folder, in a single pass over the folders using os.scandir.
+
+    Options are yielded in order of their depth, then alphabetically by their
+    keys. Folders are visited breadth first, and the entries of each folder
+    are sorted, so that this order is produced without sorting all the paths.
+
+    - hidden files and folders, starting with a '.', are skipped
+    - entries matching any of the ignore patterns are skipped
+    """
+    level = [(root_folder, ())]
+    while level:
+        next_level = []
+        for folder, group_keys in level:
+            options, subfolders = [], []
+            with os.scandir(folder) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith('.'):
+                        continue
+                    if ignore and _is_ignored(name, group_keys, ignore):
+                        continue
+                    if entry.is_dir():
+                        subfolders.append((name, entry.path))
+                    elif name.endswith(_OPTION_EXT) and entry.is_file():
+                        options.append((name[:-len(_OPTION_EXT)], entry.path))
+            # options at this depth
+            for option_name, path in sorted(options):
+                yield path, group_keys, option_name
+            # folders at the next depth, in order of their keys
+            next_level.extend((path, group_keys + (name,)) for name, path in sorted(subfolders))
+        level = next_level
+
+
+def _is_ignored(name: str, group_keys: Tuple[str, ...], ignore: Sequence[str]) -> bool:
+    rel_path = '/'.join(group_keys + (name,))
+    return any(fnmatchcase(name, pattern) or fnmatchcase(rel_path, pattern) for pattern in ignore)
+
+
+def _make_missing_groups(groups: Dict[Tuple[str, ...], Group], group_keys: Tuple[str, ...]) -> Group:
+    parent = groups.get(group_keys[:-1], None)
+    if parent is None:
+        parent = _make_missing_groups(groups, group_keys[:-1])
+    group = groups[group_keys] = parent.new_subgroup(group_keys[-1])
+    return group
 
 
 # ========================================================================= #
@@ -145,6 +315,53 @@ EunomiaSafeLoader.add_constructors(['!str'], EunomiaSafeLoader.construct_node_ig
 # EunomiaSafeLoader.add_constructors(['!sub'], EunomiaSafeLoader.construct_node_sub)
 
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+# C Loader                                                                  #
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+
+# the C parser is only available if ruamel.yaml.clib is installed
+try:
+    from ruamel.yaml.cyaml import CParser as _CParser
+except ImportError:
+    _CParser = None
+
+
+if _CParser is not None:
+
+    class EunomiaCSafeLoader(_CParser, yaml.SafeConstructor, yaml.VersionedResolver):
+        """
+        The same as EunomiaSafeLoader, but scanning and parsing is done by
+        libyaml. Unlike ruamel's CSafeLoader which always resolves values
+        with YAML 1.1 rules, the versioned resolver is used so that the
+        results are the same as the pure-python loader.
+
+        - %YAML directives in documents are ignored, the version
+          given when loading is always used. yaml_load(...) falls back
+          to EunomiaSafeLoader for documents with these directives.
+        """
+
+        def __init__(self, stream, version=None, preserve_quotes=None, always_substitute_strings=True):
+            _CParser.__init__(self, stream)
+            self._parser = self._composer = self
+            yaml.SafeConstructor.__init__(self, loader=self)
+            yaml.VersionedResolver.__init__(self, version, loader=self)
+            # custom config values
+            self._always_substitute_strings = always_substitute_strings
+
+        construct_node_ignore = EunomiaSafeLoader.construct_node_ignore
+
+    # constructors are registered per class, they need to match EunomiaSafeLoader
+    EunomiaCSafeLoader.add_constructor('!str', EunomiaCSafeLoader.construct_node_ignore)
+
+else:
+    EunomiaCSafeLoader = None
+
+
+# the loader used by yaml_load(...), the C loader if it is available
+DEFAULT_YAML_LOADER = EunomiaSafeLoader if (EunomiaCSafeLoader is None) else EunomiaCSafeLoader
+
+
 # NOTE: unknown tags can be parsed
 #       - https://github.com/kislyuk/yq/blob/2dd5cf39e18f2caf0c416e3da1c93a62bc801e0b/yq/loader.py#L57
 # TODO: hydra adds the following implicit_resolvers & filters them
@@ -157,13 +374,23 @@ EunomiaSafeLoader.add_constructors(['!str'], EunomiaSafeLoader.construct_node_ig
 # ========================================================================= #
 
 
-def yaml_load(string):
-    return yaml.load(string, EunomiaSafeLoader, version='1.2')
+# the C loader ignores %YAML directives, which may change how values are resolved
+_YAML_DIRECTIVE_REGEX = re.compile(r'^%YAML', re.MULTILINE)
+
+
+def yaml_load(string, loader=None):
+    if loader is None:
+        loader = DEFAULT_YAML_LOADER
+        if (loader is not EunomiaSafeLoader) and _YAML_DIRECTIVE_REGEX.search(string):
+            loader = EunomiaSafeLoader
+    return yaml.load(string, loader, version='1.2')
 
 
 def yaml_load_file(path):
-    with open(path, 'r') as f:
-        return yaml_load(f.read())
+    # files are always decoded as utf8, the same as when they are cached,
+    # so that the results do not depend on the locale or the cache
+    with open(path, 'rb') as f:
+        return yaml_load(f.read().decode('utf8'))
 
 
 # ========================================================================= #
@@ -1,3 +1,4 @@
 
-from ._config import Group, Option
+from ._config import Group, Option, LazyOption
 from ._loader import ConfigLoader
+from ._resolver import LazyConfig
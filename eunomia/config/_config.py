@@ -1,4 +1,5 @@
-from typing import Dict, Union, List, Tuple
+import threading
+from typing import Callable, Dict, Union, List, Tuple
 
 from eunomia.util._util_traverse import RecursiveTransformer
 from eunomia.config.nodes import ConfigNode, SubNode
@@ -14,11 +15,16 @@ from eunomia.config import keys as K
 
 class _ConfigObject(object):
 
+    # incremented whenever any config tree is modified,
+    # used to invalidate cached merge plans
+    _MODIFICATIONS = 0
+
     def __init__(self):
         super().__init__()
         self._parent = None
         self._key = None
         self._children = {}
+        self._frozen = False
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
     # Path                                                                  #
@@ -113,6 +119,8 @@ class _ConfigObject(object):
     def add_child(self, key: str, child: '_ConfigObject') -> '_ConfigObject':
         if not isinstance(child, _ConfigObject):
             raise TypeError(f'child must be an instance of {_ConfigObject.__name__}')
+        if self._frozen or child._frozen:
+            raise RuntimeError(f'cannot add child with key: {repr(key)}, the config tree is frozen.')
         if child.has_parent:
             raise ValueError(f'child already has a parent, and cannot be added.')
         if key in self._children:
@@ -121,15 +129,19 @@ class _ConfigObject(object):
         child._parent = self
         child._key = key
         self._children[key] = child
+        _ConfigObject._MODIFICATIONS += 1
         # return the added value
         return child
 
     def del_child(self, key: str):
+        if self._frozen:
+            raise RuntimeError(f'cannot delete child with key: {repr(key)}, the config tree is frozen.')
         child = self.get_child(key)
         # remove details
         child._parent = None
         child._key = None
         del self._children[key]
+        _ConfigObject._MODIFICATIONS += 1
         return child
 
     def get_child(self, key: str):
@@ -145,6 +157,28 @@ class _ConfigObject(object):
     def __iter__(self):
         raise NotImplementedError
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Freeze                                                                #
+    # - frozen trees can be safely shared between multiple loaders.         #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    @property
+    def is_frozen(self) -> bool:
+        return self._frozen
+
+    def freeze(self, frozen=True):
+        """
+        Freeze (or unfreeze) this config object and all of
+        its descendants, disallowing children from being
+        added or removed while frozen.
+        """
+        for node in self.walk_descendants():
+            node._frozen = frozen
+        return self
+
+    def unfreeze(self):
+        return self.freeze(frozen=False)
+
 
 # ========================================================================= #
 # Group                                                                     #
@@ -451,6 +485,8 @@ class Option(_ConfigObject):
         self._data = V.validate_option_data(data)
         self._pkg = V.validate_option_package(pkg)
         self._defaults = V.validate_option_defaults(defaults, allow_config_nodes=True)
+        # template data shared between loads, see precompile()
+        self._precompiled_data = None
 
     @property
     def pkg(self) -> str:
@@ -534,8 +570,43 @@ class Option(_ConfigObject):
         return self._ReplaceStrings().transform(self._pkg)
 
     def get_unresolved_data(self):
+        if self._precompiled_data is not None:
+            return self._precompiled_data
         return self._ReplaceStrings().transform(self._data)
 
+    class _PrecompileStrings(_ReplaceStrings):
+        def _transform_str(self, value):
+            return self._fold(SubNode(value).precompile())
+        def __transform_default__(self, value):
+            if isinstance(value, ConfigNode):
+                return self._fold(value.precompile())
+            return value
+        @staticmethod
+        def _fold(node: ConfigNode):
+            # constant templates are resolved once, folded expressions
+            # are immutable so the values can be shared between loads
+            if not node.is_constant:
+                return node
+            try:
+                return node.get_config_value({}, {}, {})
+            except Exception:
+                # errors are deferred until the value is resolved
+                return node
+
+    @property
+    def is_precompiled(self) -> bool:
+        return self._precompiled_data is not None
+
+    def precompile(self) -> 'Option':
+        """
+        Replace strings and parse all config nodes in the data of the option
+        once, instead of on every load. Constant templates are replaced with
+        their values. The resulting template is shared between all loads and
+        is never modified by the loader.
+        """
+        self._precompiled_data = self._PrecompileStrings().transform(self._data)
+        return self
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
     # Children - disabled for the option node                               #
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
@@ -557,6 +628,55 @@ class Option(_ConfigObject):
         return f'{self.__class__.__name__}(data={repr(self._data)}, pkg={repr(self._pkg)}, defaults={repr(self._defaults)})'
 
 
+# ========================================================================= #
+# Lazy Option                                                               #
+# ========================================================================= #
+
+
+# options are only ever loaded once, even when the
+# same config tree is shared between multiple threads
+_LAZY_OPTION_LOCK = threading.RLock()
+
+
+class LazyOption(Option):
+    """
+    An option whose data, package and defaults are only loaded the
+    first time that they are accessed, by calling load() which should
+    return the actual option. The structure of a config tree can then
+    be listed and traversed without loading all of its options.
+
+    - errors from loading the option are only raised on first access.
+    """
+
+    _LAZY_ATTRS = frozenset(['_data', '_pkg', '_defaults', '_precompiled_data'])
+
+    def __init__(self, load: Callable[[], Option]):
+        _ConfigObject.__init__(self)
+        self._load = load
+
+    @property
+    def is_loaded(self) -> bool:
+        return '_data' in self.__dict__
+
+    def __getattr__(self, name):
+        # only called if the attribute is missing, ie. not yet loaded
+        if name not in LazyOption._LAZY_ATTRS:
+            raise AttributeError(f'{repr(self.__class__.__name__)} object has no attribute {repr(name)}')
+        with _LAZY_OPTION_LOCK:
+            if not self.is_loaded:
+                option = self.__dict__['_load']()
+                if not isinstance(option, Option):
+                    raise TypeError(f'lazily loaded option must be a: {Option}, got: {type(option)}')
+                # _data is set last, marking the option as loaded
+                self.__dict__.update(_pkg=option._pkg, _defaults=option._defaults, _precompiled_data=option._precompiled_data, _data=option._data)
+        return self.__dict__[name]
+
+    def __repr__(self):
+        if not self.is_loaded:
+            return f'{self.__class__.__name__}(loaded=False)'
+        return super().__repr__()
+
+
 # ========================================================================= #
 # End                                                                       #
 # ========================================================================= #
@@ -64,6 +64,9 @@ class DefaultTransformer(Transformer):
     def _transform_Option(self, option: Option):
         return option.group, [option]
 
+    # transforms are looked up by the exact type name
+    _transform_LazyOption = _transform_Option
+
     def _transform_dict(self, dct: dict):
         # checks
         if len(dct) != 1:
@@ -1,14 +1,84 @@
-from typing import Tuple, List, Union, Optional
+from collections import namedtuple
+from typing import Iterable, Iterator, Tuple, List, Union, Optional
 
 from eunomia.config._default import Default
+from eunomia.config._resolver import ConfigResolver, LazyConfig
+from eunomia.util._util_cache import LruCache
+from eunomia.util._util_fingerprint import fingerprint
 from eunomia.util._util_dict import recursive_getitem, dict_recursive_update
 from eunomia.config import Option, Group
+from eunomia.config._config import _ConfigObject
 from eunomia.config.nodes import ConfigNode
 
 from eunomia.config import keys as K
 from eunomia.config import validate as V
 
 
+# ========================================================================= #
+# Merge Plan                                                                #
+# ========================================================================= #
+
+
+def _merge_option_data(merged_config: dict, option: Option, pkg_keys: Tuple[str], copy_on_write: bool) -> bool:
+    """
+    Merge the data of the option into the config, returning True if the
+    merged config may now contain dictionaries that are shared with other
+    configs, in which case the next merges need to copy on write.
+    - precompiled option data is shared by reference between loads
+    """
+    # 1. get the root config object according to the package
+    root = recursive_getitem(merged_config, pkg_keys, make_missing=True, copy_on_write=copy_on_write)
+    # 2. merge the option into the config
+    data = option.get_unresolved_data()
+    dict_recursive_update(left=root, right=data, allow_overwrite=True, copy_on_write=copy_on_write)
+    return copy_on_write or option.is_precompiled
+
+
+class MergePlan(object):
+    """
+    The ordered list of options and the package keys that they are merged
+    into, recorded while visiting the defaults of an entrypoint with a set
+    of overrides. Replaying a plan gives the same merged config without
+    resolving any of the defaults again.
+    """
+
+    def __init__(self, entrypoint: str, steps: List[Tuple[Option, Tuple[str]]], merged_options: dict):
+        self.entrypoint = entrypoint
+        self.steps = tuple(steps)
+        self.merged_options = {k: tuple(v) for k, v in merged_options.items()}
+
+    def replay(self) -> Tuple[dict, dict]:
+        merged_config, shared = {}, False
+        for option, pkg_keys in self.steps:
+            shared = _merge_option_data(merged_config, option, pkg_keys, copy_on_write=shared)
+        return merged_config, {k: list(v) for k, v in self.merged_options.items()}
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(entrypoint={repr(self.entrypoint)}, steps={[(o.abs_path, k) for o, k in self.steps]})'
+
+
+# ========================================================================= #
+# Merge Trace                                                               #
+# - records the defaults resolved and overrides consulted while visiting    #
+#   options, so that the loading of a different set of overrides can       #
+#   fast-forward through the shared prefix, and only merge the suffix      #
+#   after the first override that differs.                                 #
+# ========================================================================= #
+
+
+# the state of the loader before an override is consulted,
+# shallow copies are enough because merging uses copy on write
+_LoaderSnapshot = namedtuple('_LoaderSnapshot', ['merged_config', 'merged_options', 'first_merge_from', 'plan_steps'])
+
+
+_EVENT_DEFAULT = 'default'
+_EVENT_OVERRIDE = 'override'
+_EVENT_END = 'end'
+
+
 # ========================================================================= #
 # Config Loader                                                             #
 # ========================================================================= #
@@ -16,23 +86,47 @@ from eunomia.config import validate as V
 
 class ConfigLoader(object):
 
-    def __init__(self, root_group: Group, overrides: list = None):
+    """
+    Load merged configs from a root group. The loader can be reused, the
+    merge plan for each entrypoint and set of overrides is cached so that
+    the defaults do not need to be resolved again on subsequent loads.
+
+    - cached plans are cleared if any config tree is modified.
+    - loaders are not thread-safe, but a frozen config tree can be
+      shared between the loaders of different threads.
+    """
+
+    def __init__(self, root_group: Group, overrides: list = None, max_cached_plans: Optional[int] = 128):
         # check root group
         if not isinstance(root_group, Group):
             raise TypeError(f'root_group must be a {Group.__name__}')
         self._root_group = root_group
-        # has_run
-        self._has_run = False
+        # make defaults overrides
+        self._default_overrides = self._resolve_overrides_list(overrides)
+        # cached merge plans
+        self._plans = LruCache(maxsize=max_cached_plans)
+        self._plans_modifications = _ConfigObject._MODIFICATIONS
         # merged items
+        self._reset(self._default_overrides)
+        # debug
+        self._debug = False
+        self._debug_depth = 0
+
+    def _reset(self, overrides: dict):
         self._merged_options = {}
         self._first_merge_from = {}
         self._merged_config = {}
-        # make defaults overrides
-        self._overrides = self._resolve_overrides_list(overrides)
+        # if the merged config shares dictionaries with precompiled
+        # options or snapshots, these need to be copied on write
+        self._merged_config_shared = False
+        self._overrides = overrides
         self._overridden = {}
-        # debug
-        self._debug = False
-        self._debug_depth = 0
+        self._plan_steps = []
+        # tracing, None if disabled
+        self._trace = None
+        # fast-forwarding through a previous trace, None if disabled
+        self._ff_trace = None
+        self._ff_pos = 0
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
     # Checks                                                                #
@@ -63,7 +157,7 @@ class ConfigLoader(object):
     # Core Algorithm                                                        #
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
 
-    def load_config(self, config_name, return_merged_options=False) -> Union[dict, Tuple[dict, dict]]:
+    def load_config(self, config_name, return_merged_options=False, lazy=False, overrides: list = None, return_fingerprint=False) -> Union[dict, LazyConfig, tuple]:
         """
         flatten and merge the options lists using DFS, while
         simultaneously merging the config
@@ -72,12 +166,97 @@ class ConfigLoader(object):
           processed using DFS to obtain substituted values, before
           being merged into the config.
             * Keys are not allowed to be substituted values
+        - If lazy=True, a read-only LazyConfig is returned instead that
+          only resolves values when they are accessed.
+        - If overrides are given, these are used instead of the
+          overrides passed to the constructor.
+        - If return_fingerprint=True, a stable digest of the resolved
+          config is also returned last, see eunomia.fingerprint
         """
         # ===================== #
-        # make sure we cant run the loader more than once
-        if self._has_run:
-            raise RuntimeError('Loader cannot be run more than once!')
-        self._has_run = True
+        # 1. get the merged config, replaying the plan if it was cached
+        plan, is_recorded = self._get_merge_plan(config_name, overrides)
+        if not is_recorded:
+            if self._debug:
+                print(f'\nreplaying cached plan for entrypoint: {repr(plan.entrypoint)}')
+            self._merged_config, self._merged_options = plan.replay()
+        # ===================== #
+        # 2. finally resolve all the values in the config
+        self._resolve_all_values(lazy=lazy)
+        # ===================== #
+
+        # done, return the result
+        results = (self._merged_config,)
+        if return_merged_options:
+            results += (self._merged_options,)
+        if return_fingerprint:
+            results += (fingerprint(self._merged_config),)
+        return results if (len(results) > 1) else results[0]
+
+    def get_merge_plan(self, config_name, overrides: list = None) -> MergePlan:
+        """
+        Get the merge plan for the entrypoint and overrides, without resolving
+        any values. The plan is cached and re-used by subsequent loads.
+        """
+        return self._get_merge_plan(config_name, overrides)[0]
+
+    def _get_merge_plan(self, config_name, overrides: Optional[list]) -> Tuple[MergePlan, bool]:
+        overrides = self._default_overrides if (overrides is None) else self._resolve_overrides_list(overrides)
+        key = (config_name, _get_overrides_key(overrides))
+        # plans are no longer valid if the config tree was modified
+        if self._plans_modifications != _ConfigObject._MODIFICATIONS:
+            self._plans.clear(reset_stats=False)
+            self._plans_modifications = _ConfigObject._MODIFICATIONS
+        # get the cached plan
+        plan = self._plans.get(key)
+        if plan is not None:
+            return plan, False
+        # record a new plan, the state of the loader holds the merged config
+        plan = self._record_merge_plan(config_name, overrides)
+        self._plans.put(key, plan)
+        return plan, True
+
+    @property
+    def plan_cache_info(self):
+        return self._plans.info()
+
+    def load_configs(self, config_name, overrides_list: Iterable[list], lazy=False) -> Iterator[Union[dict, LazyConfig]]:
+        """
+        Load a config for each set of overrides in turn. Each load fast-forwards
+        through the trace of the previous load up until the first override that
+        differs, and then only merges the remaining options from that point.
+        - loads sharing more of the start of their merge order should be
+          adjacent, see get_override_consult_order(...)
+        """
+        prev_trace = None
+        for overrides in overrides_list:
+            overrides = self._resolve_overrides_list(overrides)
+            self._record_merge_plan(config_name, overrides, trace=True, prev_trace=prev_trace)
+            prev_trace = self._trace
+            self._resolve_all_values(lazy=lazy)
+            yield self._merged_config
+
+    def get_override_consult_order(self, config_name, overrides: list = None) -> List[Tuple[str, ...]]:
+        """
+        Get the keys of the groups in the order that their defaults
+        are visited, which is when overrides for them are consulted.
+        """
+        overrides = self._default_overrides if (overrides is None) else self._resolve_overrides_list(overrides)
+        self._record_merge_plan(config_name, overrides, trace=True)
+        return [event[1] for event in self._trace if event[0] == _EVENT_OVERRIDE]
+
+    def get_override_group_keys(self, override) -> List[Tuple[str, ...]]:
+        """
+        Get the keys of the groups that an override applies to.
+        """
+        return list(self._resolve_overrides_list([override]).keys())
+
+    def _record_merge_plan(self, config_name, overrides: dict, trace=False, prev_trace: list = None) -> MergePlan:
+        self._reset(overrides)
+        if trace:
+            self._trace = []
+            if prev_trace is not None:
+                self._ff_trace, self._ff_pos = prev_trace, 0
         # ===================== #
         # 1. entry point for dfs, get initial option
         entry_option = self._root_group.get_option(config_name)
@@ -88,18 +267,15 @@ class ConfigLoader(object):
         self._pre_merge_checks()
         # 2.2. perform dfs & merging and finally resolve values
         self._visit_option(entry_option, parent_option=None)
+        # -- restore the final state if the previous trace never diverged
+        if self._ff_trace is not None:
+            self._trace_end()
+        elif self._trace is not None:
+            self._trace.append((_EVENT_END, self._snapshot()))
         # 2.3 post checks
         self._post_merge_checks()
         # ===================== #
-        # 3. finally resolve all the values in the config
-        self._resolve_all_values()
-        # ===================== #
-
-        # done, return the result
-        if return_merged_options:
-            return self._merged_config, self._merged_options
-
-        return self._merged_config
+        return MergePlan(config_name, self._plan_steps, self._merged_options)
 
     def _visit_option(self, option: Option, parent_option: Optional[Option]):
         if self._debug:
@@ -120,7 +296,7 @@ class ConfigLoader(object):
         for default in defaults:
             # normalise the default
             # -- various different objects as well as substitution need to be handled
-            d_obj, d_options, d_pkg_keys, d_is_self = default.to_resolved_components(option, resolver=self._resolve_value)
+            d_obj, d_options, d_pkg_keys, d_is_self = self._trace_resolve_default(option, default)
             if self._debug:
                 print(f'{" " * self._debug_depth * 4}? resolved default { {d_obj.abs_path: [o.key for o in d_options]} } from {default._default}')
             # ===================== #
@@ -135,12 +311,14 @@ class ConfigLoader(object):
                 # ===================== #
                 # 2.a if self is encountered, merge into config. We skip the
                 #     value of the option_name here as it is not needed.
-                self._merge_option(*d_options, pkg_keys=d_pkg_keys, parent_option=parent_option)
+                #     -- already merged if fast-forwarding through a trace
+                if self._ff_trace is None:
+                    self._merge_option(*d_options, pkg_keys=d_pkg_keys, parent_option=parent_option)
                 # ===================== #
             else:
                 # ===================== #
                 # allow groups/options to be overridden
-                o_obj, o_options = self._resolve_override(option, d_obj, d_options)
+                o_obj, o_options = self._trace_resolve_override(option, d_obj, d_options)
                 if o_obj is not d_obj:
                     raise AssertionError('this should never happen. overridden default options come from different group.')
                 # ===================== #
@@ -181,17 +359,82 @@ class ConfigLoader(object):
         # mark group as visited
         self._merged_options.setdefault(group_keys, []).append(option.key)
         # ===================== #
-        # 2. merged the data
+        # 2. merged the data, recording the step for the merge plan
         # ===================== #
-        # 2.1. get the root config object according to the package
-        root = recursive_getitem(self._merged_config, pkg_keys, make_missing=True)
-        # 2.2. merge the option into the config
-        data = option.get_unresolved_data()
-        dict_recursive_update(left=root, right=data, allow_overwrite=True)
+        self._merged_config_shared = _merge_option_data(self._merged_config, option, pkg_keys, copy_on_write=self._merged_config_shared)
+        self._plan_steps.append((option, pkg_keys))
         # ===================== #
         if self._debug:
             print(f'{" "*self._debug_depth*4}* merged data from {repr(option.abs_path)} into output config at {pkg_keys}')
 
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Tracing                                                               #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def _snapshot(self) -> _LoaderSnapshot:
+        # nested dictionaries are shared with the snapshot
+        self._merged_config_shared = True
+        return _LoaderSnapshot(
+            merged_config=dict(self._merged_config),
+            merged_options={k: tuple(v) for k, v in self._merged_options.items()},
+            first_merge_from=dict(self._first_merge_from),
+            plan_steps=tuple(self._plan_steps),
+        )
+
+    def _restore(self, snapshot: _LoaderSnapshot):
+        # overrides that were used are not restored, these
+        # are tracked for the current overrides while fast-forwarding
+        self._merged_config = dict(snapshot.merged_config)
+        self._merged_config_shared = True
+        self._merged_options = {k: list(v) for k, v in snapshot.merged_options.items()}
+        self._first_merge_from = dict(snapshot.first_merge_from)
+        self._plan_steps = list(snapshot.plan_steps)
+
+    def _trace_next(self, event_type: str):
+        event = self._ff_trace[self._ff_pos]
+        if event[0] != event_type:
+            raise AssertionError(f'this should never happen. trace has diverged, expected: {repr(event_type)} got: {repr(event[0])}')
+        self._ff_pos += 1
+        self._trace.append(event)
+        return event
+
+    def _trace_end(self):
+        _, snapshot = self._trace_next(_EVENT_END)
+        self._restore(snapshot)
+        self._ff_trace = None
+
+    def _trace_resolve_default(self, option: Option, default: Default):
+        # reuse the previous result when fast-forwarding, the state
+        # of the loader is the same as when it was first resolved
+        if self._ff_trace is not None:
+            return self._trace_next(_EVENT_DEFAULT)[1]
+        components = default.to_resolved_components(option, resolver=self._resolve_value)
+        if self._trace is not None:
+            self._trace.append((_EVENT_DEFAULT, components))
+        return components
+
+    def _trace_resolve_override(self, option: Option, d_obj: Union[Group, Option], d_options: List[Option]) -> Tuple[Union[Group, Option], List[Option]]:
+        if self._trace is None:
+            return self._resolve_override(option, d_obj, d_options)
+        # continue fast-forwarding if the same options are chosen,
+        # otherwise restore the state from before this point and
+        # stop fast-forwarding so that the remainder is merged
+        if self._ff_trace is not None:
+            o_obj, o_options = self._resolve_override(option, d_obj, d_options)
+            _, _, snapshot, prev_options = self._ff_trace[self._ff_pos]
+            if tuple(o_options) == prev_options:
+                self._trace_next(_EVENT_OVERRIDE)
+            else:
+                self._restore(snapshot)
+                self._ff_trace = None
+                self._trace.append((_EVENT_OVERRIDE, d_obj.group_keys, snapshot, tuple(o_options)))
+            return o_obj, o_options
+        # record the state before the override
+        snapshot = self._snapshot()
+        o_obj, o_options = self._resolve_override(option, d_obj, d_options)
+        self._trace.append((_EVENT_OVERRIDE, d_obj.group_keys, snapshot, tuple(o_options)))
+        return o_obj, o_options
+
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
     # Resolving Values                                                      #
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
@@ -234,21 +477,22 @@ class ConfigLoader(object):
             value = value.get_config_value(self._merged_config, self._merged_options, {})
         return value
 
-    def _resolve_all_values(self):
-        # TODO: this is wrong!
-        # TODO: config is not mutated on the fly, cannot substitute chains of values.
-        self._merged_config = ConfigNode.recursive_get_config_value(
-            self._merged_config,
-            self._merged_options,
-            {},
-            self._merged_config
-        )
+    def _resolve_all_values(self, lazy=False):
+        # values are resolved in dependency order so that chains of
+        # references and expressions see the resolved values.
+        resolver = ConfigResolver(self._merged_config, self._merged_options)
+        self._merged_config = LazyConfig(resolver) if lazy else resolver.resolve()
 
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
     # END Loader                                                            #
     # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
 
 
+def _get_overrides_key(overrides: dict):
+    # the order of overrides does not matter, they are looked up by group
+    return tuple(sorted((group_keys, tuple(o.key for o in o_options)) for group_keys, (_, o_options) in overrides.items()))
+
+
 # ========================================================================= #
 # End                                                                       #
 # ========================================================================= #
@@ -0,0 +1,406 @@
+import ast
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from eunomia.config.nodes import ConfigNode, IgnoreNode, RefNode, EvalNode, SubNode
+from eunomia.config.nodes._nodes import OptNode, _is_literal_string
+from eunomia.config.nodes._util_interpret import parse_expr
+from eunomia.util._util_cache import LruCache
+from eunomia.util._util_dict import recursive_setitem
+
+from eunomia.config import validate as V
+
+
+# ========================================================================= #
+# Dependencies                                                              #
+# ========================================================================= #
+
+
+# the path to the root of the config, used as
+# the dependency for nodes that could reference
+# any value in the config.
+_ROOT = ()
+
+
+def _get_constant_str(node) -> Optional[str]:
+    # TODO: deprecated! old python language feature!
+    if isinstance(node, ast.Index):
+        node = node.value
+    # TODO: deprecated! old python language feature!
+    if isinstance(node, ast.Str):
+        return node.s
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+# process-wide cache of the paths accessed by expressions
+# - resize or disable with: EXPR_DEPS_CACHE.resize(maxsize)
+EXPR_DEPS_CACHE = LruCache(maxsize=4096)
+
+
+def get_expr_dependencies(string: str, name: str = 'conf') -> List[Tuple[str, ...]]:
+    """
+    Statically find the paths in the config that an expression accesses,
+    from chains of attributes or constant subscripts on the config symbol:
+        eg. conf.a.b or conf['a'].b gives the path ('a', 'b')
+    If the config symbol is used in any other way, then the chain stops
+    and the expression depends on the entire subtree at that point.
+    """
+    # skip parsing if the symbol is never used
+    if name not in string:
+        return []
+    return list(EXPR_DEPS_CACHE.get_or_make((string, name), _get_expr_dependencies))
+
+
+def _get_expr_dependencies(key: Tuple[str, str]) -> Tuple[Tuple[str, ...], ...]:
+    string, name = key
+    tree = parse_expr(string)
+    # get the parents of all nodes
+    parents = {}
+    for node in ast.walk(tree):
+        for child in ast.iter_child_nodes(node):
+            parents[child] = node
+    # find all the paths
+    paths = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Name) and node.id == name):
+            continue
+        keys = []
+        while True:
+            parent = parents.get(node, None)
+            if isinstance(parent, ast.Attribute) and (parent.value is node):
+                key = parent.attr
+            elif isinstance(parent, ast.Subscript) and (parent.value is node):
+                key = _get_constant_str(parent.slice)
+            else:
+                key = None
+            if key is None:
+                break
+            keys.append(key)
+            node = parent
+        paths.append(tuple(keys))
+    return tuple(paths)
+
+
+def get_node_dependencies(node: ConfigNode) -> List[Tuple[str, ...]]:
+    """
+    Get the paths in the config that the value of a node depends on.
+    Errors are ignored here, and are instead raised when resolving the node.
+    """
+    if isinstance(node, (IgnoreNode, OptNode)):
+        return []
+    elif isinstance(node, RefNode):
+        try:
+            keys, is_relative = V.split_package_path(node.raw_value)
+        except Exception:
+            return []
+        return [] if is_relative else [tuple(keys)]
+    elif isinstance(node, EvalNode):
+        try:
+            return get_expr_dependencies(node.raw_value)
+        except SyntaxError:
+            return []
+    elif isinstance(node, SubNode):
+        try:
+            nodes = node.get_sub_nodes()
+        except Exception:
+            return []
+        return [path for n in nodes if not isinstance(n, str) for path in get_node_dependencies(n)]
+    # unknown nodes could depend on anything
+    return [_ROOT]
+
+
+def get_value_dependencies(value: Any) -> List[Tuple[str, ...]]:
+    if isinstance(value, ConfigNode):
+        return get_node_dependencies(value)
+    elif isinstance(value, (list, tuple, set)):
+        return [path for v in value for path in get_value_dependencies(v)]
+    elif isinstance(value, dict):
+        return [path for kv in value.items() for v in kv for path in get_value_dependencies(v)]
+    return []
+
+
+def _contains_nodes(value: Any) -> bool:
+    if isinstance(value, ConfigNode):
+        return True
+    elif isinstance(value, (list, tuple, set)):
+        return any(_contains_nodes(v) for v in value)
+    elif isinstance(value, dict):
+        return any(_contains_nodes(k) or _contains_nodes(v) for k, v in value.items())
+    return False
+
+
+def _copy_containers(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    elif isinstance(value, tuple):
+        return tuple(_copy_containers(v) for v in value)
+    elif isinstance(value, set):
+        return set(_copy_containers(v) for v in value)
+    return value
+
+
+# ========================================================================= #
+# Config Resolver                                                           #
+# ========================================================================= #
+
+
+class ConfigResolver(object):
+    """
+    Resolve all the config nodes in a merged config.
+
+    A dependency graph is built between the values in the config that
+    contain nodes, these values are then resolved in topological order
+    so that every value is only resolved once, and values that depend
+    on other values always see the resolved result.
+
+    - references to a path depend on the values at all the parents
+      of the path, as well as all the values under that path.
+    - cycles between values raise an error.
+    """
+
+    def __init__(self, merged_config: dict, merged_options: dict):
+        self._merged_options = merged_options
+        # find all the values containing nodes
+        self._leaves: Dict[Tuple[str, ...], Any] = {}
+        self._subtrees: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+        # structural copy of the config, nodes are replaced with
+        # their resolved values in-place, memoizing results.
+        self._config = self._copy_find_leaves(merged_config, ())
+        # values that have already been resolved
+        self._resolved = set()
+        # values that read a subtree containing themselves
+        self._reads_ancestors: Dict[Tuple[str, ...], bool] = {}
+
+    def _copy_find_leaves(self, dct: dict, keys: Tuple[str, ...]) -> dict:
+        copy = {}
+        for k, v in dct.items():
+            if isinstance(v, dict):
+                v = self._copy_find_leaves(v, keys + (k,))
+            elif isinstance(v, SubNode) and isinstance(v.raw_value, str) and _is_literal_string(v.raw_value):
+                # plain strings do not need to be resolved
+                v = v.raw_value
+            elif isinstance(v, ConfigNode):
+                self._add_leaf(keys + (k,), v)
+            elif isinstance(v, (list, tuple, set)):
+                v = _copy_containers(v)
+                if _contains_nodes(v):
+                    self._add_leaf(keys + (k,), v)
+            copy[k] = v
+        return copy
+
+    def _add_leaf(self, path: Tuple[str, ...], value: Any):
+        self._leaves[path] = value
+        for i in range(len(path)):
+            self._subtrees.setdefault(path[:i], []).append(path)
+
+    @property
+    def num_leaves(self) -> int:
+        return len(self._leaves)
+
+    @property
+    def num_resolved(self) -> int:
+        return len(self._resolved)
+
+    @property
+    def config(self) -> dict:
+        """
+        The config with all the values resolved so far.
+        """
+        return self._config
+
+    def is_leaf(self, path: Tuple[str, ...]) -> bool:
+        return path in self._leaves
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Graph                                                                 #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def get_leaf_dependencies(self, path: Tuple[str, ...]) -> List[Tuple[str, ...]]:
+        """
+        Get the paths to the other values containing nodes
+        that the value at the given path depends on.
+        """
+        return list(self._get_leaf_dependencies(path).keys())
+
+    def _get_leaf_dependencies(self, path: Tuple[str, ...]) -> Dict[Tuple[str, ...], bool]:
+        """
+        Get the dependencies of a value, mapped to True if the dependency
+        is weak. A value is weakly dependent on the other values under an
+        ancestor subtree that it reads, eg. the entire config. These are
+        resolved first if possible, but the value is resolved against
+        the partly resolved config instead of raising cycle errors.
+        - values that read an ancestor subtree are never
+          dependent on other values that do the same.
+        """
+        deps = {}
+        for dep in get_value_dependencies(self._leaves[path]):
+            # values at the parents of the path are walked through
+            for i in range(len(dep) + 1):
+                if dep[:i] in self._leaves:
+                    deps[dep[:i]] = False
+            # values under the path are part of the result
+            is_ancestor = (path[:len(dep)] == dep)
+            for leaf in self._subtrees.get(dep, ()):
+                if not is_ancestor:
+                    deps[leaf] = False
+                elif (leaf != path) and (not self._reads_ancestor(leaf)):
+                    deps.setdefault(leaf, True)
+        return deps
+
+    def _reads_ancestor(self, path: Tuple[str, ...]) -> bool:
+        reads = self._reads_ancestors.get(path, None)
+        if reads is None:
+            reads = self._reads_ancestors[path] = any(path[:len(dep)] == dep for dep in get_value_dependencies(self._leaves[path]))
+        return reads
+
+    def get_resolve_order(self, paths: Optional[Iterable[Tuple[str, ...]]] = None) -> List[Tuple[str, ...]]:
+        """
+        Get the topological order in which values should be resolved,
+        raising an error if a cycle is found.
+        - if paths are given, then only the values needed to resolve
+          those paths are returned.
+        - values that have already been resolved are skipped.
+        """
+        order = []
+        # False means in progress, True means done
+        visited = {path: True for path in self._resolved}
+        for root in (self._leaves if (paths is None) else paths):
+            if root in visited:
+                continue
+            # fast path for values without dependencies
+            deps = self._get_leaf_dependencies(root)
+            if not deps:
+                visited[root] = True
+                order.append(root)
+                continue
+            # iterative dfs, reference chains can be very deep
+            # -- entries are (path, deps, if visited through a weak dependency)
+            visited[root] = False
+            stack = [(root, iter(deps.items()), False)]
+            while stack:
+                path, deps, _ = stack[-1]
+                for dep, is_weak in deps:
+                    if dep not in visited:
+                        visited[dep] = False
+                        stack.append((dep, iter(self._get_leaf_dependencies(dep).items()), is_weak))
+                        break
+                    elif visited[dep]:
+                        continue
+                    # cycles through weak dependencies are broken, the values that
+                    # were visited through the last weak dependency are instead
+                    # resolved after the value that reads the partly resolved config.
+                    cycle = [p for p, _, _ in stack]
+                    i = cycle.index(dep)
+                    weak = [j for j in range(i + 1, len(stack)) if stack[j][2]]
+                    if is_weak or weak:
+                        if not is_weak:
+                            for p, _, _ in stack[weak[-1]:]:
+                                del visited[p]
+                            del stack[weak[-1]:]
+                        break
+                    cycle = cycle[i:] + [dep]
+                    raise RuntimeError(f'cyclic reference found while resolving the config: {" -> ".join(V.keys_as_abs_pkg_path(p) for p in cycle)}')
+                else:
+                    stack.pop()
+                    visited[path] = True
+                    order.append(path)
+        return order
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Resolve                                                               #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def _resolve_leaf(self, path: Tuple[str, ...]):
+        # dependencies must already be resolved
+        value = ConfigNode.recursive_get_config_value(self._config, self._merged_options, {}, self._leaves[path])
+        # copy so that references do not share containers
+        value = _copy_containers(value)
+        recursive_setitem(self._config, path, value)
+        self._resolved.add(path)
+
+    def resolve_leaf(self, path: Tuple[str, ...]):
+        """
+        Resolve the value at the given path, as well as
+        all the values that it depends on.
+        """
+        for p in self.get_resolve_order([path]):
+            self._resolve_leaf(p)
+
+    def resolve(self) -> dict:
+        for path in self.get_resolve_order():
+            self._resolve_leaf(path)
+        return self._config
+
+
+# ========================================================================= #
+# Lazy Config                                                               #
+# ========================================================================= #
+
+
+class LazyConfig(Mapping):
+    """
+    A read-only view over a merged config, that only resolves values
+    containing config nodes when they are first accessed. Results are
+    cached and shared by all views of the same config.
+    """
+
+    def __init__(self, resolver: ConfigResolver, keys: Tuple[str, ...] = ()):
+        self._resolver = resolver
+        self._keys = tuple(keys)
+
+    def _get_dict(self) -> dict:
+        dct = self._resolver.config
+        for k in self._keys:
+            dct = dct[k]
+        return dct
+
+    def __getitem__(self, key):
+        path = self._keys + (key,)
+        if self._resolver.is_leaf(path):
+            self._resolver.resolve_leaf(path)
+        value = self._get_dict()[key]
+        if isinstance(value, dict):
+            return LazyConfig(self._resolver, path)
+        return value
+
+    def __iter__(self):
+        return iter(self._get_dict())
+
+    def __len__(self):
+        return len(self._get_dict())
+
+    def __contains__(self, key):
+        return key in self._get_dict()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(keys={repr(self._keys)}, resolved={self.num_resolved}/{self.num_leaves})'
+
+    @property
+    def num_leaves(self) -> int:
+        """
+        The total number of values containing nodes in the entire config.
+        """
+        return self._resolver.num_leaves
+
+    @property
+    def num_resolved(self) -> int:
+        """
+        The number of values that have been resolved so far.
+        """
+        return self._resolver.num_resolved
+
+    def materialize(self) -> dict:
+        """
+        Resolve all remaining values, returning a plain dictionary.
+        """
+        self._resolver.resolve()
+        return _copy_containers(self._get_dict())
+
+
+# ========================================================================= #
+# End                                                                       #
+# ========================================================================= #
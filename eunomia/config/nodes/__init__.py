@@ -5,3 +5,4 @@ performed during the merging of the config itself.
 
 from ._nodes import ConfigNode
 from ._nodes import IgnoreNode, RefNode, EvalNode, SubNode
+from ._nodes import SUB_NODES_CACHE
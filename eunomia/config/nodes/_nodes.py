@@ -1,8 +1,10 @@
+from collections import ChainMap
 from typing import Any, Union, List, Tuple
 import lark
-from eunomia.config.nodes._util_interpret import interpret_expr
-from eunomia.config.nodes._util_lark import SUB_RECONSTRUCTOR, SUB_PARSER
+from eunomia.config.nodes._util_interpret import interpret_expr, compile_expr, get_default_symtable
+from eunomia.config.nodes._util_lark import SUB_RECONSTRUCTOR, SUB_PARSER, SUB_PARSER_LOCK
 from eunomia.config import validate as V
+from eunomia.util._util_cache import LruCache
 
 
 
@@ -30,6 +32,21 @@ class ConfigNode(object):
     def get_config_value(self, merged_config: dict, merged_options: dict, current_config: dict):
         raise NotImplementedError
 
+    @property
+    def is_constant(self) -> bool:
+        """
+        If the value of the node does not depend on the config,
+        and can be resolved once instead of on every load.
+        """
+        return False
+
+    def precompile(self) -> 'ConfigNode':
+        """
+        Perform any parsing ahead of time so that it is
+        not repeated every time the value is resolved.
+        """
+        return self
+
     def __eq__(self, other):
         if not isinstance(other, self.__class__): return False
         if not isinstance(self, other.__class__): return False
@@ -74,6 +91,10 @@ class IgnoreNode(ConfigNode):
     def get_config_value(self, merged_config: dict, merged_options: dict, current_config: dict):
         return self.raw_value
 
+    @property
+    def is_constant(self) -> bool:
+        return True
+
     def __str__(self):
         return self.raw_value
 
@@ -126,16 +147,45 @@ class EvalNode(ConfigNode):
     INSTANCE_OF = str
 
     def get_config_value(self, merged_config: dict, merged_options: dict, current_config: dict):
+        # only precompiled nodes use the compiler, see precompile()
+        # -- folded expressions do not need the symbol table
+        compiled = self._compiled
+        usersyms = {
+            'this': current_config,
+            'conf': merged_config,
+            'incl': merged_options,
+        }
+        if compiled is not None:
+            # the compiled expression is called directly, it is never looked up again
+            if compiled.is_constant:
+                return compiled.value
+            return compiled(ChainMap(usersyms, get_default_symtable()))
         return interpret_expr(
             self.raw_value,
-            usersyms={
-                'this': current_config,
-                'conf': merged_config,
-                'incl': merged_options,
-            },
-            NON_STANDARD_PYTHON=True  # try getitem on AttributeError
+            usersyms=usersyms,
+            NON_STANDARD_PYTHON=True,  # try getitem on AttributeError
         )
 
+    _compiled = None
+
+    def _get_compiled(self):
+        if self._compiled is not None:
+            return self._compiled
+        try:
+            return compile_expr(self.raw_value, NON_STANDARD_PYTHON=True)
+        except SyntaxError:
+            return None
+
+    def precompile(self) -> 'EvalNode':
+        # syntax errors are deferred until the value is resolved
+        self._compiled = self._get_compiled()
+        return self
+
+    @property
+    def is_constant(self) -> bool:
+        compiled = self._get_compiled()
+        return (compiled is not None) and compiled.is_constant
+
     def __str__(self):
         return f'${{={self.raw_value}}}'
 
@@ -155,14 +205,19 @@ class SubNode(ConfigNode):
             if not isinstance(subnode, self.ALLOWED_SUB_NODES):
                 raise TypeError(f'Malformed {SubNode.__name__}, subnode={repr(subnode)} must be instance of: {self.ALLOWED_SUB_NODES}')
 
+    _nodes = None
+
     def get_config_value(self, merged_config: dict, merged_options: dict, current_config: dict) -> str:
-        nodes = self.raw_value
+        nodes = self.raw_value if (self._nodes is None) else self._nodes
 
         # 1. convert string to nodes if necessary using lark
         # detects f-strings f"..." or f'...' and strings
         # with placeholders ${...} and ${=...} defined in
         # the lark grammar
         if isinstance(nodes, str):
+            # plain strings are returned directly without parsing
+            if _is_literal_string(nodes):
+                return nodes
             nodes = _string_to_sub_nodes(nodes)
         self._check_subnodes(nodes)
 
@@ -181,6 +236,40 @@ class SubNode(ConfigNode):
             return values[0]
         return ''.join(str(v) for v in values)
 
+    def get_sub_nodes(self) -> Tuple[Union[str, ConfigNode], ...]:
+        """
+        Get the strings and nodes that make up this node,
+        parsing the string value if necessary.
+        """
+        nodes = self.raw_value if (self._nodes is None) else self._nodes
+        if isinstance(nodes, str):
+            nodes = _string_to_sub_nodes(nodes)
+        return tuple(nodes)
+
+    @property
+    def is_constant(self) -> bool:
+        try:
+            nodes = self.get_sub_nodes()
+        except Exception:
+            return False
+        return all(isinstance(n, str) or (isinstance(n, ConfigNode) and n.is_constant) for n in nodes)
+
+    def precompile(self) -> 'SubNode':
+        # parse errors are deferred until the value is resolved
+        nodes = self.raw_value
+        if isinstance(nodes, str):
+            if _is_literal_string(nodes):
+                return self
+            try:
+                nodes = _string_to_sub_nodes(nodes)
+            except Exception:
+                return self
+        for node in nodes:
+            if isinstance(node, ConfigNode):
+                node.precompile()
+        self._nodes = tuple(nodes)
+        return self
+
     def __str__(self):
         if isinstance(self.raw_value, str):
             return self.raw_value
@@ -188,10 +277,36 @@ class SubNode(ConfigNode):
             return ''.join(map(str, self.raw_value))
 
 
-def _string_to_sub_nodes(string):
-    nodes = SUB_PARSER.parse(string)
-    converted = _InterpretLarkToConfNodesList().visit(nodes)
-    return converted
+# process-wide cache of parsed substitution strings, the same strings
+# are often resolved many times across loads and sweeps.
+# - resize or disable with: SUB_NODES_CACHE.resize(maxsize)
+# - get hit/miss/eviction counters with: SUB_NODES_CACHE.info()
+SUB_NODES_CACHE = LruCache(maxsize=4096)
+
+
+def _is_literal_string(string: str) -> bool:
+    """
+    Check if a string can never contain a substitution, so that it
+    does not need to be parsed by lark. A string is a literal if
+    it does not contain a template ${...} and is not an f-string.
+    - newlines are not supported by the grammar, these strings
+      are still passed to the parser so that errors are raised.
+    """
+    return ('${' not in string) and ('\n' not in string) and not string.startswith(('f"', "f'"))
+
+
+def _string_to_sub_nodes(string) -> Tuple[Union[str, ConfigNode], ...]:
+    if _is_literal_string(string):
+        return (string,) if string else ()
+    return SUB_NODES_CACHE.get_or_make(string, _parse_string_to_sub_nodes)
+
+
+def _parse_string_to_sub_nodes(string) -> Tuple[Union[str, ConfigNode], ...]:
+    with SUB_PARSER_LOCK:
+        nodes = SUB_PARSER.parse(string)
+        converted = _InterpretLarkToConfNodesList().visit(nodes)
+    # tuples are used so that cached values cannot be modified
+    return tuple(converted)
 
 
 class _InterpretLarkToConfNodesList(lark.visitors.Interpreter):
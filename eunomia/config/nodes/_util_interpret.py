@@ -1,8 +1,13 @@
 import ast
+import operator
 import sys
-from typing import Optional, Dict, Any
+import threading
+from collections import ChainMap
+from typing import Optional, Dict, Any, Mapping
 from asteval.astutils import UNSAFE_ATTRS, make_symbol_table, safe_mult, safe_add, safe_pow, safe_lshift
 
+from eunomia.util._util_cache import LruCache
+
 
 # ========================================================================= #
 # Errors                                                                    #
@@ -26,6 +31,55 @@ class DisabledLanguageFeatureError(UnsupportedLanguageFeatureError):
     If the python language feature has been disabled
     """
 
+# ========================================================================= #
+# Parsing & Symbols                                                         #
+# ========================================================================= #
+
+
+# process-wide cache of parsed expressions, the same expressions
+# are usually evaluated many times across loads and sweeps.
+# - resize or disable with: EXPR_AST_CACHE.resize(maxsize)
+EXPR_AST_CACHE = LruCache(maxsize=4096)
+
+
+def _parse_expr(string: str) -> ast.Expression:
+    # just future proof things in case... only supported for 3.8 and above
+    if sys.version_info[:2] >= (3, 8):
+        return ast.parse(string, mode='eval', feature_version=(3, 7))
+    else:
+        return ast.parse(string, mode='eval')
+
+
+def parse_expr(string: str, strip_whitespace=True) -> ast.Expression:
+    """
+    Parse an expression into an ast, returning a cached result
+    if available. The returned ast should not be modified!
+    """
+    if strip_whitespace:
+        # string.whitespace == ' \t\n\r\v\f'
+        # we dont want to strip special characters
+        string = string.strip(' \t')
+    return EXPR_AST_CACHE.get_or_make(string, _parse_expr)
+
+
+_DEFAULT_SYMTABLE = None
+_DEFAULT_SYMTABLE_LOCK = threading.Lock()
+
+
+def get_default_symtable() -> Mapping[str, Any]:
+    """
+    The default symbol table is only created once and shared, it
+    should never be modified, instead overlay new symbols using:
+    ChainMap(new_symbols, get_default_symtable())
+    """
+    global _DEFAULT_SYMTABLE
+    if _DEFAULT_SYMTABLE is None:
+        with _DEFAULT_SYMTABLE_LOCK:
+            if _DEFAULT_SYMTABLE is None:
+                _DEFAULT_SYMTABLE = make_symbol_table(use_numpy=False)
+    return _DEFAULT_SYMTABLE
+
+
 # ========================================================================= #
 # Interpreter                                                               #
 # ========================================================================= #
@@ -63,15 +117,7 @@ class BaseInterpreter(object):
           a Python expression.
         """
         if isinstance(node_or_string, str):
-            if strip_whitespace:
-                # string.whitespace == ' \t\n\r\v\f'
-                # we dont want to strip special characters
-                node_or_string = node_or_string.strip(' \t')
-            # just future proof things in case... only supported for 3.8 and above
-            if sys.version_info[:2] >= (3, 8):
-                node_or_string = ast.parse(node_or_string, mode='eval', feature_version=(3, 7))
-            else:
-                node_or_string = ast.parse(node_or_string, mode='eval')
+            node_or_string = parse_expr(node_or_string, strip_whitespace=strip_whitespace)
         if isinstance(node_or_string, ast.Expression):
             node_or_string = node_or_string.body
         return self._visit(node_or_string)
@@ -287,8 +333,9 @@ class Interpreter(BasicInterpreter):
             allow_chained_comparisons=allow_chained_comparisons,
         )
         self._allow_unpacking = allow_unpacking
-        # make default symtable
-        self._symtable = make_symbol_table(use_numpy=False) if (default_symtable is None) else default_symtable
+        # make default symtable, the shared default symbols are overlaid
+        # with a new layer instead of being copied for every interpreter
+        self._symtable = ChainMap({}, get_default_symtable()) if (default_symtable is None) else default_symtable
         # add extras to symtable
         self._symtable.update({} if (extra_symtable is None) else extra_symtable)
         # THIS IS NON STANDARD PYTHON
@@ -463,18 +510,651 @@ class Interpreter(BasicInterpreter):
     #     # [i for i in [1, 2, 3] if i for j in [3, 4, 5] if j if j]
 
 
+# ========================================================================= #
+# Compiler                                                                  #
+# - compiles the same subset of python as the interpreters above into     #
+#   nested closures, so that repeated evaluation skips visitor dispatch.  #
+# - all errors are deferred until evaluation, matching the interpreters   #
+#   which only raise errors for nodes that are actually visited.          #
+# - side-effect free sub-expressions of constants are folded at compile   #
+#   time if they produce immutable values, eg. '=' * 100                  #
+# ========================================================================= #
+
+
+def _make_raiser(error_cls, message):
+    # accepts any arguments so that it can replace both compiled nodes
+    # called with a symtable, and operators called with their values
+    def raiser(*args, **kwargs):
+        raise error_cls(message)
+    return raiser
+
+
+class _Constant(object):
+    """
+    A compiled node that does not depend on the symbol table.
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, symtable):
+        return self.value
+
+
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, range)
+
+
+def _is_immutable(value) -> bool:
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_immutable(v) for v in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
+
+
+class CompiledExpr(object):
+    """
+    A compiled expression that can be evaluated many times
+    by calling it with a symbol table.
+    """
+
+    def __init__(self, func, source=None):
+        self._func = func
+        self.source = source
+
+    def __call__(self, symtable: Mapping[str, Any]):
+        return self._func(symtable)
+
+    @property
+    def is_constant(self) -> bool:
+        """
+        If the entire expression was folded into a constant
+        that does not depend on the symbol table.
+        """
+        return isinstance(self._func, _Constant)
+
+    @property
+    def value(self):
+        if not self.is_constant:
+            raise ValueError(f'compiled expression is not constant: {repr(self.source)}')
+        return self._func.value
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({repr(self.source)}{", constant" if self.is_constant else ""})'
+
+
+class BaseCompiler(object):
+
+    def copy(self) -> 'BaseCompiler':
+        return BaseCompiler()
+
+    def _get_compile_name(self, node):
+        return 'compile_' + node.__class__.__name__
+
+    def _compile(self, node):
+        attr = self._get_compile_name(node)
+        compiler = getattr(self, attr, self._compile_unknown)
+        if compiler is None:
+            compiler = self._compile_disabled
+        return compiler(node)
+
+    def _compile_disabled(self, node):
+        attr = self._get_compile_name(node)
+        return _make_raiser(DisabledLanguageFeatureError, f'Language feature has been disabled: node={repr(node)}\n method: attr={repr(attr)} is None')
+
+    def _compile_unknown(self, node):
+        attr = self._get_compile_name(node)
+        return _make_raiser(UnsupportedLanguageFeatureError, f'Language feature not supported: node={repr(node)}\nCould not find method: attr={repr(attr)}')
+
+    def _get_symtable(self) -> Mapping[str, Any]:
+        return {}
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Constant Folding                                                      #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def _allow_fold(self) -> bool:
+        return False
+
+    def _fold(self, func, *children):
+        """
+        Evaluate a compiled node at compile time if all of its children are
+        constant. The result is only kept if it is immutable, otherwise each
+        evaluation needs to produce a new value. If folding raises an error
+        the node is left as is, so that the error is deferred until evaluation.
+        """
+        if not self._allow_fold():
+            return func
+        if not all(isinstance(c, _Constant) for c in children):
+            return func
+        try:
+            value = func(None)
+        except Exception:
+            return func
+        if not _is_immutable(value):
+            return func
+        return _Constant(value)
+
+    def compile(self, node_or_string, strip_whitespace=True) -> CompiledExpr:
+        """
+        Compile an expression node or a string containing
+        a Python expression into a callable that can be
+        evaluated many times with different symbol tables.
+        """
+        source = node_or_string if isinstance(node_or_string, str) else None
+        if isinstance(node_or_string, str):
+            node_or_string = parse_expr(node_or_string, strip_whitespace=strip_whitespace)
+        if isinstance(node_or_string, ast.Expression):
+            node_or_string = node_or_string.body
+        return CompiledExpr(self._compile(node_or_string), source=source)
+
+    def interpret(self, node_or_string, strip_whitespace=True):
+        """
+        Compile and then evaluate an expression with the symbol
+        table of the compiler, equivalent to the interpreters.
+        """
+        return self.compile(node_or_string, strip_whitespace=strip_whitespace)(self._get_symtable())
+
+
+class BasicCompiler(BaseCompiler):
+    """
+    Compiles the same expressions and literals supported
+    by the BasicInterpreter, obeying the same rules.
+    """
+
+    def __init__(
+            self,
+            # rules
+            allow_nested_unary=False,
+            allow_numerical_unary_on_bool=False,
+            allow_chained_comparisons=True,
+            # optimisations
+            fold_constants=True,
+    ):
+        self._allow_nested_unary = allow_nested_unary
+        self._allow_numerical_unary_on_bool = allow_numerical_unary_on_bool
+        self._allow_chained_comparisons = allow_chained_comparisons
+        self._fold_constants = fold_constants
+
+    def copy(self) -> 'BasicCompiler':
+        return BasicCompiler(
+            allow_nested_unary=self._allow_nested_unary,
+            allow_numerical_unary_on_bool=self._allow_numerical_unary_on_bool,
+            allow_chained_comparisons=self._allow_chained_comparisons,
+            fold_constants=self._fold_constants,
+        )
+
+    def _allow_fold(self) -> bool:
+        return self._fold_constants
+
+    def _compile_const(self, value):
+        return _Constant(value)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Python 3.6 Support - Custom handling is required...                   #
+    # these nodes do not exist in python 3.9, not sure about 3.8? 3.7?      #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    # TODO: deprecated! old python language feature!
+    def compile_Str(self, node): return self._compile_const(node.s)
+    # TODO: deprecated! old python language feature!
+    def compile_Num(self, node): return self._compile_const(node.n)
+    # TODO: deprecated! old python language feature!
+    def compile_NameConstant(self, node): return self._compile_const(node.value)
+    # TODO: deprecated! old python language feature!
+    def compile_Bytes(self, node): return self._compile_const(node.s)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Atoms ::= identifier | literal | enclosure                            #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def compile_Constant(self, node): return self._compile_const(node.value)
+
+    def compile_List(self, node):
+        elts = [self._compile(n) for n in node.elts]
+        return lambda syms: [e(syms) for e in elts]
+
+    def compile_Tuple(self, node):
+        elts = [self._compile(n) for n in node.elts]
+        return self._fold(lambda syms: tuple([e(syms) for e in elts]), *elts)
+
+    def compile_Set(self, node):
+        elts = [self._compile(n) for n in node.elts]
+        return lambda syms: set([e(syms) for e in elts])
+
+    def compile_Dict(self, node):
+        if len(node.keys) != len(node.values):
+            return _make_raiser(ValueError, 'Dict node is malformed, differing number of keys and values!')
+        items = [(self._compile(k), self._compile(v)) for k, v in zip(node.keys, node.values)]
+        return lambda syms: dict([(k(syms), v(syms)) for k, v in items])
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Boolean Operations                                                    #
+    # docs.python.org/3/library/stdtypes.html#boolean-operations-and-or-not #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def compile_BoolOp(self, node):
+        attr = self._get_compile_name(node.op)
+        compiler = getattr(self, attr, self._compile_unknown)
+        if compiler is None:
+            return self._compile_disabled(node.op)
+        if compiler == self._compile_unknown:
+            return compiler(node.op)
+        return compiler(node.values)
+
+    # like the interpreter, these always return booleans
+    def compile_Or(self, values):
+        values = [self._compile(v) for v in values]
+        def or_(syms):
+            for value in values:
+                if value(syms):
+                    return True
+            return False
+        return self._fold(or_, *values)
+
+    def compile_And(self, values):
+        values = [self._compile(v) for v in values]
+        def and_(syms):
+            for value in values:
+                if not value(syms):
+                    return False
+            return True
+        return self._fold(and_, *values)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Comparisons                                                           #
+    # docs.python.org/3/library/stdtypes.html#comparisons                   #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def compile_Compare(self, node):
+        assert len(node.ops) == len(node.comparators)
+        if (not self._allow_chained_comparisons) and (len(node.ops) > 1):
+            return _make_raiser(DisabledLanguageFeatureError, f'Chained operators are not allowed, eg. (a <op> b <op> 3)\nConvert to ((a <op> b) and (b <op> c))')
+        left = self._compile(node.left)
+        # fast path for the most common case
+        if len(node.ops) == 1:
+            op, right = self._compile(node.ops[0]), self._compile(node.comparators[0])
+            # like the interpreter, results are only converted to booleans if
+            # comparisons can be chained, eg. for objects with a custom __eq__
+            if self._allow_chained_comparisons:
+                return self._fold(lambda syms: bool(op(left(syms), right(syms))), left, right)
+            return self._fold(lambda syms: op(left(syms), right(syms)), left, right)
+        # chained comparisons, each value is only evaluated once
+        ops = [(self._compile(op), self._compile(comp)) for op, comp in zip(node.ops, node.comparators)]
+        def compare(syms):
+            vis_left = left(syms)
+            for op, right in ops:
+                vis_right = right(syms)
+                if not op(vis_left, vis_right):
+                    return False
+                vis_left = vis_right
+            return True
+        return self._fold(compare, left, *(right for _, right in ops))
+
+    def compile_Lt   (self, op): return operator.lt
+    def compile_LtE  (self, op): return operator.le
+    def compile_Gt   (self, op): return operator.gt
+    def compile_GtE  (self, op): return operator.ge
+    def compile_Eq   (self, op): return operator.eq
+    def compile_NotEq(self, op): return operator.ne
+    def compile_Is   (self, op): return operator.is_
+    def compile_IsNot(self, op): return operator.is_not
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Operators                                                             #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def compile_BinOp(self, node):
+        op, left, right = self._compile(node.op), self._compile(node.left), self._compile(node.right)
+        return self._fold(lambda syms: op(left(syms), right(syms)), left, right)
+
+    def compile_Add     (self, op): return safe_add
+    def compile_Sub     (self, op): return operator.sub
+    def compile_Mult    (self, op): return safe_mult
+    def compile_MatMult (self, op): return operator.matmul
+    def compile_Div     (self, op): return operator.truediv
+    def compile_FloorDiv(self, op): return operator.floordiv
+    def compile_Mod     (self, op): return operator.mod
+    def compile_Pow     (self, op): return safe_pow
+
+    def compile_BitAnd  (self, op): return operator.and_
+    def compile_BitOr   (self, op): return operator.or_
+    def compile_BitXor  (self, op): return operator.xor
+
+    def compile_LShift  (self, op): return safe_lshift
+    def compile_RShift  (self, op): return operator.rshift
+
+    def compile_In   (self, op): return lambda vis_left, vis_right: vis_left in vis_right
+    def compile_NotIn(self, op): return lambda vis_left, vis_right: vis_left not in vis_right
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Unary Operators                                                       #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def compile_UnaryOp(self, node):
+        if not self._allow_nested_unary:
+            if isinstance(node.operand, ast.UnaryOp):
+                return _make_raiser(DisabledLanguageFeatureError, f'Nested unary operators are not allowed, eg. ++1 or --1')
+        if not self._allow_numerical_unary_on_bool:
+            if not isinstance(node.op, ast.Not):
+                # TODO: deprecated language feature ast.NameConstant, not used in python 3.9
+                if isinstance(node.operand, (ast.Constant, ast.NameConstant)) and isinstance(node.operand.value, bool):
+                    return _make_raiser(DisabledLanguageFeatureError, f'Only the not unary operator is allowed on booleans, eg. not True')
+        op, operand = self._compile(node.op), self._compile(node.operand)
+        return self._fold(lambda syms: op(operand(syms)), operand)
+
+    def compile_UAdd  (self, op): return operator.pos
+    def compile_USub  (self, op): return operator.neg
+    def compile_Invert(self, op): return operator.invert
+    def compile_Not   (self, op): return operator.not_
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # F Strings                                                             #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def compile_JoinedStr(self, node):
+        values = [self._compile(v) for v in node.values]
+        return self._fold(lambda syms: ''.join([str(v(syms)) for v in values]), *values)
+
+    def compile_FormattedValue(self, node):
+        value = self._compile(node.value)
+        if node.format_spec is None:
+            return self._fold(lambda syms: f'{value(syms)}', value)
+        format_spec = self._compile(node.format_spec)
+        return self._fold(lambda syms: f'{value(syms):{format_spec(syms)}}', value, format_spec)
+
+
+class Compiler(BasicCompiler):
+    """
+    Compiles the same expressions supported by the Interpreter,
+    obeying the same rules, including properties, getters and names.
+    Names are looked up in the symbol table passed to the compiled
+    expression when it is evaluated.
+    """
+
+    def __init__(
+            self,
+            # symtable
+            default_symtable: Optional[Dict[str, Any]] = None,
+            extra_symtable: Optional[Dict[str, Any]] = None,
+            # rules
+            allow_nested_unary=False,
+            allow_numerical_unary_on_bool=False,
+            allow_chained_comparisons=True,
+            allow_unpacking=False,
+            # optimisations
+            fold_constants=True,
+            # NON-STANDARD-PYTHON
+            NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail=False,
+    ):
+        super().__init__(
+            allow_nested_unary=allow_nested_unary,
+            allow_numerical_unary_on_bool=allow_numerical_unary_on_bool,
+            allow_chained_comparisons=allow_chained_comparisons,
+            fold_constants=fold_constants,
+        )
+        self._allow_unpacking = allow_unpacking
+        # symtable used by interpret(...), compiled expressions
+        # are instead evaluated with the symtable they are given
+        self._symtable = ChainMap({}, get_default_symtable()) if (default_symtable is None) else default_symtable
+        self._symtable.update({} if (extra_symtable is None) else extra_symtable)
+        # THIS IS NON STANDARD PYTHON
+        self._NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail = NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail
+
+    def copy(self) -> 'Compiler':
+        return Compiler(
+            default_symtable=dict(self._symtable),
+            # rules
+            allow_nested_unary=self._allow_nested_unary,
+            allow_numerical_unary_on_bool=self._allow_numerical_unary_on_bool,
+            allow_chained_comparisons=self._allow_chained_comparisons,
+            allow_unpacking=self._allow_unpacking,
+            fold_constants=self._fold_constants,
+            NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail=self._NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail,
+        )
+
+    def _get_symtable(self) -> Mapping[str, Any]:
+        return self._symtable
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Properties                                                            #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def compile_Name(self, node):
+        name = node.id
+        def lookup(syms):
+            try:
+                return syms[name]
+            except KeyError:
+                pass
+            raise NameError(f"name {repr(name)} is not defined")
+        return lookup
+
+    def compile_Attribute(self, node):
+        attr = node.attr
+        if attr in UNSAFE_ATTRS:
+            return _make_raiser(KeyError, f'Tried to access unsafe attribute: {attr}')
+        value = self._compile(node.value)
+        allow_getitem = self._NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail
+        def getattr_(syms):
+            visited = value(syms)
+            try:
+                return getattr(visited, attr)
+            except AttributeError as e:
+                if allow_getitem:
+                    if hasattr(visited, '__getitem__'):
+                        try:
+                            return visited[attr]
+                        except KeyError:
+                            pass
+                raise e
+        return getattr_
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # List, Tuple, Set, Dict Unpacking                                      #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def _compile_unpack_elts(self, elts):
+        # returns a function that yields all the values
+        compiled = []
+        for n in elts:
+            if isinstance(n, ast.Starred):
+                if not self._allow_unpacking:
+                    compiled.append((False, _make_raiser(DisabledLanguageFeatureError, 'Starred unpacking is disabled.')))
+                else:
+                    compiled.append((True, self._compile(n.value)))
+            else:
+                compiled.append((False, self._compile(n)))
+        # fast path if there is no unpacking
+        if not any(starred for starred, _ in compiled):
+            compiled = [c for _, c in compiled]
+            return lambda syms: [c(syms) for c in compiled]
+        # unpack
+        def unpack(syms):
+            values = []
+            for starred, c in compiled:
+                if starred:
+                    values.extend(c(syms))
+                else:
+                    values.append(c(syms))
+            return values
+        return unpack
+
+    def _compile_unpack_dict_pairs(self, keys, values, is_keywords=False):
+        # returns a function that returns all the key value pairs
+        if not is_keywords:
+            if len(keys) != len(values):
+                return _make_raiser(ValueError, 'Dict node is malformed, differing number of keys and values!')
+        compiled = []
+        for k, v in zip(keys, values):
+            if k is None:
+                if not self._allow_unpacking:
+                    compiled.append((None, _make_raiser(DisabledLanguageFeatureError, 'Starred unpacking is disabled.')))
+                else:
+                    compiled.append((None, self._compile(v)))
+            else:
+                compiled.append((k if is_keywords else self._compile(k), self._compile(v)))
+        # unpack
+        def unpack(syms):
+            pairs = []
+            for k, v in compiled:
+                if k is None:
+                    # get dictionary value
+                    unpack_dict = v(syms)
+                    # check that we are not malformed
+                    if not isinstance(unpack_dict, dict):
+                        raise ValueError('Tried to unpack non dict.')
+                    pairs.extend(unpack_dict.items())
+                elif is_keywords:
+                    pairs.append((k, v(syms)))
+                else:
+                    pairs.append((k(syms), v(syms)))
+            return pairs
+        return unpack
+
+    def compile_List(self, node):
+        elts = self._compile_unpack_elts(node.elts)
+        return elts
+
+    def compile_Tuple(self, node):
+        # tuples without unpacking can be folded
+        if not any(isinstance(n, ast.Starred) for n in node.elts):
+            return super().compile_Tuple(node)
+        elts = self._compile_unpack_elts(node.elts)
+        return lambda syms: tuple(elts(syms))
+
+    def compile_Set(self, node):
+        elts = self._compile_unpack_elts(node.elts)
+        return lambda syms: set(elts(syms))
+
+    def compile_Dict(self, node):
+        pairs = self._compile_unpack_dict_pairs(node.keys, node.values, is_keywords=False)
+        return lambda syms: dict(pairs(syms))
+
+    def compile_Starred(self, node):
+        return _make_raiser(RuntimeError, 'This should never happen.')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Call                                                                  #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def _compile_kwargs(self, keywords: list):
+        # unpack everything like a dictionary
+        pairs = self._compile_unpack_dict_pairs(
+            keys=[kw.arg for kw in keywords],
+            values=[kw.value for kw in keywords],
+            is_keywords=True,
+        )
+        # check that kwargs are unique
+        def build_kwargs(syms):
+            kwargs = {}
+            for k, v in pairs(syms):
+                if k in kwargs:
+                    raise TypeError(f"got multiple values for keyword argument {repr(k)}")
+                kwargs[k] = v
+            return kwargs
+        return build_kwargs
+
+    def compile_Call(self, node):
+        func = self._compile(node.func)
+        args = self._compile_unpack_elts(node.args) if node.args else None
+        kwargs = self._compile_kwargs(node.keywords) if node.keywords else None
+        # like the interpreter, kwargs are evaluated before args
+        def call(syms):
+            f = func(syms)
+            kw = kwargs(syms) if kwargs else {}
+            return f(*(args(syms) if args else ()), **kw)
+        return call
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Get Item                                                              #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def compile_Subscript(self, node):
+        # like the interpreter, the slice is evaluated before the value
+        slice, value = self._compile(node.slice), self._compile(node.value)
+        def getitem(syms):
+            s = slice(syms)
+            return value(syms)[s]
+        return self._fold(getitem, slice, value)
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Python 3.6 Support - Custom handling is required...                   #
+    # these nodes do not exist in python 3.9, not sure about 3.8? 3.7?      #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    # TODO: deprecated! old python language feature!
+    def compile_Index(self, node):
+        return self._compile(node.value)
+
+
+# ========================================================================= #
+# Interpret Expressions                                                     #
+# ========================================================================= #
+
+
+# process-wide cache of compiled expressions
+# - resize or disable with: EXPR_COMPILED_CACHE.resize(maxsize)
+EXPR_COMPILED_CACHE = LruCache(maxsize=4096)
+
+
+_COMPILERS = {}
+
+
+def compile_expr(string: str, NON_STANDARD_PYTHON=False) -> CompiledExpr:
+    """
+    Compile the given expression with the same preset limitations
+    as interpret_expr, returning a cached result if available.
+    """
+    assert isinstance(string, str)
+    key = (string, bool(NON_STANDARD_PYTHON))
+    compiled = EXPR_COMPILED_CACHE.get(key)
+    if compiled is None:
+        compiler = _COMPILERS.get(key[1])
+        if compiler is None:
+            # compilers are stateless, so it does not matter if
+            # another thread is concurrently adding a compiler
+            compiler = _COMPILERS.setdefault(key[1], Compiler(NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail=key[1]))
+        compiled = compiler.compile(string)
+        EXPR_COMPILED_CACHE.put(key, compiled)
+    return compiled
+
+
+def is_constant_expr(string: str, NON_STANDARD_PYTHON=False) -> bool:
+    """
+    Check if the given expression does not depend on any symbols
+    and can be folded into a constant, eg. '=' * 100
+    """
+    try:
+        return compile_expr(string, NON_STANDARD_PYTHON=NON_STANDARD_PYTHON).is_constant
+    except SyntaxError:
+        return False
+
+
 def interpret_expr(
         string: str,
         usersyms: Optional[Dict[str, Any]] = None,
         NON_STANDARD_PYTHON = False,
+        compiled = False,
 ):
     """
     Interpret the given expression with preset
     limitations on what is allowed.
+    - if compiled=True the expression is compiled once and cached
+      instead of walking the ast with the Interpreter every time.
+      This is opt-in, the Interpreter is the reference engine.
     """
+    if compiled:
+        symtable = get_default_symtable() if (usersyms is None) else ChainMap(usersyms, get_default_symtable())
+        return compile_expr(string, NON_STANDARD_PYTHON=NON_STANDARD_PYTHON)(symtable)
     interpreter = Interpreter(
         extra_symtable=usersyms,
         NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail=NON_STANDARD_PYTHON
     )
     assert isinstance(string, str)
     return interpreter.interpret(string)
+
+
+# ========================================================================= #
+# End                                                                       #
+# ========================================================================= #
@@ -1,3 +1,5 @@
+import threading
+
 from lark.reconstruct import Reconstructor
 
 
@@ -23,6 +25,10 @@ GRAMMAR_FILE = 'grammar_substitute.lark'
 SUB_PARSER = _get_lark_substitute_parser()
 SUB_RECONSTRUCTOR = Reconstructor(SUB_PARSER)
 
+# lark parsers and reconstructors are not guaranteed to be
+# thread-safe, hold this lock when using them.
+SUB_PARSER_LOCK = threading.Lock()
+
 
 # ========================================================================= #
 # End                                                                       #
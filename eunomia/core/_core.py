@@ -1,9 +1,10 @@
-from typing import List
+import inspect
+from typing import List, Union
 
-from eunomia.config import ConfigLoader
+from eunomia.config import ConfigLoader, LazyConfig
 from eunomia.backend import Backend, BackendObj, BackendYaml, BackendDict
 from eunomia.backend import ValidConfigTypes, infer_backend_load_group as _infer_backend_load_group
-from eunomia.core.runner import RunnerLocal
+from eunomia.core.runner import RunnerLocal, RunnerAsync
 from eunomia.core.runner._runner import BaseRunner
 
 
@@ -34,12 +35,13 @@ def eunomia(
     """
     The main eunomia decorator.
     Automatically detects which backend to use based on the first argument.
+    - coroutine functions are run on an event loop by default, see RunnerAsync
     """
     def wrapper(func):
         from functools import wraps
         @wraps(func)
         def wrapper():
-            eunomia_runner(func=func, config=config, entrypoint=entrypoint, overrides=overrides, backend=backend, runner=runner)
+            return eunomia_runner(func=func, config=config, entrypoint=entrypoint, overrides=overrides, backend=backend, runner=runner)
         return wrapper
     return wrapper
 
@@ -56,11 +58,12 @@ def eunomia_runner(
     The non-decorator equivalent to @eunomia(...)
     - This function is the core of eunomia, calling the relevant plugins, creating
       the merged config and finally calling your entry.
+    - coroutine functions are run on an event loop by default, see RunnerAsync
     """
     if runner is None:
-        runner = RunnerLocal()
+        runner = RunnerAsync() if inspect.iscoroutinefunction(func) else RunnerLocal()
     # run this!
-    runner.run(func, config, entrypoint, overrides, backend)
+    return runner.run(func, config, entrypoint, overrides, backend)
 
 
 # ========================================================================= #
@@ -73,11 +76,12 @@ def eunomia_load(
         entrypoint=DEFAULT_ENTRYPOINT,
         overrides: List = None,
         backend: Backend = None,
-) -> dict:
+        lazy: bool = False,
+) -> Union[dict, LazyConfig]:
     # this should not allow matrix...
     group = _infer_backend_load_group(config, backend=backend)
     loader = ConfigLoader(group, overrides=overrides)
-    return loader.load_config(entrypoint)
+    return loader.load_config(entrypoint, lazy=lazy)
 
 
 # ========================================================================= #
@@ -1,4 +1,5 @@
-
-from ._runner import BaseRunner
+from ._runner import BaseRunner, SweepSummary
 from ._runner_local import RunnerLocal
-
+from ._runner_pool import RunnerProcessPool
+from ._runner_thread import RunnerThreadPool
+from ._runner_async import RunnerAsync
@@ -1,8 +1,123 @@
+import hashlib
+import itertools
+import json
+import os
+import threading
 import warnings
-from typing import List
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
 
-from eunomia.backend import Backend, ValidConfigTypes
-from eunomia.core.sweep import _yield_list_sweep, _num_list_sweep_iterations
+from eunomia.backend import Backend, ValidConfigTypes, infer_backend_load_group
+from eunomia.config import ConfigLoader, Group, Option
+from eunomia.util._util_fingerprint import fingerprint
+from eunomia.core.sweep import _JointSweepList, _ListSweep, _get_num_values, _yield_list_sweep, _num_list_sweep_iterations, _get_list_sweep_axis_order
+
+
+# ========================================================================= #
+# Helper                                                                    #
+# ========================================================================= #
+
+
+@contextmanager
+def _frozen(group: Optional[Group]):
+    """
+    Freeze a config tree so that it cannot be modified while
+    being shared between sweeps, restoring the original state
+    in case we were given a group object by the user.
+    """
+    if group is None:
+        yield
+        return
+    was_frozen = group.is_frozen
+    group.freeze()
+    try:
+        yield
+    finally:
+        if not was_frozen:
+            group.unfreeze()
+
+
+def _to_override_paths(overrides):
+    """
+    Replace the groups and options in overrides, eg. from options(...),
+    with their absolute paths. These can then be hashed or sent to other
+    processes that have loaded their own copy of the config tree.
+    """
+    if isinstance(overrides, (Group, Option)):
+        return overrides.abs_path
+    elif isinstance(overrides, dict):
+        return {_to_override_paths(k): _to_override_paths(v) for k, v in overrides.items()}
+    elif isinstance(overrides, (list, tuple)):
+        return [_to_override_paths(v) for v in overrides]
+    return overrides
+
+
+def _get_sweep_key(overrides: list) -> str:
+    """
+    Get a stable hash of the overrides for a sweep, that is
+    consistent across processes and python hash seeds.
+    - groups and options are keyed by their paths, not their
+      contents, which may be the same or may not yet be loaded.
+    """
+    string = json.dumps(_to_override_paths(overrides), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(string.encode('utf8')).hexdigest()
+
+
+def _read_journal(path: str) -> set:
+    keys, line = set(), '\n'
+    if not os.path.exists(path):
+        return keys
+    with open(path, 'r') as f:
+        for line in f:
+            # the last line may be incomplete if we crashed while writing
+            try:
+                keys.add(json.loads(line)['key'])
+            except (ValueError, KeyError, TypeError):
+                pass
+    # terminate any incomplete line so that new entries are not corrupted
+    if not line.endswith('\n'):
+        with open(path, 'a') as f:
+            f.write('\n')
+    return keys
+
+
+# ========================================================================= #
+# Summary                                                                   #
+# ========================================================================= #
+
+
+class SweepSummary(object):
+    """
+    Counts of the sweeps handled by the last call to BaseRunner.run
+    """
+
+    def __init__(self, num_total: int = 0, num_in_shard: int = 0):
+        self.num_total = num_total
+        self.num_in_shard = num_in_shard
+        self.num_skipped_completed = 0
+        self.num_skipped_duplicate = 0
+        self.num_finished = 0
+
+    @property
+    def num_skipped(self) -> int:
+        return self.num_skipped_completed + self.num_skipped_duplicate
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({", ".join(f"{k}={v}" for k, v in self.__dict__.items())})'
+
+    def __str__(self):
+        string = f'finished {self.num_finished} of {self.num_in_shard} sweeps'
+        if self.num_in_shard != self.num_total:
+            string += f' in the shard, out of {self.num_total} total'
+        if self.num_skipped_completed:
+            string += f', skipped {self.num_skipped_completed} completed'
+        if self.num_skipped_duplicate:
+            string += f', skipped {self.num_skipped_duplicate} duplicate'
+        return string
+
+
+# returned instead of a result if a sweep was skipped
+_SKIPPED = object()
 
 
 # ========================================================================= #
@@ -14,30 +129,232 @@ class BaseRunner(object):
 
     WARN_SWEEPS = 128
 
-    def __init__(self, no_output=True):
+    # environment variables used to set the shard if not given,
+    # the same sweep can then be launched on multiple machines
+    ENV_SHARD_INDEX = 'EUNOMIA_SHARD_INDEX'
+    ENV_SHARD_COUNT = 'EUNOMIA_SHARD_COUNT'
+
+    def __init__(self, no_output=True, load_once=False, reorder_sweeps=False, shard: Optional[Tuple[int, int]] = None, journal: Optional[str] = None, dedupe=False):
         self._no_output = no_output
+        # if enabled, the config tree is only loaded once by the backend
+        # and then frozen and shared between the loaders of all sweeps
+        self._load_once = load_once
+        # if enabled, the sweep axes are reordered so that the groups that
+        # are merged last are swept over in the innermost loops, maximising
+        # the partial merges that are shared between sweeps
+        # -- only used if load_once is enabled
+        self._reorder_sweeps = reorder_sweeps
+        # only run the sweeps with: i % count == index, where i is the
+        # position of the sweep. Sweeps outside the shard are never loaded.
+        self._shard = None if (shard is None) else self._check_shard(shard)
+        # path to an append-only jsonl file that records completed sweeps,
+        # these are skipped when the sweep is restarted and never loaded.
+        self._journal = journal
+        # skip sweeps whose resolved configs were already run
+        self._dedupe = dedupe
+        # state of the current run
+        self._sweep_keys = []
+        self._sweep_positions = []
+        self._config_keys = set()
+        self._lock = threading.Lock()
+        self.summary = SweepSummary()
 
     def run(self, func: callable, config: ValidConfigTypes, entrypoint: str, overrides: List[str], backend: Backend):
-        # avoid circular import
-        from eunomia import eunomia_load
-
         # get default values
         if overrides is None:
             overrides = []
-
+        # joint sweeps need to draw the same points every run
+        self._check_seeded(overrides)
         # check number of sweeps to be performed
+        num_sweeps = self._get_num_sweeps(overrides)
+        # run all the sweeps
+        self._sweep_keys, self._sweep_positions, self._config_keys = [], [], set()
+        results = self._run_overrides(func, config, entrypoint, overrides, backend, num_sweeps)
+        if not self._no_output:
+            print(f'SUMMARY: {self.summary}')
+        return results
+
+    def _run_overrides(self, func: callable, config: ValidConfigTypes, entrypoint: str, overrides: list, backend: Backend, num_sweeps: int):
+        # avoid circular import
+        from eunomia import eunomia_load
+        # load the config tree once if needed
+        # -- the loader is also shared, re-using cached merge plans
+        group = self._load_group_once(config, backend)
+        with _frozen(group):
+            # iterate over all sweeps
+            if group is not None:
+                sweeps = self._yield_loaded_sweeps(ConfigLoader(group), entrypoint, overrides)
+            else:
+                sweeps = ((eunomia_load(config, entrypoint, new_overrides, backend), changed) for new_overrides, changed in self._yield_sweeps(overrides))
+            return self._run_sweeps(func, num_sweeps, sweeps)
+
+    def _load_group_once(self, config: ValidConfigTypes, backend: Backend) -> Optional[Group]:
+        if self._load_once:
+            return infer_backend_load_group(config, backend=backend)
+        return None
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Sharding                                                              #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    @staticmethod
+    def _check_shard(shard: Tuple[int, int]) -> Tuple[int, int]:
+        try:
+            index, count = shard
+        except (TypeError, ValueError):
+            raise ValueError(f'shard must be a tuple of (index, count), got: {repr(shard)}')
+        if not (isinstance(index, int) and isinstance(count, int)):
+            raise TypeError(f'shard index and count must be integers, got: {repr(shard)}')
+        if count < 1:
+            raise ValueError(f'shard count must be greater than zero, got: {repr(count)}')
+        if not (0 <= index < count):
+            raise ValueError(f'shard index must be in the range [0, {count}), got: {repr(index)}')
+        return index, count
+
+    def get_shard(self) -> Optional[Tuple[int, int]]:
+        """
+        Get the (index, count) of the shard, either from the runner
+        or from environment variables. None if sweeps are not sharded.
+        """
+        if self._shard is not None:
+            return self._shard
+        index, count = os.environ.get(self.ENV_SHARD_INDEX, None), os.environ.get(self.ENV_SHARD_COUNT, None)
+        if (index is None) and (count is None):
+            return None
+        if (index is None) or (count is None):
+            raise ValueError(f'both {self.ENV_SHARD_INDEX} and {self.ENV_SHARD_COUNT} must be set, got: {repr(index)} and {repr(count)}')
+        try:
+            index, count = int(index), int(count)
+        except ValueError:
+            raise ValueError(f'{self.ENV_SHARD_INDEX} and {self.ENV_SHARD_COUNT} must be integers, got: {repr(index)} and {repr(count)}')
+        return self._check_shard((index, count))
+
+    def _yield_sweeps(self, overrides: list, axis_order: List[int] = None):
+        grid = _ListSweep(overrides, axis_order=axis_order)
+        points = iter(grid)
+        shard = self.get_shard()
+        if shard is not None:
+            # points are computed directly from their index
+            index, count = shard
+            points = (grid[i] for i in range(index, grid.num_points, count))
+        # skip completed sweeps
+        completed = _read_journal(self._journal) if self._journal else set()
+        for position, (new_overrides, changed) in enumerate(points, start=1):
+            key = _get_sweep_key(new_overrides)
+            if key in completed:
+                self.summary.num_skipped_completed += 1
+                continue
+            self._sweep_keys.append(key)
+            self._sweep_positions.append(position)
+            yield new_overrides, changed
+
+    def _check_seeded(self, overrides: list):
+        """
+        Unseeded joint sweeps, eg. sample(...) or latin_hypercube(...), draw
+        different points in every process, so shards would overlap and
+        journals would skip or re-run the wrong sweeps.
+        """
+        unseeded = [v for v in overrides if isinstance(v, _JointSweepList) and not v.is_seeded]
+        if not unseeded:
+            return
+        if self.get_shard() is not None:
+            raise ValueError(f'joint sweeps must be given a seed when sharding, otherwise each shard draws different points, unseeded: {len(unseeded)}')
+        if self._journal:
+            raise ValueError(f'joint sweeps must be given a seed when using a journal, otherwise each restart draws different points, unseeded: {len(unseeded)}')
+        if self._dedupe:
+            warnings.warn(f'joint sweeps should be given a seed when deduplicating, otherwise each run draws different points, unseeded: {len(unseeded)}')
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Journal                                                               #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def _record_sweep(self, i: int, finished=True):
+        """
+        Record that the i-th sweep (starting at 1) that was yielded
+        from _yield_sweeps was completed without error.
+        """
+        if finished:
+            self.summary.num_finished += 1
+        if not self._journal:
+            return
+        line = json.dumps({'key': self._sweep_keys[i-1]})
+        # re-open the file each time so that progress
+        # is never lost if the program crashes
+        with open(self._journal, 'a') as f:
+            f.write(line + '\n')
+
+    def _get_num_sweeps(self, overrides: list) -> int:
         num_sweeps = _num_list_sweep_iterations(overrides)
+        # only count the sweeps in this shard
+        shard = self.get_shard()
+        if shard is not None:
+            index, count = shard
+            num_total, num_sweeps = num_sweeps, _get_num_values(range(index, num_sweeps, count))
+            if not self._no_output:
+                print(f'SHARD {index+1} OF {count}: running {num_sweeps} of {num_total} sweeps')
+        self.summary = SweepSummary(num_total=num_total if (shard is not None) else num_sweeps, num_in_shard=num_sweeps)
         if num_sweeps > self.WARN_SWEEPS:
             warnings.warn(f'number of sweeps seems high: {num_sweeps}')
+        return num_sweeps
 
-        # iterate over all sweeps
-        for i, (new_overrides, changed) in enumerate(_yield_list_sweep(overrides)):
-            merged_config = eunomia_load(config, entrypoint, new_overrides, backend)
-            self._run(i+1, num_sweeps, func, merged_config, changed)
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Deduplication                                                         #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def _is_duplicate(self, i: int, merged_config: dict) -> bool:
+        """
+        Check if the resolved config of the i-th sweep (starting at 1) has
+        already been run, in which case the sweep should be skipped.
+        Duplicates are recorded as completed.
+        """
+        if not self._dedupe:
+            return False
+        key = fingerprint(merged_config)
+        with self._lock:
+            if key not in self._config_keys:
+                self._config_keys.add(key)
+                return False
+            self.summary.num_skipped_duplicate += 1
+        self._record_sweep(i, finished=False)
+        return True
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Loading                                                               #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def _yield_loaded_sweeps(self, loader: ConfigLoader, entrypoint: str, overrides: list):
+        # consecutive sweeps share the merges of the groups that are
+        # consulted before the first override that differs
+        axis_order = None
+        if self._reorder_sweeps:
+            first_overrides, _ = next(_yield_list_sweep(overrides))
+            consult_order = loader.get_override_consult_order(entrypoint, overrides=first_overrides)
+            axis_order = _get_list_sweep_axis_order(overrides, consult_order, loader.get_override_group_keys)
+        # points are streamed, load_configs only takes one point at a time
+        # so that the copy of the points never holds more than one entry
+        points, changed_points = itertools.tee(self._yield_sweeps(overrides, axis_order=axis_order))
+        merged_configs = loader.load_configs(entrypoint, (new_overrides for new_overrides, _ in points))
+        for merged_config, (_, changed) in zip(merged_configs, changed_points):
+            yield merged_config, changed
+
+    def _run_sweeps(self, func, num_sweeps, sweeps):
+        return [self._run(i+1, num_sweeps, func, merged_config, changed) for i, (merged_config, changed) in enumerate(sweeps) if not self._is_duplicate(i+1, merged_config)]
 
     def _run(self, i, num_sweeps, func, merged_config, changed):
         raise NotImplementedError
 
+    def _print_sweep(self, i, num_sweeps, changed):
+        if not self._no_output:
+            if num_sweeps > 1:
+                if i == 1:
+                    print()
+                # the position in the shard is printed, so that
+                # skipped sweeps are not counted as remaining
+                print('='*100)
+                print(f'SWEEP {self._sweep_positions[i-1]} OF {num_sweeps}:', f"[{', '.join(map(repr, changed))}]" if changed else "")
+                print('='*100)
+                print()
+
 
 # ========================================================================= #
 # END                                                                       #
@@ -0,0 +1,125 @@
+import asyncio
+import inspect
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from eunomia.core.runner._runner import BaseRunner
+
+
+# ========================================================================= #
+# Helper                                                                    #
+# ========================================================================= #
+
+
+def _get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    # asyncio.get_running_loop is not supported before python 3.7
+    if sys.version_info >= (3, 7):
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+    return asyncio._get_running_loop()
+
+
+def _run_coroutine(coroutine):
+    # a blocking call cannot wait on the loop it is called from
+    if _get_running_loop() is not None:
+        coroutine.close()
+        raise RuntimeError(f'{RunnerAsync.__name__} cannot be run from inside a running event loop, eg. in a jupyter notebook or an async function. Run it in a separate thread instead, eg. `await loop.run_in_executor(None, lambda: eunomia_runner(...))`')
+    # asyncio.run is not supported before python 3.7
+    if sys.version_info >= (3, 7):
+        return asyncio.run(coroutine)
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+_DONE = object()
+
+
+# ========================================================================= #
+# Async Runner                                                              #
+# ========================================================================= #
+
+
+class RunnerAsync(BaseRunner):
+    """
+    Run coroutine functions for each sweep concurrently on an event loop,
+    returning the results in the order that the sweeps were started.
+
+    - at most max_concurrency sweeps are run at any one time.
+    - configs are loaded in a background thread so that loading the
+      config for the next sweep overlaps with awaiting the current ones.
+      Loading happens in a single thread so that the loader of load_once
+      can be shared between sweeps.
+    - if raise_errors is enabled, no more sweeps are started after an
+      error, and the first error in order is raised after the running
+      sweeps finish, otherwise errors are returned in place of results.
+    """
+
+    def __init__(self, no_output=True, load_once=False, reorder_sweeps=False, max_concurrency: int = 8, raise_errors=True, shard: Optional[Tuple[int, int]] = None, journal: Optional[str] = None, dedupe=False):
+        super().__init__(no_output=no_output, load_once=load_once, reorder_sweeps=reorder_sweeps, shard=shard, journal=journal, dedupe=dedupe)
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be greater than zero, got: {repr(max_concurrency)}')
+        self._max_concurrency = max_concurrency
+        self._raise_errors = raise_errors
+
+    def _run_sweeps(self, func, num_sweeps, sweeps):
+        return _run_coroutine(self._run_sweeps_async(func, num_sweeps, sweeps))
+
+    async def _run_sweeps_async(self, func, num_sweeps, sweeps):
+        loop = _get_running_loop()
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        failed = []
+        # run a single sweep, releasing its slot when done
+        async def run(i, merged_config):
+            try:
+                result = func(merged_config)
+                if inspect.isawaitable(result):
+                    result = await result
+                self._record_sweep(i)
+                return result
+            except Exception:
+                failed.append(True)
+                raise
+            finally:
+                semaphore.release()
+        # start sweeps as slots become available
+        tasks, i = [], 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                await semaphore.acquire()
+                item = _DONE
+                # errors could have occurred while waiting
+                if not (self._raise_errors and failed):
+                    item = await loop.run_in_executor(executor, next, sweeps, _DONE)
+                if (item is _DONE) or (self._raise_errors and failed):
+                    semaphore.release()
+                    break
+                merged_config, changed = item
+                i += 1
+                if self._is_duplicate(i, merged_config):
+                    semaphore.release()
+                    continue
+                self._print_sweep(i, num_sweeps, changed)
+                tasks.append(asyncio.ensure_future(run(i, merged_config)))
+        # wait for all the sweeps to finish
+        if tasks:
+            await asyncio.wait(tasks)
+        results = []
+        for task in tasks:
+            if task.exception() is None:
+                results.append(task.result())
+            elif self._raise_errors:
+                raise task.exception()
+            else:
+                results.append(task.exception())
+        return results
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
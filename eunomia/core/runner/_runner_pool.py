@@ -0,0 +1,185 @@
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable, Optional, Tuple
+
+from eunomia.backend import Backend, ValidConfigTypes, infer_backend_load_group
+from eunomia.config import ConfigLoader
+from eunomia.core.runner._runner import BaseRunner, _SKIPPED, _to_override_paths
+
+
+# ========================================================================= #
+# Worker                                                                    #
+# ========================================================================= #
+
+
+# the loader shared by all the sweeps run in a worker process,
+# the config tree is only loaded once per worker.
+_WORKER_LOADER: Optional[ConfigLoader] = None
+
+
+def _init_worker(config: ValidConfigTypes, backend: Backend):
+    global _WORKER_LOADER
+    group = infer_backend_load_group(config, backend=backend)
+    group.freeze()
+    _WORKER_LOADER = ConfigLoader(group)
+
+
+def _worker_run(func, merged_config: dict):
+    return func(merged_config)
+
+
+def _worker_load_and_run(init_args: Optional[tuple], func, entrypoint: str, overrides: list):
+    # pool initializers are not supported before python 3.7
+    if _WORKER_LOADER is None:
+        _init_worker(*init_args)
+    return func(_WORKER_LOADER.load_config(entrypoint, overrides=overrides))
+
+
+# ========================================================================= #
+# Base Pool Runner                                                          #
+# ========================================================================= #
+
+
+class _PoolRunner(BaseRunner):
+    """
+    Run each sweep in a concurrent.futures pool, gathering the
+    results in the order that the sweeps were submitted.
+
+    - at most max_in_flight sweeps are submitted at any one time, waiting
+      on the oldest sweep before submitting more, so that memory remains
+      bounded for large sweeps. Defaults to twice the number of workers.
+    - if raise_errors is enabled, the first error in submission order is
+      raised and the remaining sweeps are cancelled, otherwise errors are
+      returned in place of results.
+    """
+
+    def __init__(
+            self,
+            no_output=True,
+            load_once=False,
+            reorder_sweeps=False,
+            max_workers: Optional[int] = None,
+            max_in_flight: Optional[int] = None,
+            raise_errors=True,
+            shard: Optional[Tuple[int, int]] = None,
+            journal: Optional[str] = None,
+            dedupe=False,
+    ):
+        super().__init__(no_output=no_output, load_once=load_once, reorder_sweeps=reorder_sweeps, shard=shard, journal=journal, dedupe=dedupe)
+        if (max_workers is not None) and (max_workers < 1):
+            raise ValueError(f'max_workers must be greater than zero, got: {repr(max_workers)}')
+        if (max_in_flight is not None) and (max_in_flight < 1):
+            raise ValueError(f'max_in_flight must be greater than zero, got: {repr(max_in_flight)}')
+        self._max_workers = max_workers
+        self._max_in_flight = max_in_flight
+        self._raise_errors = raise_errors
+
+    def _get_max_workers(self) -> int:
+        return self._max_workers or os.cpu_count() or 1
+
+    def _make_pool(self, **kwargs) -> Executor:
+        raise NotImplementedError
+
+    def _gather(self, pool: Executor, num_sweeps: int, tasks: Iterable[Tuple[tuple, Optional[tuple]]]) -> list:
+        # tasks that are None were skipped, results that are _SKIPPED were
+        # skipped by the workers, these are excluded from the results
+        max_in_flight = self._max_in_flight
+        if max_in_flight is None:
+            max_in_flight = 2 * self._get_max_workers()
+        results, in_flight = [], deque()
+        # wait for the oldest sweep to finish
+        def collect():
+            i, changed, future = in_flight.popleft()
+            try:
+                result = future.result()
+            except Exception as e:
+                if self._raise_errors:
+                    for _, _, f in in_flight:
+                        f.cancel()
+                    raise
+                result = e
+            else:
+                if result is _SKIPPED:
+                    return
+                self._record_sweep(i)
+            self._print_sweep(i, num_sweeps, changed)
+            results.append(result)
+        # submit the sweeps, bounding those in flight
+        for i, (changed, task) in enumerate(tasks):
+            if task is None:
+                continue
+            while len(in_flight) >= max_in_flight:
+                collect()
+            in_flight.append((i+1, changed, pool.submit(*task)))
+        while in_flight:
+            collect()
+        return results
+
+
+# ========================================================================= #
+# Process Pool Runner                                                       #
+# ========================================================================= #
+
+
+class RunnerProcessPool(_PoolRunner):
+    """
+    Run each sweep in a process pool, see _PoolRunner for more details.
+
+    - configs are loaded in the parent process and sent to the workers,
+      unless load_in_workers is enabled, in which case each worker loads
+      the config tree once and only the overrides are sent to the workers.
+      The config, backend and function must then be picklable.
+    """
+
+    def __init__(
+            self,
+            no_output=True,
+            load_once=False,
+            reorder_sweeps=False,
+            max_workers: Optional[int] = None,
+            max_in_flight: Optional[int] = None,
+            load_in_workers=False,
+            raise_errors=True,
+            mp_context=None,
+            shard: Optional[Tuple[int, int]] = None,
+            journal: Optional[str] = None,
+            dedupe=False,
+    ):
+        super().__init__(no_output=no_output, load_once=load_once, reorder_sweeps=reorder_sweeps, max_workers=max_workers, max_in_flight=max_in_flight, raise_errors=raise_errors, shard=shard, journal=journal, dedupe=dedupe)
+        if load_in_workers and dedupe:
+            raise ValueError('dedupe is not supported with load_in_workers, configs are not loaded by the parent process')
+        self._load_in_workers = load_in_workers
+        self._mp_context = mp_context
+
+    def _run_overrides(self, func: callable, config: ValidConfigTypes, entrypoint: str, overrides: list, backend: Backend, num_sweeps: int):
+        if not self._load_in_workers:
+            return super()._run_overrides(func, config, entrypoint, overrides, backend, num_sweeps)
+        # each worker loads the config tree once
+        init_args = (config, backend)
+        if sys.version_info >= (3, 7):
+            pool = self._make_pool(initializer=_init_worker, initargs=init_args)
+            init_args = None
+        else:
+            pool = self._make_pool()
+        with pool:
+            # groups and options are sent as paths, so that they are resolved
+            # in the tree of the worker, and the tree is not pickled every time
+            tasks = ((changed, (_worker_load_and_run, init_args, func, entrypoint, _to_override_paths(new_overrides))) for new_overrides, changed in self._yield_sweeps(overrides))
+            return self._gather(pool, num_sweeps, tasks)
+
+    def _run_sweeps(self, func, num_sweeps, sweeps):
+        with self._make_pool() as pool:
+            tasks = ((changed, None if self._is_duplicate(i+1, merged_config) else (_worker_run, func, merged_config)) for i, (merged_config, changed) in enumerate(sweeps))
+            return self._gather(pool, num_sweeps, tasks)
+
+    def _make_pool(self, **kwargs) -> ProcessPoolExecutor:
+        if self._mp_context is not None:
+            kwargs['mp_context'] = self._mp_context
+        return ProcessPoolExecutor(max_workers=self._max_workers, **kwargs)
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from eunomia.backend import Backend, ValidConfigTypes
+from eunomia.config import ConfigLoader
+from eunomia.core.runner._runner import _frozen, _SKIPPED
+from eunomia.core.runner._runner_pool import _PoolRunner
+
+
+# ========================================================================= #
+# Thread Pool Runner                                                        #
+# ========================================================================= #
+
+
+class RunnerThreadPool(_PoolRunner):
+    """
+    Run each sweep in a thread pool, see _PoolRunner for more details.
+    Useful when sweeps mostly block on I/O, eg. submitting jobs or
+    writing files, overlapping loading and running across threads.
+
+    - configs are loaded in the worker threads, if load_once is enabled
+      the config tree is shared between threads, but each thread has its
+      own loader as loaders cannot be shared between threads.
+    - reorder_sweeps is not used, as consecutive sweeps are not loaded
+      by the same loader.
+    """
+
+    def __init__(
+            self,
+            no_output=True,
+            load_once=False,
+            max_workers: Optional[int] = None,
+            max_in_flight: Optional[int] = None,
+            raise_errors=True,
+            shard: Optional[Tuple[int, int]] = None,
+            journal: Optional[str] = None,
+            dedupe=False,
+    ):
+        super().__init__(no_output=no_output, load_once=load_once, max_workers=max_workers, max_in_flight=max_in_flight, raise_errors=raise_errors, shard=shard, journal=journal, dedupe=dedupe)
+
+    def _run_overrides(self, func: callable, config: ValidConfigTypes, entrypoint: str, overrides: list, backend: Backend, num_sweeps: int):
+        # avoid circular import
+        from eunomia import eunomia_load
+        # load the config tree once if needed
+        group = self._load_group_once(config, backend)
+        local = threading.local()
+        def load_and_run(i, new_overrides):
+            if group is None:
+                merged_config = eunomia_load(config, entrypoint, new_overrides, backend)
+            else:
+                loader = getattr(local, 'loader', None)
+                if loader is None:
+                    loader = local.loader = ConfigLoader(group)
+                merged_config = loader.load_config(entrypoint, overrides=new_overrides)
+            if self._is_duplicate(i, merged_config):
+                return _SKIPPED
+            return func(merged_config)
+        # run all the sweeps
+        with _frozen(group), self._make_pool() as pool:
+            tasks = ((changed, (load_and_run, i+1, new_overrides)) for i, (new_overrides, changed) in enumerate(self._yield_sweeps(overrides)))
+            return self._gather(pool, num_sweeps, tasks)
+
+    def _make_pool(self, **kwargs) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self._get_max_workers(), **kwargs)
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
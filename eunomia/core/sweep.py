@@ -1,5 +1,7 @@
 import os as _os
-from typing import Iterable as _Iterable, Dict as _Dict
+import random as _random
+from collections.abc import Sequence as _SequenceABC
+from typing import Iterable as _Iterable, Dict as _Dict, List as _List, Sequence as _Sequence, Callable as _Callable, Tuple as _Tuple
 
 
 # ========================================================================= #
@@ -7,9 +9,38 @@ from typing import Iterable as _Iterable, Dict as _Dict
 # ========================================================================= #
 
 
+def _get_num_values(values: _Sequence) -> int:
+    # len(...) raises an OverflowError for sequences with
+    # more than sys.maxsize values, eg. huge ranges
+    try:
+        return len(values)
+    except OverflowError:
+        if not isinstance(values, range):
+            raise
+    start, stop, step = values.start, values.stop, values.step
+    if step < 0:
+        start, stop, step = -start, -stop, -step
+    return max(0, (stop - start + step - 1) // step)
+
+
 class _SweepList(object):
-    def __iter__(self):
+    """
+    The values of a sweep list are only ever computed once and cached, or
+    are accessed directly if they are already a sequence, such that len(...)
+    and indexing are constant time after the first access.
+    - num_values should be used instead of len(...) for huge ranges
+    """
+    def _get_items(self) -> _Sequence:
         raise NotImplementedError
+    @property
+    def num_values(self) -> int:
+        return _get_num_values(self._get_items())
+    def __iter__(self):
+        return iter(self._get_items())
+    def __len__(self):
+        return len(self._get_items())
+    def __getitem__(self, i: int):
+        return self._get_items()[i]
     def __str__(self):
         return f"<{str(list(self))[1:-1]}>"
 
@@ -18,44 +49,178 @@ class _Choices(_SweepList):
     def __init__(self, choices: _Iterable):
         assert isinstance(choices, _Iterable)
         self._iterable = choices
-    def __iter__(self):
-        yield from self._iterable
+        self._items = None
+    def _get_choices(self) -> _Sequence:
+        # sequences, including ranges, are never copied
+        if isinstance(self._iterable, _SequenceABC):
+            return self._iterable
+        if self._items is None:
+            self._items = list(self._iterable)
+        return self._items
+    def _get_items(self) -> _Sequence:
+        return self._get_choices()
 
 
 class _Reverse(_Choices):
-    def __iter__(self):
-        yield from reversed(list(self._iterable))
+    def __init__(self, choices: _Iterable):
+        super().__init__(choices)
+        self._reversed = None
+    def _get_items(self) -> _Sequence:
+        if self._reversed is None:
+            self._reversed = self._get_choices()[::-1]
+        return self._reversed
 
 
 class _Sort(_Choices):
     def __init__(self, choices: _Iterable, reverse=False):
         super().__init__(choices)
         self._reverse = reverse
-    def __iter__(self):
-        items = sorted(self._iterable)
-        yield from reversed(items) if self._reverse else items
+        self._sorted = None
+    def _get_items(self) -> _Sequence:
+        if self._sorted is None:
+            self._sorted = sorted(self._get_choices(), reverse=self._reverse)
+        return self._sorted
 
 
 class _Options(_SweepList):
     def __init__(self, group: str, options: _Iterable):
         self._group = group
         self._options = options
+        self._items, self._modifications = None, None
 
-    def __iter__(self):
+    def _get_items(self) -> _Sequence:
         from eunomia.config import Group
-        # handle group
-        options = self._options
-        if isinstance(options, Group):
-            options = options.options.values()
-        # return values
-        for option in options:
-            yield {self._group: option}
+        from eunomia.config._config import _ConfigObject
+        # the options of a group are only listed again if a config tree was modified
+        if (self._items is None) or (isinstance(self._options, Group) and self._modifications != _ConfigObject._MODIFICATIONS):
+            # handle group
+            options = self._options
+            if isinstance(options, Group):
+                self._modifications = _ConfigObject._MODIFICATIONS
+                options = options.options.values()
+            # return values
+            self._items = [{self._group: option} for option in options]
+        return self._items
+
+# ========================================================================= #
+# Sampling                                                                  #
+# - joint sweeps over multiple axes, drawing points from the product of   #
+#   the axes without ever enumerating it. Each point is a tuple with one   #
+#   value for each axis, these are spliced into the overrides in order.    #
+# ========================================================================= #
+
+
+class _JointSweepList(_SweepList):
+
+    def __init__(self, axes: _Iterable, k: int, seed: int = None):
+        # only the axes are materialised, never their product
+        self._axes = [list(axis) for axis in axes]
+        if not self._axes:
+            raise ValueError('at least one axis is required')
+        for axis in self._axes:
+            if not axis:
+                raise ValueError('axes cannot be empty')
+        if k < 0:
+            raise ValueError(f'the number of samples must not be negative, got: {repr(k)}')
+        self._k = k
+        # points need to be the same every time they are iterated over,
+        # so a seed is chosen if not given. A seed must be given if the
+        # same sweep is run across different processes, eg. when sharding
+        # or resuming from a journal, runners check this with is_seeded
+        self._is_seeded = seed is not None
+        self._seed = _random.randrange(2**32) if (seed is None) else seed
+        self._items = None
+
+    def _generate(self) -> _Iterable[tuple]:
+        raise NotImplementedError
+
+    def _get_items(self) -> _Sequence[tuple]:
+        if self._items is None:
+            self._items = list(self._generate())
+        return self._items
+
+    @property
+    def is_seeded(self) -> bool:
+        return self._is_seeded
+
+    @property
+    def num_combinations(self) -> int:
+        count = 1
+        for axis in self._axes:
+            count *= len(axis)
+        return count
+
+    def _get_point(self, indices: _Sequence[int]) -> tuple:
+        return tuple(axis[i] for axis, i in zip(self._axes, indices))
+
+    def _get_point_from_index(self, index: int) -> tuple:
+        # mixed-radix decoding, the last axis varies fastest
+        indices = []
+        for axis in reversed(self._axes):
+            index, i = divmod(index, len(axis))
+            indices.append(i)
+        return self._get_point(indices[::-1])
+
+    def __len__(self):
+        return self._k
+
+    @property
+    def num_values(self) -> int:
+        return self._k
+
+
+class _Sample(_JointSweepList):
+    """
+    Uniformly sample k points from the product of the axes.
+    - if replace=False points are unique, k must not be greater than
+      the number of combinations.
+    """
+
+    def __init__(self, axes: _Iterable, k: int, seed: int = None, replace=False):
+        super().__init__(axes, k=k, seed=seed)
+        self._replace = replace
+        if (not replace) and (k > self.num_combinations):
+            raise ValueError(f'cannot draw {k} unique samples from {self.num_combinations} combinations, use replace=True instead')
+
+    def _generate(self):
+        rng = _random.Random(self._seed)
+        if self._replace:
+            for _ in range(self._k):
+                yield self._get_point([rng.randrange(len(axis)) for axis in self._axes])
+        else:
+            # range objects are sampled without being enumerated
+            for index in rng.sample(range(self.num_combinations), self._k):
+                yield self._get_point_from_index(index)
+
+
+class _LatinHypercube(_JointSweepList):
+    """
+    Latin-hypercube sample k points from the product of the axes. The range
+    of each axis is divided into k equal strata, with each stratum of each
+    axis sampled exactly once, spreading points more evenly than uniform
+    sampling. The values within each axis should therefore be ordered.
+    """
+
+    def _generate(self):
+        rng = _random.Random(self._seed)
+        # random permutation of the strata for each axis
+        strata = []
+        for _ in self._axes:
+            perm = list(range(self._k))
+            rng.shuffle(perm)
+            strata.append(perm)
+        # uniformly sample within each stratum
+        for j in range(self._k):
+            yield self._get_point([min(int((strata[d][j] + rng.random()) / self._k * len(axis)), len(axis) - 1) for d, axis in enumerate(self._axes)])
+
 
 # rename
 sort = _Sort
 reverse = _Reverse
 choices = _Choices
 options = _Options
+sample = _Sample
+latin_hypercube = _LatinHypercube
 
 
 # ========================================================================= #
@@ -66,28 +231,107 @@ options = _Options
 def _num_list_sweep_iterations(values: list):
     count = 1
     for v in (v for v in values if isinstance(v, _SweepList)):
-        count *= len(list(v))
+        count *= v.num_values
     return count
 
 
-def _yield_list_sweep(values: list, return_sweep=True):
+def _iter_sweep_value(sweep_list: _SweepList, value):
+    # joint sweeps give a value for each of their axes
+    if isinstance(sweep_list, _JointSweepList):
+        yield from value
+    else:
+        yield value
+
+
+class _ListSweep(object):
     """
-    list will be product-iterated over all instances of SweepList.
+    The product of all instances of SweepList in a list, with random access
+    to the points computed using mixed-radix arithmetic, such that counting,
+    sharding and resuming large sweeps is constant time per point.
     - nested data structures are not searched.
+    - axis_order is a permutation of the SweepList instances, the first
+      axis is iterated over in the outermost loop and the last axis in
+      the innermost loop. The sweep values that are returned are always
+      in the original order.
+    - values from a joint SweepList are spliced into the list in place
+      of the SweepList, one after the other.
 
-    Note that if not SweepList values are found, only one item is returned.
+    Note that if not SweepList values are found, there is only one point.
     """
-    permutable = [v for i, v in enumerate(values) if isinstance(v, _SweepList)]
-    indices    = [i for i, v in enumerate(values) if isinstance(v, _SweepList)]
-    # permutable = [v if isinstance(v, _SweepList) else _Single(v) for v in values]
-    import itertools
-    for sweep in itertools.product(*permutable):
-        merged = list(values)
-        for i, v in zip(indices, sweep):
+
+    def __init__(self, values: list, axis_order: _Sequence[int] = None):
+        self._values = list(values)
+        self._permutable = [v for i, v in enumerate(values) if isinstance(v, _SweepList)]
+        self._indices    = [i for i, v in enumerate(values) if isinstance(v, _SweepList)]
+        self._joint = {i for i, v in enumerate(values) if isinstance(v, _JointSweepList)}
+        if axis_order is None:
+            axis_order = range(len(self._permutable))
+        elif sorted(axis_order) != list(range(len(self._permutable))):
+            raise ValueError(f'axis_order must be a permutation of the {len(self._permutable)} sweep axes, got: {repr(axis_order)}')
+        self._axis_order = list(axis_order)
+        self._len = _num_list_sweep_iterations(values)
+
+    @property
+    def num_points(self) -> int:
+        # len(...) cannot be used for grids with more than sys.maxsize points
+        return self._len
+
+    def __len__(self):
+        return self._len
+
+    def _make_point(self, sweep: tuple) -> _Tuple[list, tuple]:
+        merged = list(self._values)
+        for i, v in zip(self._indices, sweep):
             merged[i] = v
+        if self._joint:
+            merged = [v for i, value in enumerate(merged) for v in (_iter_sweep_value(self._values[i], value) if (i in self._joint) else (value,))]
+        return merged, sweep
+
+    def __getitem__(self, index: int) -> _Tuple[list, tuple]:
+        if index < 0:
+            index += self._len
+        if not (0 <= index < self._len):
+            raise IndexError(f'sweep index out of range: {index}')
+        # mixed-radix decoding, the innermost axis varies fastest
+        sweep = [None] * len(self._permutable)
+        for a in reversed(self._axis_order):
+            index, i = divmod(index, self._permutable[a].num_values)
+            sweep[a] = self._permutable[a][i]
+        return self._make_point(tuple(sweep))
+
+    def __iter__(self):
+        import itertools
+        for ordered in itertools.product(*(self._permutable[a] for a in self._axis_order)):
+            sweep = [None] * len(self._permutable)
+            for a, v in zip(self._axis_order, ordered):
+                sweep[a] = v
+            yield self._make_point(tuple(sweep))
+
+
+def _yield_list_sweep(values: list, return_sweep=True, axis_order: _Sequence[int] = None):
+    """
+    list will be product-iterated over all instances of SweepList.
+    See _ListSweep for more details.
+    """
+    for merged, sweep in _ListSweep(values, axis_order=axis_order):
         yield (merged, sweep) if return_sweep else merged
 
 
+def _get_list_sweep_axis_order(values: list, consult_order: _Sequence[tuple], get_group_keys: _Callable[[object], _Iterable[tuple]]) -> _List[int]:
+    """
+    Order the SweepList instances by the earliest position that the groups
+    they override are consulted while merging, so that sweep points sharing
+    the start of their merge order are adjacent. Axes that are consulted
+    later are iterated over in the inner loops.
+    - axes whose groups are never consulted are placed last
+    """
+    positions = {keys: i for i, keys in reversed(list(enumerate(consult_order)))}
+    permutable = [v for v in values if isinstance(v, _SweepList)]
+    def earliest(axis: int):
+        return min((positions.get(keys, len(positions)) for value in permutable[axis] for v in _iter_sweep_value(permutable[axis], value) for keys in get_group_keys(v)), default=len(positions))
+    return sorted(range(len(permutable)), key=earliest)
+
+
 # ========================================================================= #
 # End                                                                       #
 # ========================================================================= #
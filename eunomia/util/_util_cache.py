@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable, Optional
+
+
+# ========================================================================= #
+# LRU Cache                                                                 #
+# ========================================================================= #
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+_MISSING = object()
+
+
+class LruCache(object):
+    """
+    A bounded least-recently-used cache that keeps track of
+    the number of hits, misses and evictions.
+
+    - maxsize=None means the cache is unbounded
+    - maxsize=0 means the cache is disabled
+    - the cache is safe to share between threads, but values may be
+      made more than once if missing keys are requested concurrently
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024):
+        self._lock = threading.RLock()
+        self._cache = OrderedDict()
+        self._maxsize = self._check_maxsize(maxsize)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _check_maxsize(maxsize):
+        if maxsize is None:
+            return None
+        if not isinstance(maxsize, int) or isinstance(maxsize, bool):
+            raise TypeError(f'maxsize must be an integer or None, got: {repr(maxsize)}')
+        if maxsize < 0:
+            raise ValueError(f'maxsize must be greater than or equal to zero, got: {repr(maxsize)}')
+        return maxsize
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Getters & Setters                                                     #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            value = self._cache.get(key, _MISSING)
+            if value is _MISSING:
+                self._misses += 1
+                return default
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if self._maxsize == 0:
+            return
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            self._evict()
+
+    def get_or_make(self, key: Hashable, make: Callable[[Hashable], Any]):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            # the lock is not held, so slow values do not block other threads
+            value = make(key)
+            self.put(key, value)
+        return value
+
+    def _evict(self):
+        if self._maxsize is None:
+            return
+        while len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+            self._evictions += 1
+
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+    # Management                                                            #
+    # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - #
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        return self._maxsize
+
+    def resize(self, maxsize: Optional[int]):
+        """
+        Change the maximum size of the cache, evicting
+        the least recently used entries if needed.
+        """
+        with self._lock:
+            self._maxsize = self._check_maxsize(maxsize)
+            self._evict()
+
+    def clear(self, reset_stats=True):
+        with self._lock:
+            self._cache.clear()
+            if reset_stats:
+                self._hits, self._misses, self._evictions = 0, 0, 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                maxsize=self._maxsize,
+                currsize=len(self._cache),
+            )
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key: Hashable):
+        return key in self._cache
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({", ".join(f"{k}={v}" for k, v in self.info()._asdict().items())})'
+
+
+# ========================================================================= #
+# End                                                                       #
+# ========================================================================= #
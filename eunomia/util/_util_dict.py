@@ -7,14 +7,18 @@ from typing import Iterable, List, Tuple, Type
 # ========================================================================= #
 
 
-def recursive_getitem(dct, keys: Iterable[str], make_missing=False):
+def recursive_getitem(dct, keys: Iterable[str], make_missing=False, copy_on_write=False):
     if not keys:
         return dct
     (key, *keys) = keys
     if make_missing:
         if key not in dct:
             dct[key] = {}
-    return recursive_getitem(dct[key], keys, make_missing=make_missing)
+    # make sure shared dictionaries are never returned for modification
+    if copy_on_write:
+        if isinstance(dct[key], dict):
+            dct[key] = dict(dct[key])
+    return recursive_getitem(dct[key], keys, make_missing=make_missing, copy_on_write=copy_on_write)
 
 
 def recursive_setitem(dct, keys: Iterable[str], value, make_missing=False):
@@ -25,7 +29,14 @@ def recursive_setitem(dct, keys: Iterable[str], value, make_missing=False):
     insert_at[key] = value
 
 
-def dict_recursive_update(left, right, allow_overwrite=True, safe_merge=True, allow_update_types: List[Tuple[Type, ...]] = None):
+def dict_recursive_update(left, right, allow_overwrite=True, safe_merge=True, allow_update_types: List[Tuple[Type, ...]] = None, copy_on_write=False):
+    """
+    Recursively merge the right dictionary into the left dictionary.
+    - if copy_on_write=True then only the left dictionary itself is modified,
+      nested dictionaries are copied before they are updated. This allows
+      values from the right dictionary to be shared by reference, without
+      them being modified by subsequent merges.
+    """
     # check type groups
     if allow_update_types is None:
         allow_update_types = []
@@ -34,10 +45,10 @@ def dict_recursive_update(left, right, allow_overwrite=True, safe_merge=True, al
     # check user groups
     assert all(isinstance(group, tuple) for group in allow_update_types)
     # begin merge!
-    _dict_recursive_update(left, right, [], allow_overwrite=allow_overwrite, safe_merge=safe_merge, type_merge_groups=allow_update_types)
+    _dict_recursive_update(left, right, [], allow_overwrite=allow_overwrite, safe_merge=safe_merge, type_merge_groups=allow_update_types, copy_on_write=copy_on_write)
 
 
-def _dict_recursive_update(left, right, stack, allow_overwrite, safe_merge, type_merge_groups):
+def _dict_recursive_update(left, right, stack, allow_overwrite, safe_merge, type_merge_groups, copy_on_write):
     # right overwrites left
     for k, rv in right.items():
         if k not in left:
@@ -48,7 +59,9 @@ def _dict_recursive_update(left, right, stack, allow_overwrite, safe_merge, type
             # handle cases
             # -- l and r are dictionaries
             if isinstance(lv, dict) and isinstance(rv, dict):
-                _dict_recursive_update(left[k], rv, stack=stack + [k], allow_overwrite=allow_overwrite, safe_merge=safe_merge, type_merge_groups=type_merge_groups)
+                if copy_on_write:
+                    left[k] = dict(lv)
+                _dict_recursive_update(left[k], rv, stack=stack + [k], allow_overwrite=allow_overwrite, safe_merge=safe_merge, type_merge_groups=type_merge_groups, copy_on_write=copy_on_write)
                 continue
             if not allow_overwrite:
                 raise KeyError(f'cannot overwrite existing keys {stack}')
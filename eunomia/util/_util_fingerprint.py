@@ -0,0 +1,115 @@
+import hashlib
+import struct
+from collections.abc import Mapping
+from typing import Any
+
+
+# ========================================================================= #
+# Fingerprint                                                               #
+# ========================================================================= #
+
+
+# each value is prefixed with a tag for its type so that
+# different types with the same bytes have different hashes
+_TAG_NONE = b'N'
+_TAG_BOOL = b'B'
+_TAG_INT = b'I'
+_TAG_FLOAT = b'F'
+_TAG_COMPLEX = b'C'
+_TAG_STR = b'S'
+_TAG_BYTES = b'Y'
+_TAG_LIST = b'L'
+_TAG_TUPLE = b'T'
+_TAG_SET = b'E'
+_TAG_DICT = b'D'
+_TAG_REPR = b'R'
+
+_DIGEST_SIZE = 16
+
+
+def _new_hash():
+    return hashlib.blake2b(digest_size=_DIGEST_SIZE)
+
+
+def _update_len(h, n: int):
+    h.update(struct.pack('<Q', n))
+
+
+def _update_bytes(h, tag: bytes, b: bytes):
+    # length prefixed so that the boundaries between values are unambiguous
+    h.update(tag)
+    _update_len(h, len(b))
+    h.update(b)
+
+
+def _get_digest(*values) -> bytes:
+    h = _new_hash()
+    for value in values:
+        _update(h, value)
+    return h.digest()
+
+
+def _update(h, value: Any):
+    # bool is a subclass of int and must be checked first
+    if value is None:
+        h.update(_TAG_NONE)
+    elif isinstance(value, bool):
+        h.update(_TAG_BOOL + (b'1' if value else b'0'))
+    elif isinstance(value, int):
+        _update_bytes(h, _TAG_INT, value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True))
+    elif isinstance(value, float):
+        # normalise the sign of zero
+        _update_bytes(h, _TAG_FLOAT, struct.pack('<d', value + 0.0))
+    elif isinstance(value, complex):
+        _update_bytes(h, _TAG_COMPLEX, struct.pack('<dd', value.real + 0.0, value.imag + 0.0))
+    elif isinstance(value, str):
+        _update_bytes(h, _TAG_STR, value.encode('utf8', 'surrogatepass'))
+    elif isinstance(value, bytes):
+        _update_bytes(h, _TAG_BYTES, value)
+    elif isinstance(value, (list, tuple)):
+        h.update(_TAG_LIST if isinstance(value, list) else _TAG_TUPLE)
+        _update_len(h, len(value))
+        for v in value:
+            _update(h, v)
+    elif isinstance(value, (set, frozenset, Mapping)):
+        # unordered values are hashed individually, with the
+        # sorted digests combined so that order does not matter
+        if isinstance(value, Mapping):
+            tag, digests = _TAG_DICT, sorted(_get_digest(k, v) for k, v in value.items())
+        else:
+            tag, digests = _TAG_SET, sorted(_get_digest(v) for v in value)
+        h.update(tag)
+        _update_len(h, len(digests))
+        for d in digests:
+            h.update(d)
+    else:
+        # fallback for other values, eg. range(3) from an eval node, tagged
+        # with the qualified name of the type so that different types with
+        # the same repr have different hashes
+        t = type(value)
+        _update_bytes(h, _TAG_REPR, f'{t.__module__}.{t.__qualname__}:{value!r}'.encode('utf8', 'surrogatepass'))
+
+
+def fingerprint(config: Any) -> str:
+    """
+    Get a deterministic digest of the contents of a resolved config,
+    computed in a single pass without serialising the config.
+
+    - the result is consistent across processes and python hash seeds.
+    - the order of keys in dictionaries and of values in sets does not
+      matter, but the order of values in lists and tuples does.
+    - supports None, bool, int, float, complex, str, bytes, list, tuple,
+      set, frozenset and mappings. Values of different types are never
+      equal, eg. 1, 1.0 and True, or lists and tuples.
+    - other values fall back to their repr tagged with their type, these
+      are only consistent across processes if their repr is, eg. range(3)
+      is but object() is not.
+    """
+    h = _new_hash()
+    _update(h, config)
+    return h.hexdigest()
+
+
+# ========================================================================= #
+# End                                                                       #
+# ========================================================================= #
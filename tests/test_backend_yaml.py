@@ -1,5 +1,6 @@
+import glob
 import pytest
-from eunomia.backend._backend_yaml import yaml_load
+from eunomia.backend._backend_yaml import yaml_load, EunomiaSafeLoader, EunomiaCSafeLoader, DEFAULT_YAML_LOADER
 from eunomia.config.nodes import IgnoreNode
 
 
@@ -20,3 +21,61 @@ def test_yaml_tags():
         assert yaml_load('!str {1, 2, 3}') == IgnoreNode('{1: None, 2: None, 3: None}')
     with pytest.raises(TypeError):
         assert yaml_load('!str [1, 2, 3]') == '[1, 2, 3]'
+
+
+# ========================================================================= #
+# Test C Loader Parity                                                      #
+# ========================================================================= #
+
+
+requires_c_loader = pytest.mark.skipif(EunomiaCSafeLoader is None, reason='the libyaml C parser is not available, install ruamel.yaml.clib')
+
+
+_YAML_CASES = [
+    # yaml 1.2 semantics
+    'a: yes', 'a: on', 'a: 014', 'a: 0o14', 'a: 0x1f', 'a: 1:20', 'a: 1e3', 'a: 1.5', 'a: .inf', 'a: ~', 'a: true',
+    # containers
+    'a: [1, {b: 2.5}]', '{1, 2, 3}', '- a\n- b: [c]\n', 'a: &x {b: 1}\nc: *x\n', 'a: |\n  multi\n  line\n',
+    # custom tags
+    'a: !str ${x}', 'a: !str 1', 'a: !str f"{conf.a}"',
+]
+
+
+def test_default_loader():
+    if EunomiaCSafeLoader is None:
+        assert DEFAULT_YAML_LOADER is EunomiaSafeLoader
+    else:
+        assert DEFAULT_YAML_LOADER is EunomiaCSafeLoader
+
+
+@requires_c_loader
+@pytest.mark.parametrize('string', _YAML_CASES)
+def test_c_loader_parity(string):
+    value = yaml_load(string, loader=EunomiaCSafeLoader)
+    assert value == yaml_load(string, loader=EunomiaSafeLoader)
+    assert repr(value) == repr(yaml_load(string, loader=EunomiaSafeLoader))
+
+
+@requires_c_loader
+@pytest.mark.parametrize('path', sorted(glob.glob('examples/**/*.yaml', recursive=True)))
+def test_c_loader_parity_examples(path):
+    with open(path, 'r') as f:
+        string = f.read()
+    assert yaml_load(string, loader=EunomiaCSafeLoader) == yaml_load(string, loader=EunomiaSafeLoader)
+
+
+@requires_c_loader
+@pytest.mark.parametrize('string', ['%YAML 1.1\n---\na: yes\nb: 014\n', '# comment\n%YAML 1.1\n---\na: on\n'])
+def test_c_loader_directives(string):
+    # documents with directives fall back to the pure-python loader
+    assert yaml_load(string) == yaml_load(string, loader=EunomiaSafeLoader)
+
+
+@requires_c_loader
+def test_c_loader_errors():
+    import ruamel.yaml as yaml
+    for loader in [EunomiaSafeLoader, EunomiaCSafeLoader]:
+        with pytest.raises(TypeError):
+            yaml_load('!str [1, 2, 3]', loader=loader)
+        with pytest.raises(yaml.YAMLError):
+            yaml_load('a: [1, 2', loader=loader)
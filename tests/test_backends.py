@@ -29,6 +29,224 @@ def test_simple_option():
     BackendYaml().load_group('examples/docs/quickstart/configs')
 
 
+def test_precompile_options():
+    from copy import deepcopy
+    from eunomia import eunomia_load
+    from eunomia.config import Group, Option
+    # yaml templates give the same results
+    root = BackendYaml(precompile=True).load_group('examples/docs/quickstart/configs')
+    assert all(o.is_precompiled for o in root.walk_descendants() if isinstance(o, Option))
+    for entrypoint in ['default', 'advanced']:
+        expected = eunomia_load('examples/docs/quickstart/configs', entrypoint)
+        assert eunomia_load(root, entrypoint) == expected
+        assert eunomia_load(root, entrypoint) == expected
+    # shared templates are not modified by merges
+    root = BackendDict(precompile=True).load_group(BackendDict().dump(Group({
+        'group': Group({'option': Option({'b': {'d': '${=1+1}'}}, pkg='a')}),
+        'default': Option({'a': {'b': {'c': 'foo'}}}, defaults=[{'group': 'option'}]),
+    })))
+    data = deepcopy(root.get_option('default').get_unresolved_data())
+    assert eunomia_load(root, 'default') == {'a': {'b': {'c': 'foo', 'd': 2}}}
+    assert eunomia_load(root, 'default') == {'a': {'b': {'c': 'foo', 'd': 2}}}
+    assert root.get_option('default').get_unresolved_data() == data
+
+
+def test_precompile_constant_folding():
+    from eunomia import eunomia_load
+    from eunomia.config import Group, Option
+    from eunomia.config.nodes import SubNode
+    from eunomia.config._loader import _merge_option_data
+    data = {'a': '${=1+1}', 'b': 'x${=2*3}', 'c': '${=conf.a}', 'd': 'plain', 'e': ['${=[1]}']}
+    # constant templates are resolved once
+    template = Option(data).precompile().get_unresolved_data()
+    assert (template['a'], template['b'], template['d']) == (2, 'x6', 'plain')
+    assert isinstance(template['c'], SubNode)
+    assert isinstance(template['e'][0], SubNode)
+    # results are the same
+    for precompile in [False, True]:
+        root = BackendDict(precompile=precompile).load_group(BackendDict().dump(Group({'default': Option(data)})))
+        assert eunomia_load(root, 'default') == {'a': 2, 'b': 'x6', 'c': 2, 'd': 'plain', 'e': [[1]]}
+    # copy on write is only needed after shared data is merged
+    assert not _merge_option_data({}, Option(data), (), copy_on_write=False)
+    assert _merge_option_data({}, Option(data).precompile(), (), copy_on_write=False)
+
+
+def test_precompile_compiled_cache():
+    from eunomia import eunomia_load
+    from eunomia.config import Group, Option
+    from eunomia.config.nodes._util_interpret import EXPR_COMPILED_CACHE
+    root = BackendDict(precompile=True).load_group(BackendDict().dump(Group({'default': Option({'a': 1, 'b': '${=conf.a + 1}'})})))
+    # precompiled expressions never look up the compiled cache
+    maxsize = EXPR_COMPILED_CACHE.info().maxsize
+    EXPR_COMPILED_CACHE.resize(0)
+    try:
+        info = EXPR_COMPILED_CACHE.info()
+        assert eunomia_load(root, 'default') == {'a': 1, 'b': 2}
+        assert eunomia_load(root, 'default') == {'a': 1, 'b': 2}
+        assert EXPR_COMPILED_CACHE.info()[:2] == info[:2]
+    finally:
+        EXPR_COMPILED_CACHE.resize(maxsize)
+
+
+def test_yaml_cache_dir(tmp_path, monkeypatch):
+    import os
+    import shutil
+    from eunomia.backend import _backend_yaml
+    root_dir, cache_dir = str(tmp_path / 'configs'), str(tmp_path / 'cache')
+    shutil.copytree('examples/docs/quickstart/configs', root_dir)
+    with open(os.path.join(root_dir, 'extra.yaml'), 'w') as f:
+        f.write('foo: 1\n')
+    expected = BackendDict().dump(BackendYaml().load_group(root_dir))
+    num_files = sum(f.endswith('.yaml') for _, _, fs in os.walk(root_dir) for f in fs)
+    # cold cache parses every file
+    backend = BackendYaml(cache_dir=cache_dir)
+    assert BackendDict().dump(backend.load_group(root_dir)) == expected
+    assert (backend.cache_hits, backend.cache_misses) == (0, num_files)
+    # warm cache gives identical options
+    backend = BackendYaml(cache_dir=cache_dir)
+    assert BackendDict().dump(backend.load_group(root_dir)) == expected
+    assert (backend.cache_hits, backend.cache_misses) == (num_files, 0)
+    # touched files are checked by their contents
+    path = os.path.join(root_dir, 'extra.yaml')
+    os.utime(path, ns=(0, 0))
+    backend = BackendYaml(cache_dir=cache_dir)
+    assert BackendDict().dump(backend.load_group(root_dir)) == expected
+    assert (backend.cache_hits, backend.cache_misses) == (num_files, 0)
+    # modified files are parsed again
+    with open(path, 'w') as f:
+        f.write('foo: 22\n')
+    backend = BackendYaml(cache_dir=cache_dir)
+    assert backend.load_group(root_dir).get_option('extra').data == {'foo': 22}
+    assert (backend.cache_hits, backend.cache_misses) == (num_files - 1, 1)
+    # corrupt entries are ignored
+    for name in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, name), 'wb') as f:
+            f.write(b'corrupt')
+    backend = BackendYaml(cache_dir=cache_dir)
+    assert backend.load_group(root_dir).get_option('extra').data == {'foo': 22}
+    assert (backend.cache_hits, backend.cache_misses) == (0, num_files)
+    # entries from a different loader are ignored
+    class OtherLoader(_backend_yaml.EunomiaSafeLoader):
+        pass
+    monkeypatch.setattr(_backend_yaml, 'DEFAULT_YAML_LOADER', OtherLoader)
+    backend = BackendYaml(cache_dir=cache_dir)
+    assert backend.load_group(root_dir).get_option('extra').data == {'foo': 22}
+    assert (backend.cache_hits, backend.cache_misses) == (0, num_files)
+    backend = BackendYaml(cache_dir=cache_dir)
+    assert backend.load_group(root_dir).get_option('extra').data == {'foo': 22}
+    assert (backend.cache_hits, backend.cache_misses) == (num_files, 0)
+
+
+def test_yaml_cache_dir_encoding(tmp_path, monkeypatch):
+    import builtins
+    from eunomia.backend import _backend_yaml
+    path = str(tmp_path / 'option.yaml')
+    with open(path, 'wb') as f:
+        f.write('foo: "caf\u00e9 \u2713"\n'.encode('utf8'))
+    # files opened in text mode use a latin-1 locale
+    def open_latin1(file, mode='r', *args, **kwargs):
+        if 'b' not in mode:
+            kwargs.setdefault('encoding', 'latin-1')
+        return builtins.open(file, mode, *args, **kwargs)
+    monkeypatch.setattr(_backend_yaml, 'open', open_latin1, raising=False)
+    # files are decoded as utf8 regardless of the locale or the cache
+    data, _ = _backend_yaml._load_option_dict(path, cache_dir=None)
+    assert data == _backend_yaml._load_option_dict(path, cache_dir=str(tmp_path / 'cache'))[0]
+    assert data['__data__'] == {'foo': 'caf\u00e9 \u2713'}
+
+
+def test_yaml_max_workers(tmp_path):
+    import os
+    import ruamel.yaml as yaml
+    root_dir = 'examples/docs/quickstart/configs'
+    expected = BackendDict().dump(BackendYaml().load_group(root_dir))
+    # options are added in the same order
+    backend = BackendYaml(max_workers=2)
+    assert BackendDict().dump(backend.load_group(root_dir)) == expected
+    assert (backend.cache_hits, backend.cache_misses) == (0, 0)
+    # cache is updated by the workers
+    backend = BackendYaml(max_workers=2, cache_dir=str(tmp_path / 'cache'))
+    assert BackendDict().dump(backend.load_group(root_dir)) == expected
+    assert backend.cache_hits == 0 and backend.cache_misses > 0
+    backend = BackendYaml(max_workers=2, cache_dir=str(tmp_path / 'cache'))
+    assert BackendDict().dump(backend.load_group(root_dir)) == expected
+    assert backend.cache_hits > 0 and backend.cache_misses == 0
+    # errors are raised from the workers
+    os.makedirs(tmp_path / 'configs')
+    for name in ['a', 'b', 'c']:
+        with open(tmp_path / 'configs' / f'{name}.yaml', 'w') as f:
+            f.write('foo: [1, 2\n' if name == 'b' else 'foo: 1\n')
+    with pytest.raises(yaml.YAMLError):
+        BackendYaml(max_workers=2).load_group(str(tmp_path / 'configs'))
+    # invalid values
+    with pytest.raises(ValueError):
+        BackendYaml(max_workers=0)
+
+
+def test_yaml_lazy(tmp_path):
+    import shutil
+    import ruamel.yaml as yaml
+    from eunomia import eunomia_load, eunomia_runner
+    from eunomia.config import LazyOption
+    from eunomia.core.runner import RunnerLocal
+    from eunomia.core.sweep import options
+    root_dir = str(tmp_path / 'configs')
+    shutil.copytree('examples/docs/quickstart/configs', root_dir)
+    # unused files are never parsed
+    with open(tmp_path / 'configs' / 'broken.yaml', 'w') as f:
+        f.write('foo: [1, 2\n')
+    def get_loaded(root):
+        return sorted(o.abs_path for o in root.walk_descendants() if isinstance(o, LazyOption) and o.is_loaded)
+    # only the structure is loaded
+    root = BackendYaml(lazy=True).load_group(root_dir)
+    assert sorted(root.options) == ['advanced', 'alternate', 'broken', 'default']
+    assert sorted(root.get_subgroup('dataset').options) == ['dsprites', 'shapes3d']
+    assert get_loaded(root) == []
+    # only the used options are loaded
+    expected = eunomia_load('examples/docs/quickstart/configs', 'default')
+    assert eunomia_load(root, 'default') == expected
+    assert get_loaded(root) == ['/dataset/shapes3d', '/default', '/framework/betavae']
+    # sweeps can list the options of groups
+    def sweep(config):
+        return eunomia_runner(lambda c: c, config=config, entrypoint='default', overrides=[options('dataset', config.get_subgroup('dataset'))], runner=RunnerLocal(load_once=True))
+    assert sweep(root) == sweep(BackendYaml().load_group('examples/docs/quickstart/configs'))
+    assert len(sweep(root)) == 2
+    assert get_loaded(root) == ['/dataset/dsprites', '/dataset/shapes3d', '/default', '/framework/betavae']
+    # errors are raised when used
+    with pytest.raises(yaml.YAMLError):
+        eunomia_load(root, 'broken')
+
+
+def test_yaml_walk_option_paths(tmp_path):
+    import os
+    from eunomia.backend._backend_yaml import _walk_option_paths
+    for path in ['b/a/z', 'a/b/a', 'a/b/c', 'a/a', 'b/b', 'z', 'c/d/a', 'a/.hidden/a', 'drafts/a', 'a/old']:
+        os.makedirs(tmp_path / os.path.dirname(path), exist_ok=True)
+        with open(tmp_path / f'{path}.yaml', 'w') as f:
+            f.write('foo: 1\n')
+    os.makedirs(tmp_path / 'empty' / 'empty')
+    for path in ['.hidden.yaml', 'b/notes.txt']:
+        with open(tmp_path / path, 'w') as f:
+            f.write('foo: 1\n')
+    # sorted by depth, then by keys
+    assert [(keys, name) for _, keys, name in _walk_option_paths(str(tmp_path))] == [
+        ((), 'z'),
+        (('a',), 'a'), (('a',), 'old'), (('b',), 'b'), (('drafts',), 'a'),
+        (('a', 'b'), 'a'), (('a', 'b'), 'c'), (('b', 'a'), 'z'), (('c', 'd'), 'a'),
+    ]
+    # ignore patterns match names and relative paths
+    assert [(keys, name) for _, keys, name in _walk_option_paths(str(tmp_path), ignore=['drafts', 'a/old.yaml', 'c'])] == [
+        ((), 'z'),
+        (('a',), 'a'), (('b',), 'b'),
+        (('a', 'b'), 'a'), (('a', 'b'), 'c'), (('b', 'a'), 'z'),
+    ]
+    # groups are only made if they contain options
+    root = BackendYaml(ignore=['*/old.yaml']).load_group(str(tmp_path))
+    assert list(root.groups) == ['a', 'b', 'drafts', 'c']
+    assert list(root.get_subgroup('a')) == ['b', 'a']
+    assert list(root.get_subgroup('c').groups) == ['d']
+
+
 # ========================================================================= #
 # END                                                                       #
 # ========================================================================= #
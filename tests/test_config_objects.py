@@ -134,3 +134,32 @@ def test_config_objects():
     # merge with overwrite enabled
     left.absorb_children(right3, allow_replace_options=True)
     assert bk.dump(left) == bk.dump(target3)
+
+
+def test_config_objects_freeze():
+    group = Group(dict(
+        suboption1=Option(dict(foo=1)),
+        subgroup1=Group(dict(
+            suboption1=Option(dict(foo=1)),
+        )),
+    ))
+    assert not group.is_frozen
+
+    # freezing is recursive
+    assert group.freeze() is group
+    assert all(node.is_frozen for node in group.walk_descendants())
+    with pytest.raises(RuntimeError, match='the config tree is frozen'):
+        group.get_subgroup('subgroup1').new_option('suboption2')
+    with pytest.raises(RuntimeError, match='the config tree is frozen'):
+        group.del_option('suboption1')
+    # cannot move frozen children into other trees
+    with pytest.raises(RuntimeError, match='the config tree is frozen'):
+        Group(dict(subgroup=group))
+    # reading is still allowed
+    assert group.get_option_recursive('/subgroup1/suboption1').data == dict(foo=1)
+
+    # unfreeze
+    group.unfreeze()
+    assert not any(node.is_frozen for node in group.walk_descendants())
+    group.get_subgroup('subgroup1').new_option('suboption2')
+    group.del_option('suboption1')
@@ -0,0 +1,133 @@
+import pytest
+
+from eunomia import eunomia_load
+from eunomia.config import Group, Option
+from eunomia.config._resolver import ConfigResolver, get_expr_dependencies
+from eunomia.config.nodes import SubNode, RefNode, EvalNode
+
+
+# ========================================================================= #
+# Helper                                                                    #
+# ========================================================================= #
+
+
+def _load(data: dict):
+    return eunomia_load(Group({'default': Option(data)}), 'default')
+
+
+# ========================================================================= #
+# Test Resolver                                                             #
+# ========================================================================= #
+
+
+def test_expr_dependencies():
+    assert get_expr_dependencies('1 + 2') == []
+    assert get_expr_dependencies('conf.a.b') == [('a', 'b')]
+    assert get_expr_dependencies('conf["a"].b + conf.c') == [('c',), ('a', 'b')]
+    assert get_expr_dependencies('conf[x].b') == [()]
+    assert get_expr_dependencies('len(conf.a)') == [('a',)]
+    assert get_expr_dependencies('this.a') == []
+
+
+def test_resolve_chains():
+    # chained references
+    assert _load({'a': 1, 'b': '${a}', 'c': '${b}'}) == {'a': 1, 'b': 1, 'c': 1}
+    assert _load({'c': '${b}', 'b': '${a}', 'a': 1}) == {'a': 1, 'b': 1, 'c': 1}
+    # chained expressions
+    assert _load({'a': 1, 'b': '${=conf.a + 1}', 'c': '${=conf.b * 2}'}) == {'a': 1, 'b': 2, 'c': 4}
+    assert _load({'c': 'c${=conf.b}', 'b': 'b${a.x}', 'a': {'x': '${=1}'}}) == {'a': {'x': 1}, 'b': 'b1', 'c': 'cb1'}
+    # references to subtrees are resolved and not shared
+    config = _load({'a': {'x': '${=1+1}', 'y': [1, '${a.x}']}, 'b': '${a}', 'c': '${b.y}'})
+    assert config == {'a': {'x': 2, 'y': [1, 2]}, 'b': {'x': 2, 'y': [1, 2]}, 'c': [1, 2]}
+    assert config['a'] is not config['b']
+    assert config['a']['y'] is not config['b']['y'] is not config['c']
+
+
+def test_resolve_cycles():
+    with pytest.raises(RuntimeError, match='cyclic reference found while resolving the config: a -> b -> a'):
+        _load({'a': '${b}', 'b': '${a}'})
+    with pytest.raises(RuntimeError, match='cyclic reference found while resolving the config: a -> a'):
+        _load({'a': '${=conf.a}'})
+    with pytest.raises(RuntimeError, match=r'cyclic reference found while resolving the config: a\.x -> b -> a\.x'):
+        _load({'a': {'x': '${b}'}, 'b': '${a}'})
+
+
+def test_resolve_once():
+    # deep chains are resolved in order, each value only once
+    n = 2000
+    config = {'k0': 0, **{f'k{i}': SubNode(f'${{k{i-1}}}') for i in range(1, n)}}
+    resolver = ConfigResolver(config, {})
+    assert resolver.num_leaves == n - 1
+    assert resolver.get_resolve_order() == [(f'k{i}',) for i in range(1, n)]
+    assert resolver.resolve() == {f'k{i}': 0 for i in range(n)}
+    # the original config is not modified
+    assert config['k1'] == SubNode('${k0}')
+    # nodes are resolved directly
+    assert ConfigResolver({'a': RefNode('b'), 'b': EvalNode('2'), 'c': 3}, {}).resolve() == {'a': 2, 'b': 2, 'c': 3}
+
+
+
+def test_lazy_config():
+    from eunomia.config import LazyConfig
+    data = {
+        'a': 1,
+        'b': {'x': '${a}', 'y': '${=conf.b.x + 1}', 'z': 'plain'},
+        'c': '${b}',
+    }
+    group = Group({'default': Option({**data, 'd': '${=1/0}'})})
+    config = eunomia_load(group, 'default', lazy=True)
+    assert isinstance(config, LazyConfig)
+    assert config.num_leaves == 4
+    assert config.num_resolved == 0
+    # only accessed values and their dependencies are resolved
+    assert config['a'] == 1
+    assert config['b']['z'] == 'plain'
+    assert config.num_resolved == 0
+    assert config['b']['y'] == 2
+    assert config.num_resolved == 2
+    assert config['c'] == {'x': 1, 'y': 2, 'z': 'plain'}
+    assert config.num_resolved == 3
+    # results are cached
+    assert config['b']['y'] == 2
+    assert config.num_resolved == 3
+    # read only
+    assert list(config.keys()) == ['a', 'b', 'c', 'd']
+    assert 'd' in config and len(config) == 4
+    with pytest.raises(TypeError):
+        config['a'] = 2
+    # errors only happen when accessed
+    with pytest.raises(ZeroDivisionError):
+        config['d']
+    with pytest.raises(ZeroDivisionError):
+        config.materialize()
+    # materialize everything
+    group = Group({'default': Option(data)})
+    config = eunomia_load(group, 'default', lazy=True)
+    assert config['b'].materialize() == {'x': 1, 'y': 2, 'z': 'plain'}
+    assert config.num_resolved == config.num_leaves == 3
+    assert config.materialize() == eunomia_load(group, 'default')
+
+
+def test_resolve_ancestor_readers():
+    # values that read the whole config do not depend on each other
+    data = {'a': 1, 'b': '${=len(conf)}', 'c': '${=len(conf)}'}
+    group = Group({'default': Option(data)})
+    assert eunomia_load(group, 'default') == {'a': 1, 'b': 3, 'c': 3}
+    config = eunomia_load(group, 'default', lazy=True)
+    assert config['c'] == 3
+    assert config.materialize() == {'a': 1, 'b': 3, 'c': 3}
+    # the same for subtrees, and values that depend on the readers
+    data = {'x': {'a': '${=1}', 'b': '${=len(conf.x)}', 'c': '${=len(conf.x)}'}, 'd': '${x.b}'}
+    group = Group({'default': Option(data)})
+    assert eunomia_load(group, 'default') == {'x': {'a': 1, 'b': 3, 'c': 3}, 'd': 3}
+    config = eunomia_load(group, 'default', lazy=True)
+    assert config['d'] == 3
+    assert config.materialize() == {'x': {'a': 1, 'b': 3, 'c': 3}, 'd': 3}
+    # readers see the resolved values of the rest of the config
+    assert _load({'a': '${=2}', 'b': '${=conf.a * len(conf)}', 'c': '${=conf.b + len(conf)}'}) == {'a': 2, 'b': 6, 'c': 9}
+    assert _load({'c': '${=conf.b + len(conf)}', 'b': '${=conf.a * len(conf)}', 'a': '${=2}'}) == {'a': 2, 'b': 6, 'c': 9}
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -74,6 +74,34 @@ def test_eunomia_loader_overrides():
         eunomia_load(_make_config_group(suboption=None, suboption2=None), overrides=['/subgroup2/subgroup3/suboption2', '/subgroup/suboption1'])
 
 
+def test_eunomia_loader_reuse():
+    from eunomia.config import ConfigLoader, Option
+    root = _make_config_group(suboption='suboption2', suboption2='suboption1')
+    loader = ConfigLoader(root)
+    # plans are recorded once and then replayed
+    target = {'foo': 1, 'subgroup': {'bar': 2}, 'subgroup2': {'subgroup3': {'baz': 1}}}
+    assert loader.load_config('default') == target
+    assert loader.load_config('default') == target
+    assert loader.plan_cache_info.misses == 1 and loader.plan_cache_info.hits == 1
+    # overrides have their own plans, independent of order
+    target = {'foo': 1, 'subgroup': {'bar': 1}, 'subgroup2': {'subgroup3': {'baz': 2}}}
+    assert loader.load_config('default', overrides=['/subgroup2/subgroup3/suboption2', '/subgroup/suboption1']) == target
+    assert loader.load_config('default', overrides=['/subgroup/suboption1', '/subgroup2/subgroup3/suboption2']) == target
+    assert loader.plan_cache_info.misses == 2 and loader.plan_cache_info.hits == 2
+    # merge plans
+    plan = loader.get_merge_plan('default')
+    assert [(o.abs_path, k) for o, k in plan.steps] == [('/default', ()), ('/subgroup/suboption2', ('subgroup',)), ('/subgroup2/subgroup3/suboption1', ('subgroup2', 'subgroup3'))]
+    assert plan.replay() == ({'foo': 1, 'subgroup': {'bar': 2}, 'subgroup2': {'subgroup3': {'baz': 1}}}, {(): ['default'], ('subgroup',): ['suboption2'], ('subgroup2', 'subgroup3'): ['suboption1']})
+    # modifying the tree invalidates plans
+    root.get_subgroup('subgroup').del_child('suboption2')
+    root.get_subgroup('subgroup').add_child('suboption2', Option({'bar': 3}))
+    assert loader.load_config('default') == {'foo': 1, 'subgroup': {'bar': 3}, 'subgroup2': {'subgroup3': {'baz': 1}}}
+    # errors are not cached
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="the following overrides were not used"):
+            ConfigLoader(_make_config_group(suboption=None), overrides=['/subgroup/suboption1']).load_config('default')
+
+
 def test_eunomia_loader_interpolation():
     # test custom packages with substitution
     with pytest.raises(TypeError, match='can never be a config node'):
@@ -129,3 +157,27 @@ def test_eunomia_core_funcs():
     main()
 
 
+def test_eunomia_loader_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    from eunomia.config import ConfigLoader, Group, Option
+    from eunomia.config.nodes._nodes import SUB_NODES_CACHE
+    from eunomia.config.nodes._util_interpret import EXPR_AST_CACHE, EXPR_COMPILED_CACHE
+    # many unique templates so that the parser and caches are used concurrently
+    def make_group():
+        return Group({'default': Option(data={
+            f'key{i}': {'a': i, 'b': f'${{=conf.key{i}.a * 2}}', 'c': f'${{key{i}.b}}_{i}', 'd': f'f"{{conf.key{i}.a}}"'}
+            for i in range(50)
+        })})
+    target = {f'key{i}': {'a': i, 'b': i * 2, 'c': f'{i * 2}_{i}', 'd': f'{i}'} for i in range(50)}
+    root = make_group()
+    root.freeze()
+    for _ in range(2):
+        for cache in [SUB_NODES_CACHE, EXPR_AST_CACHE, EXPR_COMPILED_CACHE]:
+            cache.clear()
+        # each thread has its own loader, some share the same frozen tree
+        def load(i):
+            return ConfigLoader(root if (i % 2) else make_group()).load_config('default', lazy=bool(i % 3))
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(load, range(16)))
+        for result in results:
+            assert (result if isinstance(result, dict) else result.materialize()) == target
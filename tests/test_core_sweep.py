@@ -1,6 +1,9 @@
-from eunomia import eunomia_runner
-from eunomia.config import Group, Option
-from eunomia.core.sweep import options, sort, choices, reverse
+import pytest
+
+from eunomia import eunomia, eunomia_runner
+from eunomia.config import Group, Option, ConfigLoader
+from eunomia.core.runner import RunnerLocal, RunnerProcessPool, RunnerThreadPool, RunnerAsync
+from eunomia.core.sweep import options, sort, choices, reverse, sample, latin_hypercube, _yield_list_sweep, _get_list_sweep_axis_order, _num_list_sweep_iterations, _ListSweep
 
 
 # ========================================================================= #
@@ -8,9 +11,8 @@ from eunomia.core.sweep import options, sort, choices, reverse
 # ========================================================================= #
 
 
-def test_local_sweep():
-
-    config = Group({
+def _make_sweep_config():
+    return Group({
         'default': Option(defaults=[{'/foo': 'foo1'}, {'/bar': '*'}]),
         'foo': Group({
             'foo1': Option(data=dict(foo1=1), pkg='<root>'),
@@ -28,11 +30,17 @@ def test_local_sweep():
         })
     })
 
+
+@pytest.mark.parametrize('load_once', [False, True])
+def test_local_sweep(load_once):
+
+    config = _make_sweep_config()
+
     def run(overrides=None):
         configs = []
         def test(config):
             configs.append(config)
-        eunomia_runner(test, config=config, overrides=overrides)
+        eunomia_runner(test, config=config, overrides=overrides, runner=RunnerLocal(load_once=load_once))
         return configs
 
     assert run(overrides=None) == [
@@ -84,6 +92,482 @@ def test_local_sweep():
         {'foo1': 1, 'foo4': 4}
     ]
 
+    # the group should not remain frozen
+    assert not config.is_frozen
+
+
+def test_local_sweep_load_once_frozen():
+    config = _make_sweep_config()
+
+    def test(conf):
+        assert config.is_frozen
+        with pytest.raises(RuntimeError, match='the config tree is frozen'):
+            config.new_subgroup('baz')
+
+    eunomia_runner(test, config=config, overrides=[options('bar', ['bar1', 'bar2'])], runner=RunnerLocal(load_once=True))
+    assert not config.is_frozen
+    # groups frozen by the user remain frozen
+    config.freeze()
+    eunomia_runner(test, config=config, overrides=[options('bar', ['bar1', 'bar2'])], runner=RunnerLocal(load_once=True))
+    assert config.is_frozen
+
+
+@pytest.mark.parametrize('reorder', [False, True])
+def test_local_sweep_load_once_streams(reorder):
+    runner = RunnerLocal(load_once=True, reorder_sweeps=reorder)
+    # sweeps are only generated as they are run
+    def test(conf):
+        return len(runner._sweep_keys)
+    assert eunomia_runner(test, config=_make_sweep_config(), overrides=[options('foo', ['foo1', 'foo2']), options('bar', ['bar1', 'bar2'])], runner=runner) == [1, 2, 3, 4]
+
+
+def _make_nested_sweep_config():
+    # groups are consulted in the order: a, b, c, c/d
+    return Group({
+        'default': Option(defaults=['<self>', {'/a': 'a1'}, {'/b': 'b1'}, {'/c': 'c1'}], data={'x': '${a.val}'}),
+        'a': Group({
+            'a1': Option(data=dict(val=1)),
+            'a2': Option(data=dict(val=2)),
+        }),
+        'b': Group({
+            'b1': Option(data=dict(val='${=conf.a.val * 10}')),
+            'b2': Option(data=dict(val='${=conf.a.val * 100}')),
+        }),
+        'c': Group({
+            'c1': Option(defaults=['<self>', {'/c/d': 'd1'}], data=dict(val=1)),
+            'c2': Option(defaults=[{'/c/d': 'd2'}, '<self>'], data=dict(val=2)),
+            'd': Group({
+                'd1': Option(data=dict(val=1), pkg='c'),
+                'd2': Option(data=dict(val=2, extra=True), pkg='c'),
+            }),
+        }),
+    })
+
+
+@pytest.mark.parametrize('reorder', [False, True])
+def test_load_configs_shared_prefix(reorder):
+    config = _make_nested_sweep_config()
+    sweeps = [
+        options('c/d', ['d1', 'd2']),
+        options('a', ['a1', 'a2']),
+        options('c', ['c1', 'c2']),
+        options('b', ['b1', 'b2']),
+    ]
+    loader = ConfigLoader(config)
+    axis_order = None
+    if reorder:
+        consult_order = loader.get_override_consult_order('default')
+        assert consult_order == [('a',), ('b',), ('c',), ('c', 'd')]
+        axis_order = _get_list_sweep_axis_order(sweeps, consult_order, loader.get_override_group_keys)
+        assert axis_order == [1, 3, 2, 0]
+    points = [o for o, _ in _yield_list_sweep(sweeps, axis_order=axis_order)]
+    assert len(points) == 16
+    # shared prefixes should give the same results as loading independently
+    expected = [ConfigLoader(config).load_config('default', overrides=o) for o in points]
+    assert list(loader.load_configs('default', points)) == expected
+    # the loader should still work for single loads
+    assert loader.load_config('default', overrides=points[-1]) == expected[-1]
+    assert expected[-1] == {'x': 2, 'a': {'val': 2}, 'b': {'val': 200}, 'c': {'val': 2, 'extra': True}}
+
+
+def test_yield_list_sweep_axis_order():
+    sweeps = [choices([1, 2]), 'fixed', choices(['a', 'b'])]
+    assert list(_yield_list_sweep(sweeps, axis_order=[1, 0])) == [
+        ([1, 'fixed', 'a'], (1, 'a')),
+        ([2, 'fixed', 'a'], (2, 'a')),
+        ([1, 'fixed', 'b'], (1, 'b')),
+        ([2, 'fixed', 'b'], (2, 'b')),
+    ]
+    with pytest.raises(ValueError, match='axis_order must be a permutation'):
+        list(_yield_list_sweep(sweeps, axis_order=[0, 0]))
+
+
+def _pool_run(config):
+    if config.get('bar3', None) == 3:
+        raise ValueError('bar3 is not allowed')
+    return sorted(config.items())
+
+
+@pytest.mark.parametrize(['load_once', 'load_in_workers'], [(False, False), (True, False), (False, True)])
+def test_process_pool_sweep(load_once, load_in_workers):
+    config = _make_sweep_config()
+    overrides = [options('foo', ['foo2', 'foo3']), options('bar', ['bar1', 'bar2'])]
+    # results are returned in order
+    runner = RunnerProcessPool(load_once=load_once, load_in_workers=load_in_workers, max_workers=2, max_in_flight=1)
+    assert eunomia_runner(_pool_run, config=config, overrides=overrides, runner=runner) == [
+        [('bar1', 1), ('foo2', 2)],
+        [('bar2', 2), ('foo2', 2)],
+        [('bar1', 1), ('foo3', 3)],
+        [('bar2', 2), ('foo3', 3)],
+    ]
+    # errors
+    overrides = [options('bar', ['bar1', 'bar3', 'bar2'])]
+    with pytest.raises(ValueError, match='bar3 is not allowed'):
+        eunomia_runner(_pool_run, config=config, overrides=overrides, runner=runner)
+    runner = RunnerProcessPool(load_once=load_once, load_in_workers=load_in_workers, max_workers=2, raise_errors=False)
+    results = eunomia_runner(_pool_run, config=config, overrides=overrides, runner=runner)
+    assert results[0] == [('bar1', 1), ('foo1', 1)]
+    assert isinstance(results[1], ValueError)
+    assert results[2] == [('bar2', 2), ('foo1', 1)]
+    # the group should not remain frozen
+    assert not config.is_frozen
+
+
+def test_process_pool_sweep_load_in_workers_options():
+    # options of a group are sent to the workers as paths
+    config = _make_sweep_config()
+    overrides = [options('foo', config.get_subgroup('foo')), options('bar', ['bar1', 'bar2'])]
+    runner = RunnerProcessPool(load_in_workers=True, max_workers=2, max_in_flight=2)
+    results = eunomia_runner(_pool_run, config=config, overrides=overrides, runner=runner)
+    assert results == [[('bar1', 1), (f'foo{i}', i)] if j == 1 else [('bar2', 2), (f'foo{i}', i)] for i in range(1, 6) for j in (1, 2)]
+
+
+@pytest.mark.parametrize('load_once', [False, True])
+def test_thread_pool_sweep(load_once):
+    config = _make_sweep_config()
+    overrides = [options('foo', ['foo2', 'foo3']), options('bar', ['bar1', 'bar3', 'bar2'])]
+    # results are returned in order
+    runner = RunnerThreadPool(load_once=load_once, max_workers=4, raise_errors=False)
+    results = eunomia_runner(_pool_run, config=config, overrides=overrides, runner=runner)
+    assert [r for r in results if not isinstance(r, ValueError)] == [
+        [('bar1', 1), ('foo2', 2)],
+        [('bar2', 2), ('foo2', 2)],
+        [('bar1', 1), ('foo3', 3)],
+        [('bar2', 2), ('foo3', 3)],
+    ]
+    assert isinstance(results[1], ValueError) and isinstance(results[4], ValueError)
+    # errors
+    runner = RunnerThreadPool(load_once=load_once, max_workers=4, max_in_flight=2)
+    with pytest.raises(ValueError, match='bar3 is not allowed'):
+        eunomia_runner(_pool_run, config=config, overrides=overrides, runner=runner)
+    # the group should not remain frozen
+    assert not config.is_frozen
+
+
+@pytest.mark.parametrize('load_once', [False, True])
+def test_async_sweep(load_once):
+    import asyncio
+    config = _make_sweep_config()
+    overrides = [options('foo', ['foo2', 'foo3']), options('bar', ['bar1', 'bar3', 'bar2'])]
+    running, max_running = [], []
+    async def run(config):
+        running.append(config)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(config)
+        return _pool_run(config)
+    # results are returned in order, running concurrently
+    results = eunomia_runner(run, config=config, overrides=overrides, runner=RunnerAsync(load_once=load_once, max_concurrency=2, raise_errors=False))
+    assert [r for r in results if not isinstance(r, ValueError)] == [
+        [('bar1', 1), ('foo2', 2)],
+        [('bar2', 2), ('foo2', 2)],
+        [('bar1', 1), ('foo3', 3)],
+        [('bar2', 2), ('foo3', 3)],
+    ]
+    assert isinstance(results[1], ValueError) and isinstance(results[4], ValueError)
+    assert max(max_running) == 2
+    # errors stop new sweeps from being started
+    max_running.clear()
+    with pytest.raises(ValueError, match='bar3 is not allowed'):
+        eunomia_runner(run, config=config, overrides=overrides, runner=RunnerAsync(load_once=load_once, max_concurrency=2))
+    assert len(max_running) < 6
+    # coroutine functions use the async runner by default
+    @eunomia(config, overrides=[options('bar', ['bar1', 'bar2'])])
+    async def main(config):
+        await asyncio.sleep(0)
+        return config
+    assert main() == [{'bar1': 1, 'foo1': 1}, {'bar2': 2, 'foo1': 1}]
+    # the group should not remain frozen
+    assert not config.is_frozen
+
+
+def test_async_sweep_running_loop():
+    import asyncio
+    config = _make_sweep_config()
+    overrides = [options('bar', ['bar1', 'bar2'])]
+    async def run(config):
+        await asyncio.sleep(0)
+        return sorted(config.items())
+    expected = eunomia_runner(run, config=config, overrides=overrides)
+    # a blocking runner cannot wait on the loop that it is called from
+    async def main():
+        with pytest.raises(RuntimeError, match='inside a running event loop'):
+            eunomia_runner(run, config=config, overrides=overrides)
+        # but it can be run in another thread
+        return await asyncio.get_event_loop().run_in_executor(None, lambda: eunomia_runner(run, config=config, overrides=overrides))
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(main()) == expected
+    finally:
+        loop.close()
+    assert not config.is_frozen
+
+
+@pytest.mark.parametrize('load_once', [False, True])
+def test_sharded_sweep(load_once, monkeypatch):
+    config = _make_sweep_config()
+    overrides = [options('foo', ['foo2', 'foo3']), options('bar', ['bar1', 'bar2', 'bar3'])]
+
+    def run(shard=None):
+        configs = []
+        eunomia_runner(configs.append, config=config, overrides=overrides, runner=RunnerLocal(load_once=load_once, shard=shard))
+        return configs
+
+    # shards partition the sweep
+    everything = run()
+    shards = [run(shard=(i, 4)) for i in range(4)]
+    assert [len(s) for s in shards] == [2, 2, 1, 1]
+    assert [shards[i % 4][i // 4] for i in range(6)] == everything
+    # environment variables
+    monkeypatch.setenv(RunnerLocal.ENV_SHARD_INDEX, '1')
+    monkeypatch.setenv(RunnerLocal.ENV_SHARD_COUNT, '4')
+    assert run() == shards[1]
+    assert run(shard=(2, 4)) == shards[2]
+    monkeypatch.delenv(RunnerLocal.ENV_SHARD_COUNT)
+    with pytest.raises(ValueError, match='must be set'):
+        run()
+    monkeypatch.delenv(RunnerLocal.ENV_SHARD_INDEX)
+    # sweeps outside the shard are never loaded
+    overrides = [options('bar', ['bar1', 'bar_missing', 'bar2', 'bar_missing'])]
+    assert run(shard=(0, 2)) == [{'bar1': 1, 'foo1': 1}, {'bar2': 2, 'foo1': 1}]
+    with pytest.raises(KeyError):
+        run(shard=(1, 2))
+    # checks
+    for shard, error in [((0, 0), ValueError), ((2, 2), ValueError), ((-1, 2), ValueError), ((0.5, 2), TypeError), (1, ValueError)]:
+        with pytest.raises(error):
+            RunnerLocal(shard=shard)
+
+
+@pytest.mark.parametrize(['runner_cls', 'kwargs'], [(RunnerLocal, {}), (RunnerThreadPool, dict(max_in_flight=1)), (RunnerAsync, dict(max_concurrency=1))])
+def test_journal_sweep(runner_cls, kwargs, tmp_path, capsys):
+    import re
+    config = _make_sweep_config()
+    overrides = [options('foo', ['foo2', 'foo3']), options('bar', ['bar1', 'bar2', 'bar3'])]
+    journal = str(tmp_path / 'journal.jsonl')
+
+    def run(crash=False):
+        configs = []
+        def func(config):
+            configs.append(config)
+            if crash and config == {'bar3': 3, 'foo2': 2}:
+                raise RuntimeError('crashed')
+        runner = runner_cls(journal=journal, no_output=False, **kwargs)
+        try:
+            eunomia_runner(func, config=config, overrides=overrides, runner=runner)
+        except RuntimeError:
+            pass
+        return configs, runner.summary.num_skipped
+
+    # crash part way through
+    def get_printed():
+        return re.findall(r'SWEEP (\d+) OF (\d+)', capsys.readouterr().out)
+
+    assert run(crash=True) == ([{'bar1': 1, 'foo2': 2}, {'bar2': 2, 'foo2': 2}, {'bar3': 3, 'foo2': 2}], 0)
+    # pool runners print on completion, so the crashed sweep may not be printed
+    assert get_printed()[:2] == [('1', '6'), ('2', '6')]
+    # partial lines are ignored
+    with open(journal, 'a') as f:
+        f.write('{"key": "abc')
+    # completed sweeps are skipped, and are still counted in the printed positions
+    assert run() == ([{'bar3': 3, 'foo2': 2}, {'bar1': 1, 'foo3': 3}, {'bar2': 2, 'foo3': 3}, {'bar3': 3, 'foo3': 3}], 2)
+    assert get_printed() == [('3', '6'), ('4', '6'), ('5', '6'), ('6', '6')]
+    assert run() == ([], 6)
+    assert get_printed() == []
+
+
+def test_journal_sweep_lazy_options(tmp_path):
+    from eunomia.backend import BackendYaml
+    root_dir, journal = tmp_path / 'configs', str(tmp_path / 'journal.jsonl')
+    (root_dir / 'foo').mkdir(parents=True)
+    with open(root_dir / 'default.yaml', 'w') as f:
+        f.write('__defaults__:\n  - foo: foo1\n')
+    # options with the same data must still be distinguished
+    for name, value in [('foo1', 1), ('foo2', 1), ('foo3', 3)]:
+        with open(root_dir / 'foo' / f'{name}.yaml', 'w') as f:
+            f.write(f'__package__: <root>\nfoo: {value}\n')
+
+    def run(crash=False):
+        configs = []
+        def func(config):
+            configs.append(config)
+            if crash and len(configs) == 2:
+                raise RuntimeError('crashed')
+        # options are not loaded until they are used
+        root = BackendYaml(lazy=True).load_group(str(root_dir))
+        runner = RunnerLocal(journal=journal, load_once=True)
+        try:
+            eunomia_runner(func, config=root, overrides=[options('foo', root.get_subgroup('foo'))], runner=runner)
+        except RuntimeError:
+            pass
+        return configs, runner.summary.num_skipped_completed
+
+    assert run(crash=True) == ([{'foo': 1}, {'foo': 1}], 0)
+    assert run() == ([{'foo': 1}, {'foo': 3}], 1)
+    assert run() == ([], 3)
+
+
+def test_sample_sweep():
+    axes = [choices(range(10)) for _ in range(8)]
+    # points are drawn without enumerating the 10**8 combinations
+    s = sample(axes, 100, seed=7)
+    points = list(s)
+    assert len(s) == len(points) == 100
+    assert len(set(points)) == 100
+    assert all(len(p) == 8 for p in points)
+    # points are the same every time, and depend on the seed
+    assert list(s) == points
+    assert list(sample(axes, 100, seed=7)) == points
+    assert list(sample(axes, 100, seed=8)) != points
+    assert list(sample(axes, 5, seed=3, replace=True)) == list(sample(axes, 5, seed=3, replace=True))
+    # unique samples are limited by the number of combinations
+    assert sorted(sample([[1, 2], 'ab'], 4)) == [(1, 'a'), (1, 'b'), (2, 'a'), (2, 'b')]
+    with pytest.raises(ValueError, match='cannot draw 5 unique samples from 4 combinations'):
+        sample([[1, 2], 'ab'], 5)
+    assert len(list(sample([[1, 2], 'ab'], 5, replace=True))) == 5
+    with pytest.raises(ValueError, match='axes cannot be empty'):
+        sample([[1, 2], []], 1)
+
+
+def test_latin_hypercube_sweep():
+    axes = [range(10), range(20), range(5)]
+    points = list(latin_hypercube(axes, 10, seed=1))
+    assert len(points) == 10
+    assert list(latin_hypercube(axes, 10, seed=1)) == points
+    # each stratum of each axis is sampled exactly once
+    assert sorted(p[0] for p in points) == list(range(10))
+    assert sorted(p[1] // 2 for p in points) == list(range(10))
+    assert sorted(p[2] for p in points) == sorted([0, 0, 1, 1, 2, 2, 3, 3, 4, 4])
+
+
+def test_sample_sweep_runner():
+    config = _make_sweep_config()
+    overrides = ['/foo/foo2', sample([options('foo', ['foo1', 'foo3']), options('bar', ['bar1', 'bar2', 'bar3'])], 4, seed=0)]
+    assert _num_list_sweep_iterations(overrides) == 4
+    # values are spliced into the overrides
+    points = list(_yield_list_sweep(overrides))
+    assert all(len(merged) == 3 and merged[0] == '/foo/foo2' for merged, _ in points)
+    assert all(len(changed) == 1 and len(changed[0]) == 2 for _, changed in points)
+    # configs are loaded from the sampled overrides
+    configs = []
+    eunomia_runner(configs.append, config=config, overrides=overrides[1:], runner=RunnerLocal())
+    assert len(configs) == 4
+    assert len({str(sorted(c.items())) for c in configs}) == 4
+    assert all(len(c) == 2 for c in configs)
+
+
+@pytest.mark.parametrize(['runner_cls', 'kwargs'], [(RunnerLocal, {}), (RunnerProcessPool, dict(max_workers=2)), (RunnerThreadPool, dict(max_in_flight=1)), (RunnerAsync, dict(max_concurrency=1))])
+def test_dedupe_sweep(runner_cls, kwargs, tmp_path):
+    config = _make_sweep_config()
+    # different overrides can give the same config
+    overrides = [choices(['/foo/foo2', {'foo': 'foo2'}, {'foo': ['foo2']}, '/foo/foo3']), options('bar', ['bar1', 'bar2'])]
+    # duplicates are skipped
+    runner = runner_cls(dedupe=True, journal=str(tmp_path / 'journal.jsonl'), **kwargs)
+    assert eunomia_runner(_pool_run, config=config, overrides=overrides, runner=runner) == [
+        [('bar1', 1), ('foo2', 2)],
+        [('bar2', 2), ('foo2', 2)],
+        [('bar1', 1), ('foo3', 3)],
+        [('bar2', 2), ('foo3', 3)],
+    ]
+    summary = runner.summary
+    assert (summary.num_total, summary.num_finished, summary.num_skipped_duplicate, summary.num_skipped_completed) == (8, 4, 4, 0)
+    # duplicates are recorded as completed
+    eunomia_runner(_pool_run, config=config, overrides=overrides, runner=runner)
+    summary = runner.summary
+    assert (summary.num_finished, summary.num_skipped_duplicate, summary.num_skipped_completed) == (0, 0, 8)
+    # disabled
+    runner = runner_cls(**kwargs)
+    assert len(eunomia_runner(_pool_run, config=config, overrides=overrides, runner=runner)) == 8
+    assert runner.summary.num_finished == 8
+
+
+
+@pytest.mark.parametrize(['runner_cls', 'kwargs'], [(RunnerLocal, {}), (RunnerThreadPool, dict(max_in_flight=1))])
+def test_dedupe_sweep_non_json(runner_cls, kwargs, tmp_path):
+    # resolved values that are not json types, eg. from eval nodes
+    config = Group({
+        'default': Option(defaults=[{'/foo': 'foo1'}], data=dict(r='${=range(conf.n)}')),
+        'foo': Group({
+            'foo1': Option(data=dict(n=1), pkg='<root>'),
+            'foo2': Option(data=dict(n=2), pkg='<root>'),
+        }),
+    })
+    overrides = [choices(['/foo/foo1', {'foo': 'foo1'}, '/foo/foo2'])]
+    runner = runner_cls(dedupe=True, journal=str(tmp_path / 'journal.jsonl'), **kwargs)
+    assert eunomia_runner(lambda c: c, config=config, overrides=overrides, runner=runner) == [
+        {'n': 1, 'r': range(1)},
+        {'n': 2, 'r': range(2)},
+    ]
+    summary = runner.summary
+    assert (summary.num_total, summary.num_finished, summary.num_skipped_duplicate) == (3, 2, 1)
+
+
+def test_sample_sweep_unseeded(tmp_path, monkeypatch):
+    config = _make_sweep_config()
+    def overrides(seed=None):
+        return [sample([options('foo', ['foo1', 'foo3']), options('bar', ['bar1', 'bar2', 'bar3'])], 4, seed=seed)]
+    assert not overrides()[0].is_seeded and overrides(seed=0)[0].is_seeded
+    # each process would draw different points
+    with pytest.raises(ValueError, match='joint sweeps must be given a seed when sharding'):
+        eunomia_runner(lambda c: c, config=config, overrides=overrides(), runner=RunnerLocal(shard=(0, 2)))
+    with pytest.raises(ValueError, match='joint sweeps must be given a seed when using a journal'):
+        eunomia_runner(lambda c: c, config=config, overrides=overrides(), runner=RunnerLocal(journal=str(tmp_path / 'journal.jsonl')))
+    monkeypatch.setenv(RunnerLocal.ENV_SHARD_INDEX, '0')
+    monkeypatch.setenv(RunnerLocal.ENV_SHARD_COUNT, '2')
+    with pytest.raises(ValueError, match='joint sweeps must be given a seed when sharding'):
+        eunomia_runner(lambda c: c, config=config, overrides=overrides(), runner=RunnerLocal())
+    monkeypatch.delenv(RunnerLocal.ENV_SHARD_INDEX)
+    monkeypatch.delenv(RunnerLocal.ENV_SHARD_COUNT)
+    with pytest.warns(UserWarning, match='joint sweeps should be given a seed when deduplicating'):
+        eunomia_runner(lambda c: c, config=config, overrides=overrides(), runner=RunnerLocal(dedupe=True))
+    # seeded sweeps are allowed
+    assert len(eunomia_runner(lambda c: c, config=config, overrides=overrides(seed=0), runner=RunnerLocal(shard=(0, 2), journal=str(tmp_path / 'journal.jsonl')))) == 2
+    assert len(eunomia_runner(lambda c: c, config=config, overrides=overrides(), runner=RunnerLocal())) == 4
+
+
+def test_sweep_list_random_access():
+    # sequences are never materialised
+    huge = choices(range(10**12))
+    assert len(huge) == 10**12 and huge[-1] == 10**12 - 1
+    assert len(reverse(range(10**12))) == 10**12 and reverse(range(10**12))[0] == 10**12 - 1
+    assert _num_list_sweep_iterations([huge, huge, 'fixed', huge]) == 10**36
+    # other iterables are only materialised once
+    c = choices(i for i in range(3))
+    assert list(c) == [0, 1, 2] and list(c) == [0, 1, 2] and len(c) == 3 and c[1] == 1
+    s = sort(iter([3, 1, 2]), reverse=True)
+    assert (len(s), s[0], list(s)) == (3, 3, [3, 2, 1])
+    # options are listed again if the group is modified
+    config = _make_sweep_config()
+    o = options('foo', config.get_subgroup('foo'))
+    assert len(o) == 5 and o[0] == {'foo': config.get_subgroup('foo').get_option('foo1')}
+    config.get_subgroup('foo').new_option('foo6', data={})
+    assert len(o) == 6
+
+
+def test_list_sweep_indexing():
+    values = [choices([1, 2]), 'fixed', choices('abc'), sample([[True, False], [None]], 2, seed=0)]
+    for axis_order in [None, [2, 0, 1], [1, 2, 0]]:
+        grid = _ListSweep(values, axis_order=axis_order)
+        points = list(grid)
+        assert len(grid) == len(points) == 12
+        assert [grid[i] for i in range(len(grid))] == points
+        assert grid[-1] == points[-1]
+        assert list(_yield_list_sweep(values, axis_order=axis_order)) == points
+        with pytest.raises(IndexError):
+            grid[12]
+    # huge grids are indexed in constant time
+    grid = _ListSweep([choices(range(10**12)), choices(range(10**12))])
+    assert grid.num_points == 10**24
+    assert grid[10**24 - 1] == ([10**12 - 1, 10**12 - 1], (10**12 - 1, 10**12 - 1))
+    assert grid[10**12 + 5] == ([1, 5], (1, 5))
+    # axes with more than sys.maxsize values
+    for huge, num, first, last in [(choices(range(10**20)), 10**20, 0, 10**20 - 1), (choices(range(10**20, 0, -3)), (10**20 + 2) // 3, 10**20, 1), (reverse(range(10**20)), 10**20, 10**20 - 1, 0)]:
+        assert huge.num_values == num
+        grid = _ListSweep([huge, choices([1, 2])])
+        assert grid.num_points == 2 * huge.num_values
+        assert grid[0] == ([first, 1], (first, 1)) and grid[-1] == ([last, 2], (last, 2))
+    assert _num_list_sweep_iterations([choices(range(10**20)), choices(range(10**20))]) == 10**40
+    assert choices(range(5, 5)).num_values == 0 and choices(range(0, 10, 3)).num_values == 4
+
 
 # ========================================================================= #
 # END                                                                       #
@@ -78,3 +78,23 @@ def test_dict_util():
     # lists replace lists
     # left = deepcopy(_left)
     # u.dict_recursive_update(left, right=dict(c=[2,3,4]))
+
+
+def test_dict_recursive_update_copy_on_write():
+    shared = dict(b=dict(c=1))
+    # without copy on write, the shared dictionary is modified
+    left = {}
+    u.dict_recursive_update(left, right=dict(a=shared))
+    u.dict_recursive_update(left, right=dict(a=dict(b=dict(d=2))))
+    assert shared == dict(b=dict(c=1, d=2))
+    # with copy on write, only the left dictionary is modified
+    shared = dict(b=dict(c=1))
+    left = {}
+    u.dict_recursive_update(left, right=dict(a=shared), copy_on_write=True)
+    assert left['a'] is shared
+    u.dict_recursive_update(left, right=dict(a=dict(b=dict(d=2))), copy_on_write=True)
+    assert left == dict(a=dict(b=dict(c=1, d=2)))
+    assert shared == dict(b=dict(c=1))
+    # getting items also copies
+    u.recursive_getitem(dict(a=shared), ['a', 'b'], copy_on_write=True)['e'] = 3
+    assert shared == dict(b=dict(c=1))
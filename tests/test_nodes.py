@@ -13,3 +13,59 @@ def test_node_sub_fstrings():
 def test_node_sub():
     assert SubNode('a{1}b{2}c').get_config_value({},{},{}) == 'a{1}b{2}c'
     assert SubNode('a${=1}b${=2}c').get_config_value({},{},{}) == 'a1b2c'
+
+def test_node_sub_cache():
+    from eunomia.config.nodes import SUB_NODES_CACHE
+    maxsize = SUB_NODES_CACHE.maxsize
+    try:
+        SUB_NODES_CACHE.resize(2)
+        SUB_NODES_CACHE.clear()
+        # misses then hits
+        assert SubNode('a${=1}b').get_config_value({},{},{}) == 'a1b'
+        assert SubNode('a${=1}b').get_config_value({},{},{}) == 'a1b'
+        assert tuple(SUB_NODES_CACHE.info()) == (1, 1, 0, 2, 1)
+        # evictions
+        assert SubNode('${=2}').get_config_value({},{},{}) == 2
+        assert SubNode('${=3}').get_config_value({},{},{}) == 3
+        assert tuple(SUB_NODES_CACHE.info()) == (1, 3, 1, 2, 2)
+        # disabled
+        SUB_NODES_CACHE.resize(0)
+        assert SubNode('a${=1}b').get_config_value({},{},{}) == 'a1b'
+        assert tuple(SUB_NODES_CACHE.info()) == (1, 4, 3, 0, 0)
+    finally:
+        SUB_NODES_CACHE.resize(maxsize)
+
+def test_node_sub_literals():
+    from eunomia.config.nodes import SUB_NODES_CACHE
+    from eunomia.config.nodes._nodes import _string_to_sub_nodes, _parse_string_to_sub_nodes
+    # literals give the same results as parsing
+    for string in ['', 'a', 'a b', ' \t', '$', 'a}', '{1}', '$ {', ' f"a"', '/a/b/c' * 100]:
+        info = SUB_NODES_CACHE.info()
+        assert SubNode(string).get_config_value({},{},{}) == ''.join(_parse_string_to_sub_nodes(string)) == string
+        assert ''.join(_string_to_sub_nodes(string)) == string
+        # literals skip the cache
+        assert SUB_NODES_CACHE.info() == info
+    # not literals
+    assert SubNode('${=1}').get_config_value({},{},{}) == 1
+    assert SubNode('f"a"').get_config_value({},{},{}) == 'a'
+    assert SubNode("f'a'").get_config_value({},{},{}) == 'a'
+    assert SubNode('f"a').get_config_value({},{},{}) == 'f"a'
+
+
+def test_node_sub_constant():
+    from eunomia.config.nodes import EvalNode, RefNode, IgnoreNode
+    # constant nodes do not depend on the config
+    assert SubNode('a b').is_constant
+    assert SubNode('${=1 + 2}').is_constant
+    assert SubNode("a${='=' * 5}b").is_constant
+    assert SubNode('f"{1}{2:02d}"').is_constant
+    assert SubNode(['a', IgnoreNode('b'), EvalNode('1')]).is_constant
+    assert EvalNode('(1, 2)').is_constant
+    assert not EvalNode('[1, 2]').is_constant
+    assert not EvalNode('1 / 0').is_constant
+    assert not EvalNode('conf.a * 2').is_constant
+    assert not SubNode('${a.b}').is_constant
+    assert not SubNode(['a', RefNode('a')]).is_constant
+    # constant values are the same as when resolved
+    assert EvalNode("'=' * 5").get_config_value({}, {}, {}) == '====='
+    assert SubNode("a${='=' * 5}b").get_config_value({}, {}, {}) == 'a=====b'
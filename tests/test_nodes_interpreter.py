@@ -3,6 +3,7 @@ from typing import Callable, Any
 import pytest
 import ast
 from eunomia.config.nodes._util_interpret import Interpreter, BasicInterpreter
+from eunomia.config.nodes._util_interpret import Compiler, BasicCompiler
 from eunomia.config.nodes._util_interpret import DisabledLanguageFeatureError
 
 
@@ -11,14 +12,25 @@ from eunomia.config.nodes._util_interpret import DisabledLanguageFeatureError
 # ========================================================================= #
 
 
+# all tests are run against both the interpreter and the compiler
+@pytest.fixture(params=[BasicInterpreter, BasicCompiler])
+def basic_cls(request):
+    return request.param
+
+
+@pytest.fixture(params=[Interpreter, Compiler])
+def interp_cls(request):
+    return request.param
+
+
 @pytest.fixture()
-def interpret() -> Callable[[str], Any]:
-    return BasicInterpreter().interpret
+def interpret(basic_cls) -> Callable[[str], Any]:
+    return basic_cls().interpret
 
 
 @pytest.fixture()
-def interpret_nonstrict() -> Callable[[str], Any]:
-    return BasicInterpreter(
+def interpret_nonstrict(basic_cls) -> Callable[[str], Any]:
+    return basic_cls(
         allow_nested_unary=True,
         allow_numerical_unary_on_bool=True,
         allow_chained_comparisons=True,
@@ -126,9 +138,9 @@ def test_interpret_comparisons(interpret):
     assert interpret('None is not None') == (None is not None)
 
 
-def test_interpret_comparisons_chained(interpret, interpret_nonstrict):
+def test_interpret_comparisons_chained(interpret, interpret_nonstrict, basic_cls):
     with pytest.raises(DisabledLanguageFeatureError):
-        BasicInterpreter(allow_chained_comparisons=False).interpret('1 <= 2 <= 4')
+        basic_cls(allow_chained_comparisons=False).interpret('1 <= 2 <= 4')
     assert interpret('1 <= 2 <= 4') == (1 <= 2 <= 4)
     assert interpret_nonstrict('1 <= 2 <= 4') == (1 <= 2 <= 4)
     assert interpret_nonstrict('1 <= 4 <= 2') == (1 <= 4 <= 2)
@@ -171,10 +183,11 @@ def test_interpret_fstrings_formatting(interpret):
 # ========================================================================= #
 
 
-def test_custom_interpreter(interpret):
+def test_custom_interpreter(interpret, interp_cls):
     # make custom interpreter
-    class CustomInterpreter(Interpreter):
+    class CustomInterpreter(interp_cls):
         visit_Dict = None
+        compile_Dict = None
     c_interpr = CustomInterpreter().interpret
 
     # specific feature disabled
@@ -306,8 +319,8 @@ conf = {'a': {'c': 1}, 'b': 2}
 
 
 @pytest.fixture()
-def name_sym_interp():
-    interpret = Interpreter(
+def name_sym_interp(interp_cls):
+    interpret = interp_cls(
         default_symtable={'name': name, 'range': range, 'conf': conf},
         allow_unpacking=True,
     ).interpret
@@ -370,10 +383,10 @@ def test_interpreter_getitem(name_sym_interp):
     assert name_sym_interp('conf["a"]["c"]') == conf["a"]["c"]
 
 
-def test_interpreter_NON_STANDARD_PYTHON():
+def test_interpreter_NON_STANDARD_PYTHON(interp_cls):
     config = {'foo': 1, 'bar': {'baz': 2}}
-    standard = Interpreter(extra_symtable={'conf': config})
-    non_standard = Interpreter(extra_symtable={'conf': config}, NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail=True)
+    standard = interp_cls(extra_symtable={'conf': config})
+    non_standard = interp_cls(extra_symtable={'conf': config}, NON_STANDARD_PYTHON_allow_getitem_on_getattr_fail=True)
 
     # check standard - get_item
     assert standard.interpret('conf["foo"]') == 1
@@ -401,6 +414,86 @@ def test_interpreter_NON_STANDARD_PYTHON():
     with pytest.raises(AttributeError): non_standard.interpret('conf["bar"].buzz')  # different from above
     with pytest.raises(KeyError): non_standard.interpret('conf.bar["buzz"]')
 
+def test_interpret_expr_caching():
+    from eunomia.config.nodes._util_interpret import interpret_expr, parse_expr, get_default_symtable, EXPR_AST_CACHE
+    # parsed expressions are cached, ignoring leading and trailing whitespace
+    assert parse_expr(' 1 + 2\t') is parse_expr('1 + 2')
+    info = EXPR_AST_CACHE.info()
+    assert interpret_expr('1 + 2', compiled=False) == 3
+    assert EXPR_AST_CACHE.info().hits == info.hits + 1
+    # the default symbol table is shared and is never modified
+    assert get_default_symtable() is get_default_symtable()
+    assert interpret_expr('round(x)', usersyms={'x': 1.2, 'round': lambda x: 'overridden'}) == 'overridden'
+    assert interpret_expr('round(1.2)') == 1
+    assert 'x' not in get_default_symtable()
+    with pytest.raises(NameError):
+        interpret_expr('x')
+
+
+def test_compile_expr():
+    from eunomia.config.nodes._util_interpret import interpret_expr, compile_expr, EXPR_COMPILED_CACHE
+    # compiled expressions are cached and can be re-used with different symbols
+    assert compile_expr('x + 1') is compile_expr('x + 1')
+    assert compile_expr('x + 1') is not compile_expr('x + 1', NON_STANDARD_PYTHON=True)
+    assert compile_expr('x + 1')({'x': 1}) == 2
+    assert compile_expr('x + 1')({'x': 2}) == 3
+    info = EXPR_COMPILED_CACHE.info()
+    assert interpret_expr('x + 1', usersyms={'x': 3}, compiled=True) == 4
+    assert EXPR_COMPILED_CACHE.info().hits == info.hits + 1
+    # the compiler is opt-in
+    assert interpret_expr('x + 1', usersyms={'x': 3}) == 4
+    assert EXPR_COMPILED_CACHE.info().hits == info.hits + 1
+    # errors are deferred until evaluation, like the interpreter
+    assert compile_expr('x or y.__class__')({'x': 1}) is True
+    with pytest.raises(KeyError, match='unsafe attribute'):
+        compile_expr('x or y.__class__')({'x': 0, 'y': 1})
+    # results match the interpreter
+    for expr in ['[a, b, {"c": a}]', 'f"{a:>4}-{b}"', 'a < 2 < b[0]', 'conf.bar.baz']:
+        syms = {'a': 1, 'b': [3, 4], 'conf': {'bar': {'baz': 5}}}
+        assert interpret_expr(expr, usersyms=syms, NON_STANDARD_PYTHON=True, compiled=True) == interpret_expr(expr, usersyms=syms, NON_STANDARD_PYTHON=True, compiled=False)
+
+
+def test_compile_compare_parity():
+    # comparisons with a custom __eq__ can return anything
+    class Vec(object):
+        def __init__(self, *values): self.values = values
+        def __eq__(self, other): return [a == b for a, b in zip(self.values, other.values)]
+        def __lt__(self, other): return [a < b for a, b in zip(self.values, other.values)]
+    syms = {'a': Vec(1, 2), 'b': Vec(1, 3)}
+    for expr, value in [('a == b', True), ('a < b', True), ('a == b == b', True)]:
+        interpreter, compiler = Interpreter(extra_symtable=syms), Compiler().compile(expr)
+        assert interpreter.interpret(expr) is value
+        assert compiler(syms) is value
+    # without chaining the raw result is returned by both
+    assert Interpreter(extra_symtable=syms, allow_chained_comparisons=False).interpret('a == b') == [True, False]
+    assert Compiler(allow_chained_comparisons=False).compile('a == b')(syms) == [True, False]
+
+
+def test_compile_constant_folding():
+    from eunomia.config.nodes._util_interpret import is_constant_expr
+    # only constant sub-expressions are folded
+    for expr, value in [("'=' * 5", '====='), ('2 ** 10', 1024), ('(1, (2, -3))', (1, (2, -3))), ('1 < 2 < 3', True), ('f"{1:03d}"', '001'), ('(1, 2)[0]', 1), ('not 1 or 0', False)]:
+        compiled = Compiler().compile(expr)
+        assert compiled.is_constant
+        assert compiled.value == value
+        assert compiled({}) == value
+        assert not Compiler(fold_constants=False).compile(expr).is_constant
+    # mutable values, errors and symbols are not folded
+    for expr in ['[1, 2]', '{1: 2}', '1 / 0', "'=' * 10**10", 'x * 2', 'x.y', 'range(2)']:
+        compiled = Compiler().compile(expr)
+        assert not compiled.is_constant
+        with pytest.raises(ValueError, match='not constant'):
+            compiled.value
+    with pytest.raises(ZeroDivisionError):
+        Compiler().compile('1 / 0')({})
+    # partially folded expressions still work
+    assert Compiler().compile('x * (2 ** 3)')({'x': 2}) == 16
+    # check strings
+    assert is_constant_expr("'=' * 100")
+    assert not is_constant_expr('conf.lr * (2 ** 10)')
+    assert not is_constant_expr('1 +')
+
+
 # def test_interpreter_list_comprehension(name_sym_interp):
 #     # assert name_sym_interp('[i for i in [1, 2, 3, 4, 5]]') == [1, 2, 3, 4, 5]
 #     # assert name_sym_interp('[i for i, j in [1, 2, 3, 4, 5] if i == 4]') == [1, 2, 3, 4, 5]
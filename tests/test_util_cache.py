@@ -0,0 +1,74 @@
+import pytest
+
+from eunomia.util._util_cache import LruCache
+
+
+# ========================================================================= #
+# Test LRU Cache                                                            #
+# ========================================================================= #
+
+
+def test_lru_cache():
+    cache = LruCache(maxsize=2)
+    assert cache.get('a') is None
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    # 'b' is the least recently used
+    cache.put('c', 3)
+    assert 'b' not in cache
+    assert cache.get('b', 'missing') == 'missing'
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert tuple(cache.info()) == (3, 2, 1, 2, 2)
+
+
+def test_lru_cache_get_or_make():
+    made = []
+    def make(key):
+        made.append(key)
+        return key * 2
+    cache = LruCache(maxsize=None)
+    assert cache.get_or_make(1, make) == 2
+    assert cache.get_or_make(1, make) == 2
+    assert cache.get_or_make(2, make) == 4
+    assert made == [1, 2]
+    assert cache.info()._asdict() == dict(hits=1, misses=2, evictions=0, maxsize=None, currsize=2)
+
+
+def test_lru_cache_resize():
+    cache = LruCache(maxsize=None)
+    for i in range(10):
+        cache.put(i, i)
+    assert len(cache) == 10
+    # shrink
+    cache.resize(3)
+    assert len(cache) == 3
+    assert cache.info().evictions == 7
+    assert list(cache._cache.keys()) == [7, 8, 9]
+    # disable
+    cache.resize(0)
+    assert len(cache) == 0
+    cache.put(1, 1)
+    assert cache.get(1) is None
+    # clear
+    cache.clear()
+    assert tuple(cache.info()) == (0, 0, 0, 0, 0)
+    # checks
+    with pytest.raises(ValueError):
+        cache.resize(-1)
+    with pytest.raises(TypeError):
+        cache.resize(1.5)
+
+
+def test_lru_cache_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    cache = LruCache(maxsize=16)
+    def work(i):
+        for j in range(1000):
+            assert cache.get_or_make((i + j) % 32, lambda k: k * 2) == ((i + j) % 32) * 2
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(work, range(8)))
+    info = cache.info()
+    assert info.hits + info.misses == 8000
+    assert info.currsize == len(cache) <= 16
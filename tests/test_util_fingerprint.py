@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+
+from eunomia import fingerprint, eunomia_load
+from eunomia.config import ConfigLoader
+
+
+# ========================================================================= #
+# Test Fingerprint                                                          #
+# ========================================================================= #
+
+
+_CONFIG = {'a': 1, 'b': [1.5, 'str', None, True], 'c': {'d': (1, 2), 'e': {3, 4}, 'f': b'bytes'}, 'g': -(2**100), 'h': 1j}
+
+
+def test_fingerprint():
+    fp = fingerprint(_CONFIG)
+    assert isinstance(fp, str) and len(fp) == 32
+    assert fingerprint(_CONFIG) == fp
+    # dictionaries and sets are order-insensitive
+    assert fingerprint({'c': {'f': b'bytes', 'e': {4, 3}, 'd': (1, 2)}, 'h': 1j, 'g': -(2**100), 'b': [1.5, 'str', None, True], 'a': 1}) == fp
+    # lists and tuples are order-sensitive
+    assert fingerprint([1, 2]) != fingerprint([2, 1])
+    assert fingerprint((1, 2)) != fingerprint((2, 1))
+    # types are distinguished
+    values = [None, 0, 1, -1, 1.0, 0.0, True, False, '1', b'1', 1j, [], (), set(), {}, [1], (1,), {1}, {1: 1}, ['a', 'b'], ['ab'], ['a', 'b', ''], [[]], [[], []]]
+    assert len({fingerprint(v) for v in values}) == len(values)
+    # nesting is distinguished
+    assert fingerprint({'a': {'b': 1}}) != fingerprint({'a': 1, 'b': 1})
+    assert fingerprint({'a': [{'b': 1}]}) != fingerprint({'a': [{'b': 2}]})
+    # other types fall back to their repr, tagged with their type
+    assert fingerprint({'a': range(3)}) == fingerprint({'a': range(3)})
+    assert fingerprint({'a': range(3)}) != fingerprint({'a': range(4)})
+    assert fingerprint(range(3)) != fingerprint('range(3)')
+    assert fingerprint(range(3)) != fingerprint([0, 1, 2])
+
+
+def test_fingerprint_across_processes():
+    # fingerprints must not depend on the python hash seed
+    code = f'from eunomia import fingerprint; print(fingerprint({repr(_CONFIG)}))'
+    results = set()
+    for seed in ['0', '1', '12345']:
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        results.add(subprocess.check_output([sys.executable, '-c', code], env=env).decode().strip())
+    assert results == {fingerprint(_CONFIG)}
+
+
+def test_fingerprint_loader():
+    from tests.test_backend_obj import _make_config_group
+    root = _make_config_group(suboption='suboption1')
+    loader = ConfigLoader(root)
+    config, fp = loader.load_config('default', return_fingerprint=True)
+    assert config == eunomia_load(root, 'default')
+    assert fp == fingerprint(config)
+    config, merged_options, fp = loader.load_config('default', return_merged_options=True, return_fingerprint=True)
+    assert fp == fingerprint(config) and isinstance(merged_options, dict)
+    # lazy configs are resolved
+    config, lazy_fp = loader.load_config('default', lazy=True, return_fingerprint=True)
+    assert lazy_fp == fp
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #